@@ -0,0 +1,101 @@
+import time
+
+from open_list import new_open_list
+
+WEIGHT_SCALE = 10  # Keys are g * 10 + round(weight * 10) * h, so they stay integers
+
+
+def check_arguments(name, open_list, weight, step):
+    """Raise ValueError for settings ARA* can't run with."""
+    if weight < 1 or step <= 0:
+        # A weight below 1 proves no bound, and a step of 0 never reaches 1.0
+        raise ValueError(f"{name} needs weight >= 1 and step > 0, got weight={weight!r}, step={step!r}")
+    if new_open_list(open_list).monotone:
+        raise ValueError(f"{name} cannot use the monotone {open_list!r} open list")
+
+
+def ara_star(grid, scratch, start, goal, successors, heuristic, make_path, stats, hooks, open_list="heapq",
+             weight=3.0, step=0.5, time_budget=None, max_expansions=None):
+    """ARA* rounds from cell `start` to cell `goal`; returns (path, bound).
+
+    Each round searches with f = g + weight * h, so its path costs at most
+    `weight` times the optimum, then lowers the weight by `step` and
+    continues from the previous g-values and open list: only cells whose g
+    improved (the open and inconsistent ones) are expanded again.
+    successors(cell) yields (neighbor, move cost) and make_path(goal cost)
+    builds a round's path from scratch.parents. The result is the last
+    completed round's path and its suboptimality bound (1.0 means optimal),
+    or (None, None) if the first round did not finish. Fills in stats.
+    """
+    on_expand, on_push = hooks.on_expand, hooks.on_push
+    stamp, distances, came_from = scratch.stamp, scratch.distances, scratch.parents
+    seen = scratch.base  # distances[cell] is ours once stamp[cell] >= seen
+    stamp[start], distances[start] = seen, 0
+    open_cells, inconsistent = {start}, set()  # Closed cells improved this round wait in `inconsistent`
+    deadline = None if time_budget is None else stats.started + time_budget
+    node_expanded = pushes = stale_pops = peak_open = peak_closed = 0
+    path = bound = None
+
+    while True:
+        scaled = round(weight * WEIGHT_SCALE)
+        priority_queue = new_open_list(open_list)
+        push, pop = priority_queue.push, priority_queue.pop
+        for cell in open_cells:  # Re-key the open list for the new weight
+            push((distances[cell] * WEIGHT_SCALE + scaled * heuristic(cell), cell))
+        pushes += len(open_cells)
+        closed = scratch.mark()  # Cells stamped with it were expanded this round
+        closed_count = 0
+        out_of_budget = False
+        while priority_queue:
+            priority, current = pop()
+            if current not in open_cells or priority != distances[current] * WEIGHT_SCALE + scaled * heuristic(current):
+                stale_pops += 1
+                continue  # Expanded since, or queued again with a better g
+            if stamp[goal] >= seen and distances[goal] * WEIGHT_SCALE <= priority:
+                break  # The goal's f is the smallest; `current` stays open for the next round
+            if max_expansions is not None and node_expanded >= max_expansions or \
+                    deadline is not None and time.perf_counter() >= deadline:
+                out_of_budget = True
+                break
+            open_cells.remove(current)
+            stamp[current] = closed
+            closed_count += 1
+            node_expanded += 1
+            if on_expand is not None:
+                on_expand(grid.position(current))
+            current_cost = distances[current]
+            for neighbor, cost in successors(current):
+                new_cost = current_cost + cost
+                mark = stamp[neighbor]
+                if mark >= seen and new_cost >= distances[neighbor]:
+                    continue
+                distances[neighbor] = new_cost
+                came_from[neighbor] = current
+                if mark == closed:
+                    inconsistent.add(neighbor)
+                    continue
+                stamp[neighbor] = seen
+                open_cells.add(neighbor)
+                priority = new_cost * WEIGHT_SCALE + scaled * heuristic(neighbor)
+                push((priority, neighbor))
+                pushes += 1
+                if on_push is not None:
+                    on_push(grid.position(neighbor), priority)
+            if len(priority_queue) > peak_open:
+                peak_open = len(priority_queue)
+        peak_closed = max(peak_closed, closed_count)
+        if out_of_budget or stamp[goal] < seen:
+            break  # Keep the previous round's path (None when the goal is unreachable)
+        path = make_path(distances[goal])
+        # Every cheaper path would have to leave through an open or inconsistent cell
+        lower = min((distances[cell] + heuristic(cell) for cell in open_cells | inconsistent), default=0)
+        bound = max(1.0, min(weight, distances[goal] / lower)) if lower else 1.0
+        if bound == 1.0:
+            break
+        weight = max(1.0, weight - step)
+        open_cells |= inconsistent
+        inconsistent = set()
+
+    stats.expansions, stats.pushes, stats.stale_pops = node_expanded, pushes, stale_pops
+    stats.peak_open, stats.peak_closed = peak_open, peak_closed
+    return path, bound
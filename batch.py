@@ -0,0 +1,101 @@
+import os
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+
+from grid import GridMap, as_grid_map
+from jumpstart import JumpStart
+from pathfinding import Pathfinding
+
+QueryResult = namedtuple("QueryResult", ["index", "start", "goal", "path", "node_expanded"])
+
+ALGORITHMS = {
+    "a_star": (Pathfinding, "a_star"),
+    "d_star": (Pathfinding, "d_star"),
+    "bidirectional_a_star": (Pathfinding, "bidirectional_a_star"),
+    "bfs": (Pathfinding, "bfs"),
+    "greedy_best_first_search": (Pathfinding, "greedy_best_first_search"),
+    "jump_point_search": (JumpStart, "jump_point_search"),
+}
+
+_worker_grid = None  # GridMap view of the shared grid inside each worker process
+_worker_memory = None
+
+
+def solve_one(grid_map, index, start, goal, algorithm):
+    """Answer one query on an already built GridMap."""
+    cls, method = ALGORITHMS[algorithm]
+    path, node_expanded = getattr(cls(grid_map, start, goal), method)()
+    return QueryResult(index, start, goal, path, node_expanded)
+
+
+def share_grid(grid_map):
+    """Copy a GridMap into a new SharedMemory block; the caller closes and unlinks it.
+
+    Returns the block and the arguments attach_grid() needs in another process.
+    """
+    size = grid_map.size
+    memory = shared_memory.SharedMemory(create=True, size=3 * size)
+    memory.buf[:size] = grid_map.passable
+    memory.buf[size:2 * size] = grid_map.masks
+    memory.buf[2 * size:3 * size] = grid_map.costs
+    return memory, (memory.name, grid_map.rows, grid_map.cols, grid_map.weighted)
+
+
+def attach_grid(name, rows, cols, weighted):
+    """Map a block made by share_grid(); returns (GridMap over it, SharedMemory)."""
+    memory = shared_memory.SharedMemory(name=name)
+    size = (rows + 2) * (cols + 2)
+    buffer = memory.buf
+    grid_map = GridMap(rows, cols, passable=buffer[:size], masks=buffer[size:2 * size],
+                       costs=buffer[2 * size:3 * size], weighted=weighted)
+    return grid_map, memory
+
+
+def _attach(name, rows, cols, weighted):
+    """Pool initializer: map the shared grid once per worker."""
+    global _worker_grid, _worker_memory
+    _worker_grid, _worker_memory = attach_grid(name, rows, cols, weighted)
+
+
+def _solve_chunk(chunk, algorithm):
+    return [solve_one(_worker_grid, index, start, goal, algorithm) for index, start, goal in chunk]
+
+
+def solve_many(grid, queries, algorithm="a_star", workers=None, chunk_size=None, ordered=True):
+    """Answer many (start, goal) queries against one static grid.
+
+    The grid is copied into shared memory once and every worker maps it,
+    so only the query chunks and results cross process boundaries. With
+    ordered=True a list of QueryResult is returned in query order;
+    otherwise a generator yields results as their chunk finishes.
+    """
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f"Unknown algorithm {algorithm!r}; expected one of {sorted(ALGORITHMS)}")
+    results = iter_solve_many(grid, queries, algorithm, workers, chunk_size)
+    if not ordered:
+        return results
+    return sorted(results, key=lambda result: result.index)
+
+
+def iter_solve_many(grid, queries, algorithm="a_star", workers=None, chunk_size=None):
+    """Generator form of solve_many(); yields QueryResults in completion order."""
+    grid_map = as_grid_map(grid)
+    queries = [(index, start, goal) for index, (start, goal) in enumerate(queries)]
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        for index, start, goal in queries:  # No pool: skip the process overhead
+            yield solve_one(grid_map, index, start, goal, algorithm)
+        return
+
+    chunk_size = chunk_size or max(1, -(-len(queries) // (workers * 4)))
+    chunks = [queries[i:i + chunk_size] for i in range(0, len(queries), chunk_size)]
+    memory, initargs = share_grid(grid_map)
+    try:
+        with ProcessPoolExecutor(workers, initializer=_attach, initargs=initargs) as pool:
+            futures = [pool.submit(_solve_chunk, chunk, algorithm) for chunk in chunks]
+            for future in as_completed(futures):
+                yield from future.result()
+    finally:
+        memory.close()
+        memory.unlink()
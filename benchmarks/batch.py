@@ -0,0 +1,36 @@
+"""Throughput of solve_many() with 1, 2, 4 and 8 worker processes.
+
+Run from the repository root:  python -m benchmarks.batch
+"""
+import os
+import random
+import time
+
+from batch import solve_many
+
+SIZE = 200
+DENSITY = 0.2
+QUERIES = 2000
+WORKERS = [1, 2, 4, 8]
+
+
+def main(seed=0):
+    rnd = random.Random(seed)
+    grid = [[-1 if rnd.random() < DENSITY else 0 for _ in range(SIZE)] for _ in range(SIZE)]
+    free = [(r, c) for r in range(SIZE) for c in range(SIZE) if grid[r][c] != -1]
+    queries = [(rnd.choice(free), rnd.choice(free)) for _ in range(QUERIES)]
+
+    print(f"{SIZE}x{SIZE} grid, {DENSITY:.0%} obstacles, {QUERIES} a_star queries, {os.cpu_count()} CPUs")
+    print(f"{'workers':>8} {'seconds':>9} {'queries/s':>10} {'speedup':>8}")
+    baseline = None
+    for workers in WORKERS:
+        t0 = time.perf_counter()
+        results = solve_many(grid, queries, "a_star", workers=workers)
+        elapsed = time.perf_counter() - t0
+        assert len(results) == QUERIES
+        baseline = baseline or elapsed
+        print(f"{workers:>8} {elapsed:>9.2f} {QUERIES / elapsed:>10.0f} {baseline / elapsed:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""bidirectional_a_star vs. a_star and d_star on the same seeded maps.
+
+Run from the repository root:  python -m benchmarks.bidirectional
+"""
+import time
+
+from benchmarks.maps import maze_map, random_map, random_queries, room_map
+from grid import GridMap
+from pathfinding import Pathfinding
+
+SIZE = 200
+QUERIES = 20
+SEARCHES = ["a_star", "d_star", "bidirectional_a_star"]
+
+
+def maps(size, seed):
+    return {
+        "open": random_map(size, 0.0, seed),
+        "random": random_map(size, 0.25, seed),
+        "maze": maze_map(size, seed),
+        "rooms": room_map(size, seed),
+    }
+
+
+def run(grid_map, queries, search):
+    """Return (ms per query, nodes per query, path lengths, [forward, backward] nodes)."""
+    elapsed = nodes = 0
+    lengths, directions = [], [0, 0]
+    for start, goal in queries:
+        planner = Pathfinding(grid_map, start, goal)
+        t0 = time.perf_counter_ns()
+        path, expanded = getattr(planner, search)()
+        elapsed += time.perf_counter_ns() - t0
+        nodes += expanded
+        lengths.append(path and len(path))
+        if search == "bidirectional_a_star":
+            directions[0] += planner.expanded["forward"]
+            directions[1] += planner.expanded["backward"]
+    return elapsed / len(queries) / 1e6, nodes / len(queries), lengths, [n / len(queries) for n in directions]
+
+
+def main(seed=0):
+    print(f"{SIZE}x{SIZE} maps, {QUERIES} seeded queries each; ms and expanded nodes per query")
+    print(f"{'map':>7} {'search':>21} {'ms':>8} {'nodes':>9} {'forward':>9} {'backward':>9}")
+    for name, grid in maps(SIZE, seed).items():
+        grid_map = GridMap.from_lists(grid)
+        queries = random_queries(grid, QUERIES, seed)
+        reference = None
+        for search in SEARCHES:
+            ms, nodes, lengths, (forward, backward) = run(grid_map, queries, search)
+            reference = reference or lengths
+            assert lengths == reference, f"{search} returned a different path length on {name}"
+            split = f"{forward:>9.0f} {backward:>9.0f}" if search == "bidirectional_a_star" else f"{'':>9} {'':>9}"
+            print(f"{name:>7} {search:>21} {ms:>8.2f} {nodes:>9.0f} {split}")
+
+
+if __name__ == "__main__":
+    main()
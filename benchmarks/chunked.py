@@ -0,0 +1,67 @@
+"""Chunk size and LRU capacity vs. search latency on a huge, mostly empty ChunkedGrid.
+
+Run from the repository root:  python -m benchmarks.chunked
+"""
+import random
+import time
+
+from chunked import FREE, ChunkedGrid
+from jumpstart import JumpStart
+from pathfinding import Pathfinding
+
+WORLD = 1 << 20  # Rows and columns: about 10^12 cells, far too many to hold densely
+EMPTY = 0.7  # Share of chunk-sized areas with no obstacles at all
+DENSITY = 0.25  # Obstacle probability inside the other areas
+QUERIES = 20
+SPAN = 300  # Queries stay within this many rows/columns of a random origin
+CHUNK_SIZES = [16, 32, 64, 128]
+CAPACITIES = [16, 256]
+
+
+def world_loader(chunk_size, seed):
+    """Deterministic procedural world: each chunk is generated from its coordinates."""
+    def loader(chunk_row, chunk_col):
+        rnd = random.Random(hash((seed, chunk_size, chunk_row, chunk_col)))
+        if rnd.random() < EMPTY:
+            return FREE
+        return [[-1 if rnd.random() < DENSITY else 0 for _ in range(chunk_size)] for _ in range(chunk_size)]
+    return loader
+
+
+def world_queries(grid_map, count, seed):
+    rnd = random.Random(seed)
+    queries = []
+    while len(queries) < count:
+        row, col = rnd.randrange(WORLD - SPAN), rnd.randrange(WORLD - SPAN)
+        start = (row + rnd.randrange(SPAN), col + rnd.randrange(SPAN))
+        goal = (row + rnd.randrange(SPAN), col + rnd.randrange(SPAN))
+        if grid_map.is_passable(start) and grid_map.is_passable(goal):
+            queries.append((start, goal))
+    return queries
+
+
+def main(seed=0):
+    print(f"{WORLD}x{WORLD} world, {EMPTY:.0%} empty chunks, {QUERIES} queries within {SPAN} cells")
+    print(f"{'search':>6} {'chunk':>6} {'LRU':>5} {'ms':>8} {'loads':>7} {'hit rate':>9} {'evicted':>8} {'uniform':>8}")
+    for search in ("a_star", "jps"):
+        for chunk_size in CHUNK_SIZES:
+            for capacity in CAPACITIES:
+                grid_map = ChunkedGrid(WORLD, WORLD, world_loader(chunk_size, seed), chunk_size, capacity)
+                queries = world_queries(grid_map, QUERIES, seed)
+                before = grid_map.stats()
+                t0 = time.perf_counter()
+                for start, goal in queries:
+                    if search == "jps":
+                        JumpStart(grid_map, start, goal).jump_point_search()
+                    else:
+                        Pathfinding(grid_map, start, goal).a_star()
+                ms = (time.perf_counter() - t0) / QUERIES * 1000
+                stats = grid_map.stats()
+                lookups = stats["lookups"] - before["lookups"]
+                hit_rate = (stats["hits"] - before["hits"]) / lookups if lookups else 0.0
+                print(f"{search:>6} {chunk_size:>6} {capacity:>5} {ms:>8.1f} {stats['loads'] - before['loads']:>7} "
+                      f"{hit_rate:>9.1%} {stats['evictions'] - before['evictions']:>8} {stats['uniform']:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Memory of long paths: lists of (row, col) tuples vs. CompactPath.
+
+Run from the repository root:  python -m benchmarks.compact_path
+"""
+import sys
+import time
+
+from benchmarks.maps import maze_map, room_map
+from grid import GridMap
+from jumpstart import JumpStart
+from pathfinding import Pathfinding
+
+SIZE = 512
+
+
+def list_bytes(path):
+    """Deep size of a list of tuples; small ints are shared by CPython and not counted."""
+    seen = set()
+    total = sys.getsizeof(path)
+    for cell in path:
+        total += sys.getsizeof(cell)
+        for value in cell:
+            if not -5 <= value <= 256 and id(value) not in seen:
+                seen.add(id(value))
+                total += sys.getsizeof(value)
+    return total
+
+
+def compact_bytes(path):
+    return sys.getsizeof(path) + sys.getsizeof(path.points) + sys.getsizeof(path.index)
+
+
+def solve(grid_map, search, compact, start, goal):
+    t0 = time.perf_counter()
+    if search == "jps":
+        path, _ = JumpStart(grid_map, start, goal, compact=compact).jump_point_search()
+    else:
+        path, _ = getattr(Pathfinding(grid_map, start, goal, compact=compact), search)()
+    return path, (time.perf_counter() - t0) * 1000
+
+
+def main():
+    cases = [
+        ("open", [[0] * SIZE for _ in range(SIZE)]),
+        ("rooms", room_map(SIZE, 0)),
+        ("maze", maze_map(SIZE, 0)),
+    ]
+    print(f"{SIZE}x{SIZE} maps, first to last free cell")
+    print(f"{'map':>6} {'search':>7} {'cells':>8} {'turns':>7} {'list B':>10} {'compact B':>10} {'ratio':>7} "
+          f"{'list ms':>8} {'compact ms':>10}")
+    for name, grid in cases:
+        grid_map = GridMap.from_lists(grid)
+        free = [(row, col) for row in range(SIZE) for col in range(SIZE) if grid[row][col] != -1]
+        start, goal = free[0], free[-1]
+        for search in ("a_star", "bfs", "jps"):
+            path, list_ms = solve(grid_map, search, False, start, goal)
+            compact, compact_ms = solve(grid_map, search, True, start, goal)
+            if path is None:
+                print(f"{name:>6} {search:>7}  no path")
+                continue
+            assert compact == path
+            listed, packed = list_bytes(path), compact_bytes(compact)
+            print(f"{name:>6} {search:>7} {len(compact):>8} {len(compact.index):>7} {listed:>10} {packed:>10} "
+                  f"{listed / packed:>7.1f} {list_ms:>8.1f} {compact_ms:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Unreachable queries with and without a ComponentIndex, plus index upkeep costs.
+
+Run from the repository root:  python -m benchmarks.components
+"""
+import random
+import time
+
+import components
+from benchmarks.maps import free_cells, random_map
+from grid import GridMap
+from pathfinding import Pathfinding
+
+SIZE = 256
+DENSITY = 0.4  # Dense enough to fragment the map into many components
+QUERIES = 50
+CHANGES = 200
+
+
+def unreachable_queries(grid, count, seed):
+    """Seeded (start, goal) pairs of free cells that are not connected."""
+    index = components.ComponentIndex(GridMap.from_lists(grid))
+    rnd = random.Random(seed)
+    free = free_cells(grid)
+    queries = []
+    while len(queries) < count:
+        start, goal = rnd.choice(free), rnd.choice(free)
+        if not index.connected(start, goal):
+            queries.append((start, goal))
+    return queries
+
+
+def time_queries(grid_map, queries, search):
+    t0 = time.perf_counter()
+    for start, goal in queries:
+        getattr(Pathfinding(grid_map, start, goal), search)()
+    return (time.perf_counter() - t0) / len(queries) * 1000
+
+
+def main(seed=0):
+    grid = random_map(SIZE, DENSITY, seed)
+    queries = unreachable_queries(grid, QUERIES, seed)
+    print(f"{SIZE}x{SIZE} grid, {DENSITY:.0%} obstacles, {QUERIES} unreachable queries; ms per query")
+    print(f"{'search':>10} {'no index':>10} {'index':>10}")
+    plain, indexed = GridMap.from_lists(grid), GridMap.from_lists(grid)
+    t0 = time.perf_counter()
+    components.index_for(indexed)
+    build_ms = (time.perf_counter() - t0) * 1000
+    for search in ("a_star", "bfs", "d_star"):
+        print(f"{search:>10} {time_queries(plain, queries, search):>10.3f} {time_queries(indexed, queries, search):>10.3f}")
+
+    rnd = random.Random(seed + 1)
+    index = components.index_for(indexed)
+    timings = {-1: [], 0: []}
+    for _ in range(CHANGES):
+        row, col, value = rnd.randrange(SIZE), rnd.randrange(SIZE), rnd.choice([-1, 0])
+        if not indexed.update_cells([(row, col, value)]):
+            continue
+        t0 = time.perf_counter()
+        index.refresh()
+        timings[value].append(time.perf_counter() - t0)
+    t0 = time.perf_counter()
+    components.ComponentIndex(indexed)
+    rebuild_ms = (time.perf_counter() - t0) * 1000
+    print(f"index build {build_ms:.1f} ms, full relabel {rebuild_ms:.1f} ms")
+    for value, label in ((-1, "block"), (0, "free")):
+        samples = timings[value]
+        if samples:
+            print(f"{label:>6}: {len(samples)} updates, mean {sum(samples) / len(samples) * 1000:.3f} ms, "
+                  f"max {max(samples) * 1000:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
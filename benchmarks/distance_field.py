@@ -0,0 +1,48 @@
+"""One shared distance field vs. one bfs/d_star per agent, all heading to one goal.
+
+Run from the repository root:  python -m benchmarks.distance_field
+"""
+import random
+import time
+
+from benchmarks.maps import free_cells, random_map
+from distance_field import DistanceField
+from grid import GridMap
+from pathfinding import Pathfinding
+
+SIZE = 300
+AGENTS = [1, 10, 100]
+
+
+def main(seed=0):
+    grid = random_map(SIZE, 0.2, seed)
+    goal = (SIZE // 2, SIZE // 2)
+    grid[goal[0]][goal[1]] = 0
+    grid_map = GridMap.from_lists(grid)
+    starts = random.Random(seed).sample(free_cells(grid), max(AGENTS))
+
+    print(f"{SIZE}x{SIZE} grid, 20% obstacles, one goal")
+    print(f"{'agents':>7} {'bfs ms':>9} {'d_star ms':>10} {'field ms':>9}")
+    for agents in AGENTS:
+        timings = []
+        for search in ("bfs", "d_star"):
+            t0 = time.perf_counter()
+            for start in starts[:agents]:
+                getattr(Pathfinding(grid_map, start, goal), search)()
+            timings.append(time.perf_counter() - t0)
+        t0 = time.perf_counter()
+        field = DistanceField(grid_map, goal)
+        for start in starts[:agents]:
+            field.path(start)
+        timings.append(time.perf_counter() - t0)
+        print(f"{agents:>7} " + " ".join(f"{t * 1000:>9.1f}" for t in timings))
+
+    changes = [(r, c, -1) for r, c in random.Random(seed + 1).sample(free_cells(grid), 50) if (r, c) != goal]
+    grid_map.update_cells(changes)
+    t0 = time.perf_counter()
+    field.refresh()
+    print(f"refresh after {len(changes)} new obstacles: {(time.perf_counter() - t0) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
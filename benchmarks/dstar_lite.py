@@ -0,0 +1,65 @@
+"""Compare D* Lite repairs against re-running d_star from scratch.
+
+Run from the repository root:  python -m benchmarks.dstar_lite
+"""
+import random
+import time
+
+from pathfinding import Pathfinding
+
+SIZE = 150
+DENSITY = 0.2
+ROUNDS = 20
+CHANGE_RATES = [0.0005, 0.001, 0.005, 0.01, 0.05]
+
+
+def random_grid(rnd, size, density):
+    grid = [[-1 if rnd.random() < density else 0 for _ in range(size)] for _ in range(size)]
+    grid[0][0] = grid[size - 1][size - 1] = 0
+    return grid
+
+
+def run(rate, seed=0):
+    rnd = random.Random(seed)
+    grid = random_grid(rnd, SIZE, DENSITY)
+    start, goal = (0, 0), (SIZE - 1, SIZE - 1)
+    planner = Pathfinding(grid, start, goal)
+    path, _ = planner.d_star()
+    repair_ns = full_ns = repair_nodes = full_nodes = 0
+    changes_per_round = max(1, int(rate * SIZE * SIZE))
+
+    for _ in range(ROUNDS):
+        if path and len(path) > 2:
+            planner.start = path[1]  # The agent walks one step per round
+        changes = []
+        for _ in range(changes_per_round):
+            cell = (rnd.randrange(SIZE), rnd.randrange(SIZE))
+            if cell not in (planner.start, goal):
+                changes.append((cell[0], cell[1], -1 if rnd.random() < DENSITY else 0))
+
+        t0 = time.perf_counter_ns()
+        planner.update_cells(changes)
+        path, expanded = planner.d_star()
+        repair_ns += time.perf_counter_ns() - t0
+        repair_nodes += expanded
+
+        fresh = Pathfinding(grid, planner.start, goal)  # grid was updated in place
+        t0 = time.perf_counter_ns()
+        full_path, expanded = fresh.d_star()
+        full_ns += time.perf_counter_ns() - t0
+        full_nodes += expanded
+        assert (path is None) == (full_path is None) and (not path or len(path) == len(full_path))
+
+    return repair_ns / ROUNDS / 1e6, full_ns / ROUNDS / 1e6, repair_nodes / ROUNDS, full_nodes / ROUNDS
+
+
+def main():
+    print(f"{SIZE}x{SIZE} grid, {DENSITY:.0%} obstacles, {ROUNDS} rounds, agent moves 1 cell/round")
+    print(f"{'change rate':>12} {'repair ms':>10} {'full ms':>10} {'repair nodes':>13} {'full nodes':>11} {'speedup':>8}")
+    for rate in CHANGE_RATES:
+        repair_ms, full_ms, repair_nodes, full_nodes = run(rate)
+        print(f"{rate:>12.4f} {repair_ms:>10.2f} {full_ms:>10.2f} {repair_nodes:>13.0f} {full_nodes:>11.0f} {full_ms / repair_ms:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Nearest of many goals: one a_star per goal vs. one nearest_goals pass.
+
+Run from the repository root:  python -m benchmarks.goals
+"""
+import random
+import time
+
+from benchmarks.maps import FAMILIES, free_cells
+from grid import GridMap
+from pathfinding import Pathfinding
+
+SIZE = 256
+GOAL_COUNTS = (1, 4, 16, 64, 256)
+STARTS = 10
+
+
+def looped(grid_map, start, goals):
+    """The classic way: a full search to every goal, keep the cheapest."""
+    best, nodes = None, 0
+    for goal in goals:
+        path, expanded = Pathfinding(grid_map, start, goal).a_star()
+        nodes += expanded
+        if path is not None and (best is None or len(path) < best):
+            best = len(path)
+    return (best - 1 if best is not None else None), nodes
+
+
+def one_pass(grid_map, start, goals, k=1):
+    results, nodes = Pathfinding(grid_map, start, start).nearest_goals(goals, k)
+    return (results[0].cost if results else None), nodes
+
+
+def timed(fn, *args, **kwargs):
+    t0 = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, (time.perf_counter() - t0) * 1000
+
+
+def main(seed=0):
+    print(f"{SIZE}x{SIZE} maps, {STARTS} seeded starts per row; ms and expansions per query")
+    print(f"{'map':>7} {'goals':>6} {'loop ms':>9} {'loop nodes':>11} {'k=1 ms':>8} {'k=1 nodes':>10} "
+          f"{'k=4 ms':>8} {'k=4 nodes':>10} {'speedup':>8}")
+    for family in ("random", "rooms"):
+        grid = FAMILIES[family](SIZE, 0.3, seed)
+        grid_map = GridMap.from_lists(grid)
+        free = free_cells(grid)
+        rnd = random.Random(seed)
+        starts = rnd.sample(free, STARTS)
+        for count in GOAL_COUNTS:
+            goals = rnd.sample(free, count)
+            totals = [0.0] * 6
+            for start in starts:
+                (loop_cost, loop_nodes), loop_ms = timed(looped, grid_map, start, goals)
+                (cost, nodes), ms = timed(one_pass, grid_map, start, goals)
+                (_, k_nodes), k_ms = timed(one_pass, grid_map, start, goals, k=4)
+                assert cost == loop_cost
+                for i, value in enumerate((loop_ms, loop_nodes, ms, nodes, k_ms, k_nodes)):
+                    totals[i] += value / STARTS
+            loop_ms, loop_nodes, ms, nodes, k_ms, k_nodes = totals
+            print(f"{family:>7} {count:>6} {loop_ms:>9.1f} {loop_nodes:>11.0f} {ms:>8.1f} {nodes:>10.0f} "
+                  f"{k_ms:>8.1f} {k_nodes:>10.0f} {loop_ms / ms:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
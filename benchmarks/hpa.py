@@ -0,0 +1,54 @@
+"""Flat a_star vs. HPA* (fast and optimal modes) on large seeded maps.
+
+Run from the repository root:  python -m benchmarks.hpa [--size 2048]
+"""
+import argparse
+import time
+
+from benchmarks.maps import random_map, random_queries, room_map
+from grid import GridMap
+from hpa import HierarchicalMap
+from pathfinding import Pathfinding
+
+
+def run_queries(find, queries):
+    elapsed = expanded = length = 0
+    for start, goal in queries:
+        t0 = time.perf_counter()
+        path, node_expanded = find(start, goal)
+        elapsed += time.perf_counter() - t0
+        expanded += node_expanded
+        length += len(path) if path else 0
+    return elapsed / len(queries) * 1000, expanded / len(queries), length
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=512)
+    parser.add_argument("--cluster-size", type=int, default=16)
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    maps = {
+        "random 20%": random_map(args.size, 0.2, args.seed),
+        "rooms": room_map(args.size, args.seed),
+    }
+    print(f"{args.size}x{args.size}, cluster {args.cluster_size}, {args.queries} queries per map")
+    print(f"{'map':>11} {'search':>12} {'build s':>8} {'ms/query':>9} {'nodes':>9} {'len ratio':>9}")
+    for name, grid in maps.items():
+        grid_map = GridMap.from_lists(grid)
+        queries = random_queries(grid, args.queries, args.seed)
+        flat_ms, flat_nodes, flat_length = run_queries(lambda s, g: Pathfinding(grid_map, s, g).a_star(), queries)
+        print(f"{name:>11} {'a_star':>12} {0:>8.2f} {flat_ms:>9.2f} {flat_nodes:>9.0f} {1.0:>9.3f}")
+        for optimal in (False, True):
+            t0 = time.perf_counter()
+            hierarchy = HierarchicalMap(grid_map, args.cluster_size, optimal=optimal)
+            build = time.perf_counter() - t0
+            ms, nodes, length = run_queries(hierarchy.find_path, queries)
+            label = "hpa optimal" if optimal else "hpa fast"
+            print(f"{name:>11} {label:>12} {build:>8.2f} {ms:>9.2f} {nodes:>9.0f} {length / flat_length:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
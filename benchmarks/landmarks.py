@@ -0,0 +1,45 @@
+"""ALT landmark heuristics: table memory vs. a_star node expansions for several K.
+
+Run from the repository root:  python -m benchmarks.landmarks
+"""
+import time
+
+from benchmarks.maps import FAMILIES, random_queries
+from grid import GridMap
+from landmarks import LandmarkHeuristic
+from pathfinding import Pathfinding
+
+SIZE = 128
+QUERIES = 30
+COUNTS = [0, 1, 2, 4, 8, 16]
+
+
+def run_queries(grid_map, queries, landmarks):
+    nodes = 0
+    t0 = time.perf_counter()
+    for start, goal in queries:
+        nodes += Pathfinding(grid_map, start, goal, landmarks=landmarks).a_star()[1]
+    return nodes / len(queries), (time.perf_counter() - t0) / len(queries) * 1000
+
+
+def main(seed=0):
+    print(f"{SIZE}x{SIZE} maps, {QUERIES} seeded a_star queries; K=0 is plain Manhattan")
+    print(f"{'map':>7} {'selection':>9} {'K':>3} {'KiB':>7} {'build s':>8} {'nodes':>9} {'vs. K=0':>8} {'ms':>7}")
+    for family in ("random", "maze", "rooms"):
+        grid = FAMILIES[family](SIZE, 0.3, seed)
+        grid_map = GridMap.from_lists(grid)
+        queries = random_queries(grid, QUERIES, seed)
+        base_nodes, base_ms = run_queries(grid_map, queries, None)
+        print(f"{family:>7} {'-':>9} {0:>3} {0:>7.0f} {0:>8.2f} {base_nodes:>9.0f} {1:>8.2f} {base_ms:>7.2f}")
+        for selection in ("farthest", "avoid"):
+            for count in COUNTS[1:]:
+                t0 = time.perf_counter()
+                landmarks = LandmarkHeuristic(grid_map, count, selection, seed=seed)
+                build = time.perf_counter() - t0
+                nodes, ms = run_queries(grid_map, queries, landmarks)
+                print(f"{family:>7} {selection:>9} {count:>3} {landmarks.nbytes / 1024:>7.0f} {build:>8.2f} "
+                      f"{nodes:>9.0f} {nodes / base_nodes:>8.2f} {ms:>7.2f}")
+
+
+if __name__ == "__main__":
+    main()
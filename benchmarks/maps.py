@@ -0,0 +1,63 @@
+"""Seeded map families for benchmarks: random obstacles, mazes and rooms."""
+import random
+
+
+def random_map(size, density, seed):
+    """Uniform random obstacles; `density` is the obstacle probability per cell."""
+    rnd = random.Random(seed)
+    return [[-1 if rnd.random() < density else 0 for _ in range(size)] for _ in range(size)]
+
+
+def maze_map(size, seed):
+    """Perfect maze carved by an iterative depth-first search (corridors 1 cell wide)."""
+    rnd = random.Random(seed)
+    grid = [[-1] * size for _ in range(size)]
+    grid[0][0] = 0
+    stack = [(0, 0)]
+    while stack:
+        row, col = stack[-1]
+        options = [
+            (row + dr, col + dc, row + dr // 2, col + dc // 2)
+            for dr, dc in ((-2, 0), (2, 0), (0, -2), (0, 2))
+            if 0 <= row + dr < size and 0 <= col + dc < size and grid[row + dr][col + dc] == -1
+        ]
+        if not options:
+            stack.pop()
+            continue
+        next_row, next_col, wall_row, wall_col = rnd.choice(options)
+        grid[wall_row][wall_col] = grid[next_row][next_col] = 0
+        stack.append((next_row, next_col))
+    return grid
+
+
+def room_map(size, seed, room=10):
+    """Square rooms separated by 1-cell walls, each wall pierced by one door."""
+    rnd = random.Random(seed)
+    grid = [[0] * size for _ in range(size)]
+    for wall in range(room, size, room + 1):
+        for i in range(size):
+            grid[wall][i] = grid[i][wall] = -1
+    for wall in range(room, size, room + 1):
+        for lo in range(0, size, room + 1):
+            hi = min(lo + room, size)
+            grid[wall][rnd.randrange(lo, hi)] = 0  # Door in the horizontal wall
+            grid[rnd.randrange(lo, hi)][wall] = 0  # Door in the vertical wall
+    return grid
+
+
+def free_cells(grid):
+    return [(r, c) for r, row in enumerate(grid) for c, value in enumerate(row) if value != -1]
+
+
+def random_queries(grid, count, seed):
+    """Pick `count` seeded (start, goal) pairs of free cells."""
+    rnd = random.Random(seed)
+    free = free_cells(grid)
+    return [(rnd.choice(free), rnd.choice(free)) for _ in range(count)]
+
+
+FAMILIES = {
+    "random": lambda size, density, seed: random_map(size, density, seed),
+    "maze": lambda size, density, seed: maze_map(size, seed),
+    "rooms": lambda size, density, seed: room_map(size, seed),
+}
@@ -0,0 +1,50 @@
+"""a_star / jump_point_search with the heapq, Dial bucket and radix heap open lists.
+
+Run from the repository root:  python -m benchmarks.open_list
+"""
+import random
+import time
+
+from benchmarks.maps import random_map, random_queries
+from grid import GridMap
+from jumpstart import JumpStart
+from open_list import OPEN_LISTS
+from pathfinding import Pathfinding
+
+SIZES = [128, 256]
+QUERIES = 10
+
+
+def weighted_map(size, seed):
+    """Random obstacles plus terrain costs 1..9 on the free cells."""
+    rnd = random.Random(seed)
+    grid = random_map(size, 0.2, seed)
+    return [[v if v == -1 else rnd.choice([1, 1, 1, 2, 3, 5, 9]) for v in row] for row in grid]
+
+
+def time_queries(make, queries):
+    t0 = time.perf_counter()
+    for start, goal in queries:
+        make(start, goal)()
+    return (time.perf_counter() - t0) / len(queries) * 1000
+
+
+def main(seed=0):
+    print(f"ms per query ({QUERIES} seeded queries), speedup vs. heapq in brackets")
+    print(f"{'map':>14} {'search':>18} " + " ".join(f"{name:>14}" for name in OPEN_LISTS))
+    for size in SIZES:
+        for label, grid, weighted in (("unit", random_map(size, 0.2, seed), False), ("weighted", weighted_map(size, seed), True)):
+            grid_map = GridMap.from_lists(grid, weighted)
+            queries = random_queries(grid, QUERIES, seed)
+            searches = {
+                "a_star": lambda s, g, o: Pathfinding(grid_map, s, g, open_list=o).a_star,
+                "jump_point_search": lambda s, g, o: JumpStart(grid_map, s, g, open_list=o).jump_point_search,
+            }
+            for search, factory in searches.items():
+                timings = {name: time_queries(lambda s, g: factory(s, g, name), queries) for name in OPEN_LISTS}
+                cells = " ".join(f"{ms:>7.2f} ({timings['heapq'] / ms:>4.2f}x)" for ms in timings.values())
+                print(f"{f'{label} {size}':>14} {search:>18} {cells}")
+
+
+if __name__ == "__main__":
+    main()
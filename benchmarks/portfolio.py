@@ -0,0 +1,51 @@
+"""Portfolio racing vs. each algorithm alone, before and after the predictor has learned.
+
+Run from the repository root:  python -m benchmarks.portfolio
+"""
+import time
+
+from batch import ALGORITHMS
+from benchmarks.maps import FAMILIES, random_queries
+from grid import GridMap
+from portfolio import DEFAULT_PORTFOLIO, PortfolioSolver, Predictor
+
+SIZE = 256
+QUERIES = 40
+
+
+def alone(grid_map, queries, algorithm):
+    cls, method = ALGORITHMS[algorithm]
+    t0 = time.perf_counter()
+    for start, goal in queries:
+        getattr(cls(grid_map, start, goal), method)()
+    return (time.perf_counter() - t0) / len(queries) * 1000
+
+
+def raced(solver, queries, accept):
+    t0 = time.perf_counter()
+    for start, goal in queries:
+        solver.solve(start, goal, accept)
+    return (time.perf_counter() - t0) / len(queries) * 1000
+
+
+def main(seed=0):
+    print(f"{SIZE}x{SIZE} maps, {QUERIES} seeded queries; ms per query")
+    print(f"{'map':>7} {'accept':>8} " + " ".join(f"{name[:12]:>12}" for name in DEFAULT_PORTFOLIO)
+          + f" {'race':>8} {'learned':>8}  winners")
+    for family in ("random", "maze", "rooms"):
+        grid = FAMILIES[family](SIZE, 0.3, seed)
+        grid_map = GridMap.from_lists(grid)
+        queries = random_queries(grid, QUERIES, seed)
+        times = [alone(grid_map, queries, algorithm) for algorithm in DEFAULT_PORTFOLIO]
+        for accept in ("optimal", "any"):
+            predictor = Predictor(explore=0.0)
+            with PortfolioSolver(grid_map, predictor=predictor) as solver:
+                race_ms = raced(solver, queries, accept)  # Every query races while the counts build up...
+                winners = {name: wins for name, wins in solver.wins.items() if wins}
+                learned_ms = raced(solver, queries, accept)  # ...then the predicted winner runs alone
+            print(f"{family:>7} {accept:>8} " + " ".join(f"{ms:>12.2f}" for ms in times)
+                  + f" {race_ms:>8.2f} {learned_ms:>8.2f}  {winners}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""Plot results written by benchmarks.suite (needs matplotlib).
+
+    python -m benchmarks.report results.json [--save report.png]
+"""
+import argparse
+import json
+
+import matplotlib.pyplot as plt
+
+
+def plot(records, save=None):
+    families = sorted({r["family"] for r in records})
+    algorithms = list(dict.fromkeys(r["algorithm"] for r in records))
+    metrics = [("p50_us", "p50 latency (us)"), ("p99_us", "p99 latency (us)"), ("nodes_expanded", "Nodes expanded")]
+    figure, axes = plt.subplots(len(metrics), len(families), figsize=(5 * len(families), 4 * len(metrics)), squeeze=False)
+    for col, family in enumerate(families):
+        rows = [r for r in records if r["family"] == family]
+        # The random family is summarised at its densest setting
+        density = max((r["density"] for r in rows if r["density"] is not None), default=None)
+        rows = [r for r in rows if r["density"] == density]
+        for row, (metric, label) in enumerate(metrics):
+            ax = axes[row][col]
+            for algorithm in algorithms:
+                points = sorted((r["size"], r[metric]) for r in rows if r["algorithm"] == algorithm and r[metric] is not None)
+                if points:
+                    ax.plot(*zip(*points), label=algorithm, marker="o")
+            ax.set_title(f"{family}" + (f" (density {density})" if density is not None else ""))
+            ax.set_xlabel("Grid size")
+            ax.set_ylabel(label)
+            ax.grid(True)
+    axes[0][0].legend()
+    figure.tight_layout()
+    if save:
+        figure.savefig(save)
+    else:
+        plt.show()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("results", help="JSON file written by benchmarks.suite --out")
+    parser.add_argument("--save", help="write the figure to this file instead of showing it")
+    args = parser.parse_args(argv)
+    with open(args.results) as f:
+        plot(json.load(f), args.save)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""PathService under concurrent load vs. one executor call per request.
+
+A stand-in load generator runs `concurrency` clients that each send their
+next query as soon as the previous one is answered. Most queries go to a
+few hot goals (as with many agents heading for the same places) and some
+repeat exactly.
+
+Run from the repository root:  python -m benchmarks.service
+"""
+import asyncio
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from batch import share_grid
+from benchmarks.maps import free_cells, random_map
+from grid import GridMap
+from service import PathService, _attach, _percentile, _solve
+
+SIZE = 128
+QUERIES = 600
+HOT_GOALS = 4
+HOT_SHARE = 0.8
+CONCURRENCY = [1, 16, 64]
+
+
+def query_mix(grid, count, seed):
+    rnd = random.Random(seed)
+    free = free_cells(grid)
+    hot = rnd.sample(free, HOT_GOALS)
+    queries = []
+    while len(queries) < count:
+        if queries and rnd.random() < 0.1:
+            queries.append(rnd.choice(queries))  # Exact repeat
+            continue
+        goal = rnd.choice(hot) if rnd.random() < HOT_SHARE else rnd.choice(free)
+        queries.append((rnd.choice(free), goal))
+    return queries
+
+
+async def generate_load(ask, queries, concurrency):
+    """Closed-loop clients; returns (wall seconds, sorted per-request latencies)."""
+    pending = iter(queries)
+    latencies = []
+
+    async def client():
+        for start, goal in pending:
+            t0 = time.perf_counter()
+            await ask(start, goal)
+            latencies.append(time.perf_counter() - t0)
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    return time.perf_counter() - t0, sorted(latencies)
+
+
+async def naive(grid_map, queries, concurrency, workers):
+    """One fresh a_star per request, sent straight to the same kind of pool."""
+    memory, shared = share_grid(grid_map)
+    try:
+        with ProcessPoolExecutor(workers, initializer=_attach, initargs=(shared,)) as pool:
+            loop = asyncio.get_running_loop()
+            ask = lambda start, goal: loop.run_in_executor(pool, _solve, goal, [start], "a_star", False)
+            return await generate_load(ask, queries, concurrency)
+    finally:
+        memory.close()
+        memory.unlink()
+
+
+async def served(grid_map, queries, concurrency, workers):
+    async with PathService(grid_map, workers=workers) as service:
+        wall, latencies = await generate_load(service.find_path, queries, concurrency)
+        return wall, latencies, service.metrics()
+
+
+def report(label, concurrency, wall, latencies, jobs):
+    print(f"{label:>8} {concurrency:>6} {len(latencies) / wall:>8.0f} {_percentile(latencies, 0.5) * 1000:>8.1f} "
+          f"{_percentile(latencies, 0.99) * 1000:>8.1f} {jobs:>6}")
+
+
+def main(seed=0):
+    workers = os.cpu_count() or 1
+    grid = random_map(SIZE, 0.25, seed)
+    grid_map = GridMap.from_lists(grid)
+    queries = query_mix(grid, QUERIES, seed)
+    print(f"{SIZE}x{SIZE} grid, {QUERIES} queries ({HOT_SHARE:.0%} to {HOT_GOALS} hot goals), {workers} workers")
+    print(f"{'mode':>8} {'conc.':>6} {'qps':>8} {'p50 ms':>8} {'p99 ms':>8} {'jobs':>6}")
+    for concurrency in CONCURRENCY:
+        wall, latencies = asyncio.run(naive(grid_map, queries, concurrency, workers))
+        report("naive", concurrency, wall, latencies, len(queries))
+        wall, latencies, metrics = asyncio.run(served(grid_map, queries, concurrency, workers))
+        report("service", concurrency, wall, latencies, metrics["jobs"])
+
+
+if __name__ == "__main__":
+    main()
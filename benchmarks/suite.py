@@ -0,0 +1,154 @@
+"""Headless benchmark runner for every search in Pathfinding and JumpStart.
+
+Sweeps map families, grid sizes and obstacle densities with fixed seeds,
+times each query with perf_counter_ns after warmup runs, and writes one
+record per (family, size, density, algorithm) to JSON and/or CSV.
+
+    python -m benchmarks.suite --out results.json --csv results.csv
+    python -m benchmarks.suite --baseline results.json --tolerance 0.25
+
+With --baseline the run exits with status 1 when any p50 latency is more
+than `tolerance` slower than the saved result for the same key.
+"""
+import argparse
+import csv
+import json
+import sys
+import time
+import tracemalloc
+
+import jumpstart
+from benchmarks.maps import FAMILIES, random_queries
+from grid import GridMap
+from jumpstart import JumpStart
+from pathfinding import Pathfinding
+
+ALGORITHMS = ["a_star", "bidirectional_a_star", "d_star", "bfs", "greedy_best_first_search", "jump_point_search", "jps_plus"]
+KEY_FIELDS = ["family", "size", "density", "algorithm"]
+
+
+def make_search(grid_map, algorithm, start, goal, jump_table):
+    """Return a zero-argument callable running one fresh search."""
+    if algorithm in ("jump_point_search", "jps_plus"):
+        search = JumpStart(grid_map, start, goal)
+        search.jump_table = jump_table if algorithm == "jps_plus" else None
+        return search.jump_point_search
+    return getattr(Pathfinding(grid_map, start, goal), algorithm)
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list."""
+    index = max(0, min(len(sorted_values) - 1, int(round(fraction * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+
+def peak_memory(search):
+    tracemalloc.start()
+    try:
+        search()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def bench_case(grid, algorithm, queries, warmup, repetitions):
+    grid_map = GridMap.from_lists(grid)
+    jump_table = jumpstart.JumpTable(grid_map) if algorithm == "jps_plus" else None
+    latencies, expanded, pushes, peak, found = [], [], [], 0, 0
+    for start, goal in queries:
+        make = lambda: make_search(grid_map, algorithm, start, goal, jump_table)
+        for _ in range(warmup):
+            make()()
+        for _ in range(repetitions):
+            search = make()
+            t0 = time.perf_counter_ns()
+            result = search()
+            latencies.append(time.perf_counter_ns() - t0)
+        path, node_expanded = result
+        found += path is not None
+        expanded.append(node_expanded)
+        pushes.append(search.__self__.stats.pushes)  # Same counters for every search
+        peak = max(peak, peak_memory(make()))
+    latencies.sort()
+    return {
+        "queries": len(queries),
+        "found": found,
+        "p50_us": percentile(latencies, 0.50) / 1000,
+        "p95_us": percentile(latencies, 0.95) / 1000,
+        "p99_us": percentile(latencies, 0.99) / 1000,
+        "mean_us": sum(latencies) / len(latencies) / 1000,
+        "nodes_expanded": sum(expanded) / len(expanded),
+        "heap_pushes": sum(pushes) / len(pushes),
+        "peak_kib": peak / 1024,
+    }
+
+
+def run(families, sizes, densities, algorithms, queries, warmup, repetitions, seed, log=print):
+    records = []
+    for family in families:
+        for size in sizes:
+            # Density only shapes the random family; mazes and rooms run once per size
+            for density in densities if family == "random" else [None]:
+                grid = FAMILIES[family](size, density, seed)
+                pairs = random_queries(grid, queries, seed)
+                for algorithm in algorithms:
+                    record = {"family": family, "size": size, "density": density, "algorithm": algorithm, "seed": seed}
+                    record.update(bench_case(grid, algorithm, pairs, warmup, repetitions))
+                    records.append(record)
+                    nodes = record["nodes_expanded"]
+                    log(f"{family:>6} {size:>5} {density if density is not None else '-':>5} {algorithm:>25} "
+                        f"p50 {record['p50_us']:>10.1f}us  p99 {record['p99_us']:>10.1f}us  "
+                        f"nodes {nodes:>9.1f}")
+    return records
+
+
+def compare(records, baseline, tolerance):
+    """Return a description of every record whose p50 regressed past `tolerance`."""
+    saved = {tuple(r[k] for k in KEY_FIELDS): r for r in baseline}
+    regressions = []
+    for record in records:
+        old = saved.get(tuple(record[k] for k in KEY_FIELDS))
+        if old and record["p50_us"] > old["p50_us"] * (1 + tolerance):
+            key = "/".join(str(record[k]) for k in KEY_FIELDS)
+            regressions.append(f"{key}: p50 {old['p50_us']:.1f}us -> {record['p50_us']:.1f}us")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--families", nargs="+", default=sorted(FAMILIES), choices=sorted(FAMILIES))
+    parser.add_argument("--sizes", nargs="+", type=int, default=[32, 64, 128])
+    parser.add_argument("--densities", nargs="+", type=float, default=[0.1, 0.2, 0.3])
+    parser.add_argument("--algorithms", nargs="+", default=ALGORITHMS, choices=ALGORITHMS)
+    parser.add_argument("--queries", type=int, default=10, help="(start, goal) pairs per map")
+    parser.add_argument("--warmup", type=int, default=2, help="untimed runs per query")
+    parser.add_argument("--repetitions", type=int, default=10, help="timed runs per query")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", help="write results as JSON")
+    parser.add_argument("--csv", help="write results as CSV")
+    parser.add_argument("--baseline", help="JSON results to compare p50 latencies against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed p50 slowdown vs. baseline")
+    args = parser.parse_args(argv)
+
+    records = run(args.families, args.sizes, args.densities, args.algorithms,
+                  args.queries, args.warmup, args.repetitions, args.seed)
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(records, f, indent=2)
+    if args.csv:
+        with open(args.csv, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=list(records[0]))
+            writer.writeheader()
+            writer.writerows(records)
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(records, json.load(f), args.tolerance)
+        for line in regressions:
+            print("REGRESSION", line)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
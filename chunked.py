@@ -0,0 +1,246 @@
+from collections import OrderedDict
+
+from grid import OBSTACLE, GridMap, cell_cost
+
+# A loader may return one of these instead of rows for a chunk that is all one kind
+FREE = "free"
+BLOCKED = "blocked"
+
+
+class SparseArray(dict):
+    """Stand-in for a flat per-cell array: cells never written read as `fill`."""
+
+    def __init__(self, fill):
+        super().__init__()
+        self.fill = fill
+
+    def __missing__(self, cell):
+        return self.fill
+
+
+class Chunk:
+    """Cells of one square tile, row-major; costs is None on unit-cost tiles."""
+
+    __slots__ = ("passable", "masks", "costs")
+
+    def __init__(self, passable, masks, costs=None):
+        self.passable = passable
+        self.masks = masks
+        self.costs = costs
+
+
+class _Layer:
+    """One of passable / masks / costs, read and written by cell id like GridMap's bytearrays."""
+
+    __slots__ = ("get", "set")
+
+    def __init__(self, get, set):
+        self.get = get
+        self.set = set
+
+    def __getitem__(self, cell):
+        return self.get(cell)
+
+    def __setitem__(self, cell, value):
+        self.set(cell, value)
+
+
+class ChunkedGrid(GridMap):
+    """GridMap whose cells live in square chunks loaded on demand.
+
+    loader(chunk_row, chunk_col) returns up to chunk_size rows of grid
+    values (-1 for an obstacle, as in list-of-lists grids; missing cells are
+    obstacles), or FREE / BLOCKED for a chunk that is all one kind. Uniform
+    chunks, including loaded ones that turn out all free or all blocked, are
+    kept as a single flag outside the LRU; the others sit in an LRU of at
+    most max_chunks entries and are simply loaded again after eviction.
+    Chunks changed through update_cells() are pinned, since the loader
+    would hand back the old cells.
+
+    Cell ids, offsets and neighbor tables are the same as GridMap's, and
+    passable/masks/costs are indexable views, so the searches run on it
+    unchanged; new_array() returns SparseArrays, so per-search state only
+    grows with the cells a search touches. Masks are stored for a chunk's
+    inner cells and worked out from the neighbors on its edge, where they
+    depend on the next chunk. rows and cols may be far beyond what would fit
+    in memory densely.
+    """
+
+    def __init__(self, rows, cols, loader, chunk_size=64, max_chunks=256, weighted=False):
+        self.loader = loader
+        self.chunk_size = chunk_size
+        self.max_chunks = max_chunks
+        self.chunks = OrderedDict()  # (chunk_row, chunk_col) -> Chunk, least recently used first
+        self.uniform = {}  # (chunk_row, chunk_col) -> 1 (all free) or 0 (all blocked)
+        self.edited = {}  # Chunks changed since loading; never evicted
+        self.loads = self.lookups = self.hits = self.evictions = 0
+        self._last_key = self._last = None  # Most searches stay in one chunk for a while
+        self._scratch = GridMap(chunk_size, chunk_size)  # Reused to compute a chunk's masks
+        super().__init__(
+            rows, cols,
+            passable=_Layer(self._get_passable, self._set_passable),
+            masks=_Layer(self._get_mask, self._set_mask),
+            costs=_Layer(self._get_cost, self._set_cost) if weighted else _Layer(lambda cell: 1, self._set_cost),
+            weighted=weighted,
+        )
+
+    def stats(self):
+        return {
+            "chunks": len(self.chunks),
+            "uniform": len(self.uniform),
+            "edited": len(self.edited),
+            "loads": self.loads,
+            "lookups": self.lookups,
+            "hits": self.hits,
+            "hit_rate": self.hits / self.lookups if self.lookups else 0.0,
+            "evictions": self.evictions,
+        }
+
+    def chunk(self, key):
+        """The Chunk or uniform flag of (chunk_row, chunk_col), loading it if needed."""
+        self.lookups += 1
+        chunk = self.edited.get(key)
+        if chunk is None:
+            chunk = self.uniform.get(key)
+        if chunk is None:
+            chunk = self.chunks.get(key)
+            if chunk is not None:
+                self.chunks.move_to_end(key)
+        if chunk is not None:
+            self.hits += 1
+            return chunk
+        self.loads += 1
+        chunk = self._load(key, self.loader(*key))
+        if isinstance(chunk, int):
+            self.uniform[key] = chunk
+        else:
+            self.chunks[key] = chunk
+            if len(self.chunks) > self.max_chunks:
+                self.chunks.popitem(last=False)
+                self.evictions += 1
+        return chunk
+
+    def _load(self, key, data):
+        if data is FREE:
+            return 1
+        if data is BLOCKED:
+            return 0
+        size = self.chunk_size
+        passable = bytearray(size * size)
+        costs = bytearray(b"\x01") * (size * size) if self.weighted else None
+        for r, row in enumerate(data[:size]):
+            row = row[:size]
+            passable[r * size:r * size + len(row)] = bytes(v != OBSTACLE for v in row)
+            if costs is not None:
+                costs[r * size:r * size + len(row)] = bytes(cell_cost(v) for v in row)
+        if costs is not None and costs.count(1) != len(costs):
+            return self._build(passable, costs)
+        # Only cells on the map count; a chunk on the map's edge is cut off
+        inside_rows = min(size, self.rows - key[0] * size)
+        inside_cols = min(size, self.cols - key[1] * size)
+        free = sum(passable[r * size:r * size + inside_cols].count(1) for r in range(inside_rows))
+        if free == inside_rows * inside_cols:
+            return 1
+        if free == 0:
+            return 0
+        return self._build(passable, None)
+
+    def _build(self, passable, costs):
+        """Chunk with the masks of its inner cells computed from `passable`."""
+        size, scratch = self.chunk_size, self._scratch
+        width = scratch.width
+        for r in range(size):
+            base = (r + 1) * width + 1
+            scratch.passable[base:base + size] = passable[r * size:(r + 1) * size]
+        scratch.rebuild_masks()
+        masks = bytearray(size * size)
+        for r in range(size):
+            base = (r + 1) * width + 1
+            masks[r * size:(r + 1) * size] = scratch.masks[base:base + size]
+        return Chunk(passable, masks, costs)
+
+    def _locate(self, cell):
+        """(chunk or flag, index in the chunk, inner cell?) for a cell id; the chunk is None off the map."""
+        row, col = divmod(cell, self.width)
+        row -= 1
+        col -= 1
+        if row < 0 or col < 0 or row >= self.rows or col >= self.cols:
+            return None, 0, False
+        size = self.chunk_size
+        chunk_row, r = divmod(row, size)
+        chunk_col, c = divmod(col, size)
+        key = (chunk_row, chunk_col)
+        if key == self._last_key:
+            chunk = self._last
+        else:
+            chunk = self.chunk(key)
+            self._last_key, self._last = key, chunk
+        # Inner cells have all 8 neighbors in this chunk and on the map
+        inner = 0 < r < size - 1 and 0 < c < size - 1 and row + 1 < self.rows and col + 1 < self.cols
+        return chunk, r * size + c, inner
+
+    def _editable(self, cell):
+        """Like _locate, but the chunk is materialized and pinned so it can be written."""
+        chunk, index, inner = self._locate(cell)
+        if chunk is None or type(chunk) is Chunk and self._last_key in self.edited:
+            return chunk, index, inner
+        key = self._last_key
+        if type(chunk) is int:
+            chunk = self._build(bytearray([chunk]) * (self.chunk_size * self.chunk_size), None)
+            del self.uniform[key]
+        else:
+            self.chunks.pop(key, None)
+        self.edited[key] = self._last = chunk
+        return chunk, index, inner
+
+    def _get_passable(self, cell):
+        chunk, index, _ = self._locate(cell)
+        if type(chunk) is Chunk:
+            return chunk.passable[index]
+        return chunk or 0
+
+    def _set_passable(self, cell, flag):
+        chunk, index, _ = self._editable(cell)
+        if chunk is not None:
+            chunk.passable[index] = flag
+
+    def _get_mask(self, cell):
+        chunk, index, inner = self._locate(cell)
+        if inner:
+            if type(chunk) is Chunk:
+                return chunk.masks[index]
+            return 0xFF if chunk else 0
+        # On a chunk edge: ask the neighbors, which may live in other chunks
+        passable, mask = self.passable, 0
+        for i, offset in enumerate(self.offsets8):
+            if passable[cell + offset]:
+                mask |= 1 << i
+        return mask
+
+    def _set_mask(self, cell, mask):
+        chunk, index, inner = self._locate(cell)
+        if inner:  # Edge masks are never stored
+            self._editable(cell)[0].masks[index] = mask
+
+    def _get_cost(self, cell):
+        chunk, index, _ = self._locate(cell)
+        if type(chunk) is Chunk and chunk.costs is not None:
+            return chunk.costs[index]
+        return 1
+
+    def _set_cost(self, cell, cost):
+        chunk, index, _ = self._editable(cell)
+        if chunk is None:
+            return
+        if chunk.costs is None:
+            chunk.costs = bytearray(b"\x01") * len(chunk.passable)
+        chunk.costs[index] = cost
+
+    def rebuild_masks(self):
+        """Masks are per chunk and kept up to date by set_passable(); nothing to rebuild."""
+
+    def new_array(self, fill, typecode="i"):
+        return SparseArray(fill)
+
+    def release(self, scratch):
+        """Drop it: sparse scratch grows with every search it serves, and a fresh one costs nothing."""
@@ -0,0 +1,175 @@
+from array import array
+from bisect import bisect_right
+
+
+def _sign(value):
+    return (value > 0) - (value < 0)
+
+
+def parent_chain(parents, start, goal):
+    """Cell ids from `goal` back to `start` along parent links."""
+    current = goal
+    while current != start:
+        yield current
+        current = parents[current]
+    yield start
+
+
+class CompactPath:
+    """A grid path stored as its turn points only.
+
+    Every segment between two stored points is a straight 4- or 8-direction
+    line, so a corridor of any length costs one point, and JPS jump points
+    are stored as they are. points holds row, col pairs and index the
+    position of each point along the path, both in int32 arrays. len(),
+    cost and the endpoints are O(1), path[i] is a bisect over the turn
+    points, and iterating yields (row, col) cells one by one, so a caller
+    can start walking before the rest is expanded. to_numpy() views the
+    turn points without copying.
+
+    cost is in the search's units: cell costs for Pathfinding, octile
+    10/14 units for JumpStart.
+    """
+
+    __slots__ = ("points", "index", "cost")
+
+    def __init__(self, points, index, cost):
+        self.points = points
+        self.index = index
+        self.cost = cost
+
+    @classmethod
+    def from_cells(cls, grid_map, cells, cost=None, reverse=False):
+        """Encode cell ids of a path; consecutive ids must share a row, column or diagonal.
+
+        reverse=True takes the ids from goal to start. Without `cost`, the
+        cells are taken as adjacent and their costs summed (the start is free).
+        """
+        width, costs = grid_map.width, grid_map.costs
+        rows, cols, index = [], [], []
+        row = col = direction = None
+        length = total = 0
+        first = cell = None
+        for cell in cells:
+            next_row, next_col = divmod(cell, width)
+            if row is None:
+                first = cell
+                rows.append(next_row - 1)
+                cols.append(next_col - 1)
+                index.append(0)
+            else:
+                dr, dc = next_row - row, next_col - col
+                step = (_sign(dr), _sign(dc))
+                if direction is not None and step != direction:
+                    rows.append(row - 1)  # The previous cell is a turn
+                    cols.append(col - 1)
+                    index.append(length)
+                direction = step
+                length += max(abs(dr), abs(dc))
+            if cost is None:
+                total += costs[cell]
+            row, col = next_row, next_col
+        if row is None:
+            raise ValueError("A path needs at least one cell")
+        if length:
+            rows.append(row - 1)
+            cols.append(col - 1)
+            index.append(length)
+        if cost is None:
+            cost = total - costs[cell if reverse else first]
+        if reverse:
+            rows.reverse()
+            cols.reverse()
+            index = [length - position for position in reversed(index)]
+        points = array("i", [0]) * (2 * len(rows))
+        points[0::2] = array("i", rows)
+        points[1::2] = array("i", cols)
+        return cls(points, array("i", index), cost)
+
+    @classmethod
+    def from_parents(cls, grid_map, parents, start, goal, cost=None):
+        """Encode the path a search left in its parent array (cell ids), without a list of cells."""
+        return cls.from_cells(grid_map, parent_chain(parents, start, goal), cost, reverse=True)
+
+    @classmethod
+    def from_positions(cls, grid_map, positions, cost=None):
+        """Encode a list of (row, col) cells."""
+        return cls.from_cells(grid_map, (grid_map.cell_id(pos) for pos in positions), cost)
+
+    def __len__(self):
+        return self.index[-1] + 1
+
+    @property
+    def start(self):
+        return (self.points[0], self.points[1])
+
+    @property
+    def goal(self):
+        return (self.points[-2], self.points[-1])
+
+    def waypoints(self):
+        """The stored turn points as (row, col) tuples."""
+        points = self.points
+        return list(zip(points[0::2], points[1::2]))
+
+    def __iter__(self):
+        points, index = self.points, self.index
+        row, col = points[0], points[1]
+        yield (row, col)
+        for k in range(1, len(index)):
+            next_row, next_col = points[2 * k], points[2 * k + 1]
+            dr, dc = _sign(next_row - row), _sign(next_col - col)
+            for _ in range(index[k] - index[k - 1]):
+                row += dr
+                col += dc
+                yield (row, col)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("path index out of range")
+        points, index = self.points, self.index
+        k = bisect_right(index, i) - 1
+        row, col = points[2 * k], points[2 * k + 1]
+        steps = i - index[k]
+        if steps:
+            row += steps * _sign(points[2 * k + 2] - row)
+            col += steps * _sign(points[2 * k + 3] - col)
+        return (row, col)
+
+    def __eq__(self, other):
+        if isinstance(other, CompactPath):
+            return self.points == other.points and self.index == other.index
+        if isinstance(other, (list, tuple)):
+            return len(other) == len(self) and all(a == tuple(b) for a, b in zip(self, other))
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"CompactPath(len={len(self)}, cost={self.cost}, turns={len(self.index)})"
+
+    @property
+    def nbytes(self):
+        return self.points.itemsize * len(self.points) + self.index.itemsize * len(self.index)
+
+    def to_numpy(self, expand=False):
+        """Turn points as an (n, 2) int32 view of the path's own buffer.
+
+        expand=True returns every cell as a new (len, 2) array instead,
+        built with NumPy rather than by iterating.
+        """
+        import numpy as np  # Only needed for the export
+        points = np.frombuffer(self.points, dtype=np.int32).reshape(-1, 2)
+        if not expand:
+            return points
+        index = np.frombuffer(self.index, dtype=np.int32)
+        steps = np.diff(index)
+        directions = np.sign(np.diff(points, axis=0))
+        cells = np.empty((len(self), 2), dtype=np.int32)
+        cells[0] = points[0]
+        cells[1:] = np.repeat(directions, steps, axis=0)
+        return np.cumsum(cells, axis=0, dtype=np.int32)
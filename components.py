@@ -0,0 +1,194 @@
+import weakref
+from collections import deque
+
+_indexes = weakref.WeakKeyDictionary()  # GridMap -> {diagonal: ComponentIndex}
+
+
+class ComponentIndex:
+    """Connected-component labels of a GridMap for O(1) reachability checks.
+
+    labels[cell] is 0 for obstacles and otherwise a component id; ids are
+    merged with union-find, so connected(a, b) is two finds. The index
+    follows the grid's change log: a freed cell unions the components around
+    it, and a new obstacle only runs a split check from its neighbors. Those
+    searches run in lockstep and stop as soon as they all meet, so only a
+    region that really got cut off is walked in full and relabelled.
+
+    diagonal=True uses 8-connectivity, which is how JumpStart moves.
+    """
+
+    def __init__(self, grid_map, diagonal=False):
+        self.map = grid_map
+        self.diagonal = diagonal
+        self.table = grid_map.table8 if diagonal else grid_map.table4
+        self.rebuild()
+
+    def rebuild(self):
+        """Label every component from scratch."""
+        grid = self.map
+        self.version = grid.version
+        self.labels = grid.new_array(0)
+        self.parent = [0]  # Union-find over component ids; 0 is "no component"
+        passable, labels = grid.passable, self.labels
+        for row in range(grid.rows):
+            base = grid.cell_id((row, 0))
+            for cell in range(base, base + grid.cols):
+                if passable[cell] and not labels[cell]:
+                    self._flood(cell, self._new_id())
+
+    def _new_id(self):
+        self.parent.append(len(self.parent))
+        return len(self.parent) - 1
+
+    def _flood(self, source, component):
+        labels, masks, table = self.labels, self.map.masks, self.table
+        labels[source] = component
+        queue = deque([source])
+        while queue:
+            current = queue.popleft()
+            for offset in table[masks[current]]:
+                neighbor = current + offset
+                if labels[neighbor] != component:
+                    labels[neighbor] = component
+                    queue.append(neighbor)
+
+    def find(self, component):
+        parent = self.parent
+        while parent[component] != component:
+            parent[component] = parent[parent[component]]  # Path halving
+            component = parent[component]
+        return component
+
+    def _union(self, a, b):
+        a, b = self.find(a), self.find(b)
+        if a != b:
+            self.parent[max(a, b)] = min(a, b)
+
+    def refresh(self):
+        """Bring the labels up to date with the grid's change log."""
+        grid = self.map
+        if self.version == grid.version:
+            return
+        changes = grid.changes_since(self.version)
+        self.version = grid.version
+        if changes is None:
+            self.rebuild()  # Change log no longer covers our version
+            return
+        passable, labels = grid.passable, self.labels
+        cells = dict.fromkeys(cell for cell, _ in changes)
+        blocked = [cell for cell in cells if not passable[cell] and labels[cell]]
+        if blocked:
+            self._block(blocked)
+        for cell in cells:
+            if passable[cell] and not labels[cell]:
+                self._free(cell)
+
+    def _free(self, cell):
+        labels = self.labels
+        labels[cell] = component = self._new_id()
+        # Neighbors freed in the same batch are still unlabelled and join when their turn comes
+        for offset in self.table[self.map.masks[cell]]:
+            if labels[cell + offset]:
+                self._union(component, labels[cell + offset])
+
+    def _block(self, cells):
+        """Clear newly blocked cells, then split-check each component they touched."""
+        labels, masks, table = self.labels, self.map.masks, self.table
+        for cell in cells:
+            labels[cell] = 0
+        # Every piece left of a component touches one of its blocked cells, so
+        # searching from all their open neighbors at once covers every piece
+        touched = {}
+        for cell in cells:
+            for offset in table[masks[cell]]:
+                neighbor = cell + offset
+                if labels[neighbor]:
+                    touched.setdefault(self.find(labels[neighbor]), {})[neighbor] = None
+        for starts in touched.values():
+            if len(starts) > 1:
+                self._split(list(starts))
+
+    def _split(self, starts):
+        """Relabel the regions around `starts` (one old component) that got cut off."""
+        labels, masks, table = self.labels, self.map.masks, self.table
+        # One search per neighbor; a search that bumps into another merges into it
+        owner = dict.fromkeys(starts)
+        for search, start in enumerate(starts):
+            owner[start] = search
+        group = list(range(len(starts)))
+        queues = {search: deque([start]) for search, start in enumerate(starts)}
+        visited = {search: [start] for search, start in enumerate(starts)}
+
+        def root(search):
+            while group[search] != search:
+                search = group[search]
+            return search
+
+        while len(queues) > 1:
+            for search in list(queues):
+                if search not in queues:
+                    continue  # Merged away earlier in this round
+                queue = queues[search]
+                if not queue:
+                    # Walked its whole region without meeting the others: cut off
+                    component = self._new_id()
+                    for member in visited.pop(search):
+                        labels[member] = component
+                    del queues[search]
+                    continue
+                current = queue.popleft()
+                for offset in table[masks[current]]:
+                    neighbor = current + offset
+                    if not labels[neighbor]:
+                        continue  # Not yet labelled (freed in this batch) or blocked
+                    other = owner.get(neighbor)
+                    if other is None:
+                        owner[neighbor] = search
+                        queue.append(neighbor)
+                        visited[search].append(neighbor)
+                        continue
+                    other = root(other)
+                    if other != search:
+                        group[other] = search
+                        queue.extend(queues.pop(other))
+                        visited[search].extend(visited.pop(other))
+        # The last region standing keeps the old id
+
+    def connected(self, a, b):
+        """True when (row, col) cells a and b are both open and in one component."""
+        self.refresh()
+        first, second = self.labels[self.map.cell_id(a)], self.labels[self.map.cell_id(b)]
+        return bool(first and second) and self.find(first) == self.find(second)
+
+    def unreachable(self, start, goal):
+        """Cell-id check used by the searches: True only when no path can exist.
+
+        A blocked start is left to the search (it may still step off it).
+        """
+        self.refresh()
+        if start == goal:
+            return False
+        labels = self.labels
+        if not labels[goal]:
+            return True
+        return bool(labels[start]) and self.find(labels[start]) != self.find(labels[goal])
+
+
+def index_for(grid_map, diagonal=False):
+    """Build (once) and register the ComponentIndex of `grid_map`.
+
+    Once registered, every Pathfinding (diagonal=False) or JumpStart
+    (diagonal=True) search on that map rejects unreachable queries up front.
+    """
+    indexes = _indexes.setdefault(grid_map, {})
+    if diagonal not in indexes:
+        indexes[diagonal] = ComponentIndex(grid_map, diagonal)
+    return indexes[diagonal]
+
+
+def unreachable(grid_map, start, goal, diagonal=False):
+    """True when a registered index proves cell `goal` cannot be reached from `start`."""
+    indexes = _indexes.get(grid_map)
+    if not indexes or diagonal not in indexes:
+        return False
+    return indexes[diagonal].unreachable(start, goal)
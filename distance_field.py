@@ -0,0 +1,198 @@
+import weakref
+from collections import OrderedDict
+
+import numpy as np
+
+from grid import UNSEEN
+
+NO_FLOW = 255  # Flow value for the goal and for cells that cannot reach it
+
+_caches = weakref.WeakKeyDictionary()
+
+
+class DistanceField:
+    """Whole-grid distances and next-step directions towards one goal.
+
+    The field is computed with a level-synchronous wavefront: every step
+    expands the whole frontier at once with NumPy fancy indexing instead of
+    popping cells one by one. flow[cell] is the index into grid.offsets4 of
+    the neighbor one step closer to the goal, so any start's path costs
+    O(path length). refresh() repairs the field from the grid's change log:
+    blocked cells drop the part of the flow tree hanging below them, freed
+    cells and the edge of that hole are re-seeded, and only those cells are
+    re-expanded. Distances are steps, so weighted GridMaps are rejected.
+    """
+
+    def __init__(self, grid_map, goal):
+        if grid_map.weighted:
+            raise ValueError("DistanceField counts steps; use d_star or a_star on weighted maps")
+        self.map = grid_map
+        self.goal = grid_map.cell_id(goal)
+        self.passable = np.frombuffer(grid_map.passable, dtype=np.uint8)  # Shares the grid's memory
+        self.offsets = np.array(grid_map.offsets4, dtype=np.intp)
+        ids = np.arange(grid_map.size).reshape(grid_map.rows + 2, grid_map.width)
+        self.cells = ids[1:-1, 1:-1].ravel()  # Every in-grid cell id
+        self.inside = np.zeros(grid_map.size, dtype=bool)
+        self.inside[self.cells] = True
+        self.rebuild()
+
+    def rebuild(self):
+        """Recompute the whole field from scratch."""
+        self.version = self.map.version
+        self.distances = np.full(self.map.size, UNSEEN, dtype=np.int32)
+        self.flow = np.full(self.map.size, NO_FLOW, dtype=np.uint8)
+        if self.passable[self.goal]:
+            self.distances[self.goal] = 0
+            self._relax(np.array([self.goal], dtype=np.intp))
+        self._update_flow(self.cells)
+
+    def _neighbors(self, cells):
+        """All in-grid neighbor ids of `cells`, as one flat array."""
+        neighbors = (cells[:, None] + self.offsets).ravel()
+        return neighbors[self.inside[neighbors]]
+
+    def _relax(self, seeds):
+        """Wavefront from seed cells (at their current distances); return the cells it lowered."""
+        distances, passable, offsets = self.distances, self.passable, self.offsets
+        seeds = np.unique(seeds)
+        levels = distances[seeds]
+        order = np.argsort(levels, kind="stable")
+        seeds, levels = seeds[order], levels[order]
+        updated = []
+        frontier = seeds[:0]
+        level, next_seed = int(levels[0]), 0
+        while True:
+            # Seeds join the wavefront when it reaches their distance
+            last = int(np.searchsorted(levels, level, side="right"))
+            if last > next_seed:
+                frontier = np.concatenate((frontier, seeds[next_seed:last]))
+                next_seed = last
+            if frontier.size == 0:
+                if next_seed >= len(seeds):
+                    break
+                level = int(levels[next_seed])
+                continue
+            candidates = (frontier[:, None] + offsets).ravel()
+            candidates = candidates[(passable[candidates] != 0) & (distances[candidates] > level + 1)]
+            if candidates.size:
+                candidates = np.unique(candidates)
+                distances[candidates] = level + 1
+                updated.append(candidates)
+            frontier = candidates
+            level += 1
+        return np.concatenate(updated) if updated else seeds[:0]
+
+    def _update_flow(self, cells):
+        """Point each of `cells` at its lowest-distance neighbor."""
+        cells = cells[self.inside[cells]]
+        neighbor_distances = self.distances[cells[:, None] + self.offsets]
+        best = neighbor_distances.argmin(axis=1)
+        best_distance = neighbor_distances[np.arange(cells.size), best]
+        own = self.distances[cells]
+        downhill = (best_distance < own) & (own < UNSEEN)
+        self.flow[cells] = np.where(downhill, best, NO_FLOW)
+
+    def _subtree(self, roots):
+        """Cells whose flow leads through any of `roots` (roots included)."""
+        marked = np.zeros(self.map.size, dtype=bool)
+        marked[roots] = True
+        found, frontier = [roots], roots
+        while frontier.size:
+            candidates = np.unique(self._neighbors(frontier))
+            candidates = candidates[~marked[candidates] & (self.flow[candidates] != NO_FLOW)]
+            targets = candidates + self.offsets[self.flow[candidates]]
+            frontier = candidates[marked[targets]]
+            marked[frontier] = True
+            found.append(frontier)
+        return np.concatenate(found)
+
+    def refresh(self):
+        """Bring the field up to date with the grid, repairing only what changed."""
+        grid = self.map
+        if self.version == grid.version:
+            return
+        changes = grid.changes_since(self.version)
+        if changes is None:
+            self.rebuild()  # Change log no longer covers our version
+            return
+        self.version = grid.version
+        passable, distances = self.passable, self.distances
+        changed = np.array(sorted({cell for cell, _ in changes}), dtype=np.intp)
+        blocked = changed[(passable[changed] == 0) & (distances[changed] < UNSEEN)]
+        stale = self._subtree(blocked) if blocked.size else changed[:0]
+        distances[stale] = UNSEEN
+        if passable[self.goal] and distances[self.goal] != 0:
+            distances[self.goal] = 0
+            stale = np.append(stale, self.goal)
+        # Re-seed from finite cells bordering the hole and the freed cells
+        touched = np.concatenate((stale, changed))
+        seeds = self._neighbors(touched)
+        seeds = seeds[(passable[seeds] != 0) & (distances[seeds] < UNSEEN)]
+        if passable[self.goal]:
+            seeds = np.append(seeds, self.goal)
+        updated = self._relax(seeds) if seeds.size else seeds
+        touched = np.unique(np.concatenate((touched, updated)))
+        self._update_flow(np.unique(np.concatenate((touched, self._neighbors(touched)))))
+
+    def distance(self, pos):
+        """Steps from `pos` to the goal, or None when it cannot be reached."""
+        self.refresh()
+        value = int(self.distances[self.map.cell_id(pos)])
+        return None if value >= UNSEEN else value
+
+    def next_step(self, pos):
+        """The neighbor of `pos` one step closer to the goal, or None."""
+        self.refresh()
+        direction = self.flow[self.map.cell_id(pos)]
+        if direction == NO_FLOW:
+            return None
+        return self.map.position(self.map.cell_id(pos) + self.map.offsets4[direction])
+
+    def path(self, start):
+        """Follow the flow from `start` to the goal; None when unreachable."""
+        self.refresh()
+        grid = self.map
+        cell = grid.cell_id(start)
+        if self.distances[cell] >= UNSEEN:
+            return None
+        flow, offsets = memoryview(self.flow), grid.offsets4  # Plain ints, no NumPy scalars
+        path = [grid.position(cell)]
+        while cell != self.goal:
+            cell += offsets[flow[cell]]
+            path.append(grid.position(cell))
+        return path
+
+
+class DistanceFieldCache:
+    """LRU of DistanceFields per goal over one GridMap."""
+
+    def __init__(self, grid_map, max_fields=8):
+        self.map = grid_map
+        self.max_fields = max_fields
+        self.fields = OrderedDict()
+        self.hits = self.misses = 0
+
+    def field(self, goal):
+        goal = tuple(goal)
+        field = self.fields.get(goal)
+        if field is None:
+            self.misses += 1
+            field = self.fields[goal] = DistanceField(self.map, goal)
+            if len(self.fields) > self.max_fields:
+                self.fields.popitem(last=False)
+        else:
+            self.hits += 1
+            self.fields.move_to_end(goal)
+            field.refresh()
+        return field
+
+    def path(self, start, goal):
+        return self.field(goal).path(start)
+
+
+def cache_for(grid_map):
+    """The DistanceFieldCache shared by everything searching `grid_map`."""
+    cache = _caches.get(grid_map)
+    if cache is None:
+        cache = _caches[grid_map] = DistanceFieldCache(grid_map)
+    return cache
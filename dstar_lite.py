@@ -0,0 +1,172 @@
+import heapq
+
+from grid import UNSEEN
+
+class DStarLite:
+    """Incremental backward planner (Koenig & Likhachev's D* Lite).
+
+    g and rhs are flat arrays over GridMap cell ids and survive between
+    calls to plan(). After update_cells() or move_start(), plan() only
+    re-expands the cells whose distance to the goal actually changed.
+    Edits made to the GridMap by anyone else are picked up from its change
+    log at the next plan(); a trimmed log means planning from scratch.
+    Open-list entries are (k1, k2, cell) and are deleted lazily: an entry
+    is dropped when its cell is already consistent or its key is out of date.
+    """
+
+    def __init__(self, grid_map, start, goal, heuristic=None):
+        self.map = grid_map
+        # Optional heuristic(a, b) on cell ids, e.g. LandmarkHeuristic.estimate; Manhattan otherwise
+        self.heuristic = heuristic
+        if heuristic is not None:
+            self._heuristic = heuristic
+        self.start = grid_map.cell_id(start)
+        self.goal = grid_map.cell_id(goal)
+        self.reset()
+        self.node_expanded = 0  # Total over the planner's lifetime
+        self.pushes = self.stale_pops = 0  # Lifetime totals too
+        self.peak_open = 0  # Largest open list during the last compute_shortest_path()
+        self.on_expand = self.on_push = None  # Optional hooks, see search_stats.SearchHooks
+
+    def reset(self):
+        """Forget every g-value and plan the next time from scratch."""
+        grid_map = self.map
+        self.version = grid_map.version  # Grid version the g and rhs values describe
+        self.last = self.start  # Start used when the current keys were computed
+        self.km = 0
+        self.g = grid_map.new_array(UNSEEN)
+        self.rhs = grid_map.new_array(UNSEEN)
+        self.rhs[self.goal] = 0
+        self.open = [self._key(self.goal) + (self.goal,)]
+
+    def refresh(self):
+        """Queue the cells around every grid change made since the last plan."""
+        grid = self.map
+        if self.version == grid.version:
+            return
+        changes = grid.changes_since(self.version)
+        if changes is None:
+            self.reset()  # Change log no longer covers our version
+            return
+        self.version = grid.version
+        offsets = grid.offsets4
+        for cell in dict.fromkeys(cell for cell, _ in changes):
+            self._update_vertex(cell)
+            for offset in offsets:
+                self._update_vertex(cell + offset)
+
+    def _heuristic(self, a, b):
+        ar, ac = divmod(a, self.map.width)
+        br, bc = divmod(b, self.map.width)
+        return abs(ar - br) + abs(ac - bc)
+
+    def _key(self, cell):
+        best = min(self.g[cell], self.rhs[cell])
+        return (best + self._heuristic(self.start, cell) + self.km, best)
+
+    def _update_vertex(self, cell):
+        """Recompute rhs from the successors and queue the cell if inconsistent."""
+        grid = self.map
+        if cell != self.goal:
+            best = UNSEEN
+            if grid.passable[cell]:
+                g, costs = self.g, grid.costs
+                for offset in grid.table4[grid.masks[cell]]:
+                    successor = cell + offset
+                    cost = g[successor] + costs[successor]
+                    if cost < best:
+                        best = cost
+            self.rhs[cell] = best
+        if self.g[cell] != self.rhs[cell]:
+            key = self._key(cell)
+            heapq.heappush(self.open, key + (cell,))
+            self.pushes += 1
+            if self.on_push is not None:
+                self.on_push(self.map.position(cell), key)
+
+    def compute_shortest_path(self):
+        """Expand inconsistent cells until the start is settled; return the count."""
+        self.refresh()
+        g, rhs, open_list = self.g, self.rhs, self.open
+        grid = self.map
+        masks, table = grid.masks, grid.table4
+        start = self.start
+        on_expand = self.on_expand
+        node_expanded = stale_pops = 0
+        peak_open = len(open_list)
+        while open_list:
+            k1, k2, cell = open_list[0]
+            if g[cell] == rhs[cell]:
+                heapq.heappop(open_list)  # Already consistent
+                stale_pops += 1
+                continue
+            key = self._key(cell)
+            if (k1, k2) > key:
+                heapq.heappop(open_list)  # A fresher entry was already handled
+                stale_pops += 1
+                continue
+            if (k1, k2) < key:
+                heapq.heapreplace(open_list, key + (cell,))  # km moved on since
+                continue
+            if key >= self._key(start) and rhs[start] == g[start]:
+                break
+            heapq.heappop(open_list)
+            node_expanded += 1
+            if on_expand is not None:
+                on_expand(grid.position(cell))
+            if g[cell] > rhs[cell]:
+                g[cell] = rhs[cell]
+            else:
+                g[cell] = UNSEEN
+                self._update_vertex(cell)
+            for offset in table[masks[cell]]:
+                self._update_vertex(cell + offset)
+            if len(open_list) > peak_open:
+                peak_open = len(open_list)
+        self.node_expanded += node_expanded
+        self.stale_pops += stale_pops
+        self.peak_open = peak_open
+        return node_expanded
+
+    def update_cells(self, changes):
+        """Apply (row, col, value) changes to the grid and queue the affected cells.
+
+        On weighted maps a value change is also a cost change for every edge
+        into the cell, so its neighbors are re-queued the same way.
+        """
+        self.map.update_cells(changes)
+        self.refresh()
+
+    def move_start(self, start):
+        """Move the agent; keys already queued stay valid thanks to km."""
+        cell = self.map.cell_id(start)
+        self.km += self._heuristic(self.last, cell)
+        self.last = self.start = cell
+
+    def plan(self):
+        """Repair the search and return (path, nodes expanded by this call)."""
+        node_expanded = self.compute_shortest_path()
+        if self.g[self.start] >= UNSEEN:
+            return None, node_expanded  # No path found
+        return self.extract_path(), node_expanded
+
+    def extract_path(self):
+        """Follow the cheapest successor from the start down to the goal.
+
+        Returns None if the g-values do not lead there (they are stale after
+        an edit no compute_shortest_path() has seen): every step must lower
+        g, so the walk can never cycle.
+        """
+        grid, g = self.map, self.g
+        current = self.start
+        path = [grid.position(current)]
+        while current != self.goal:
+            successors = [current + offset for offset in grid.table4[grid.masks[current]]]
+            if not successors:
+                return None
+            following = min(successors, key=lambda successor: g[successor] + grid.costs[successor])
+            if g[following] >= g[current]:
+                return None
+            current = following
+            path.append(grid.position(current))
+        return path
@@ -0,0 +1,150 @@
+import math
+from bisect import bisect_left, bisect_right
+from collections import namedtuple
+
+from jumpstart import DIAGONAL_COST, STRAIGHT_COST
+
+GoalResult = namedtuple("GoalResult", ["goal", "cost", "path"])
+
+METRICS = ("manhattan", "octile")
+SMALL = 8  # Up to this many goals a plain loop beats the bucket walk
+
+
+class GoalIndex:
+    """Lower bound on the cost to the cheapest of many goals, without looping over them.
+
+    estimate(cell) is min over goals of distance(cell, goal) + weight(goal),
+    with Manhattan distance for 4-connected searches or octile (10/14) for
+    JumpStart; weights are extra costs in the same units, e.g. to make
+    some targets less attractive. Being a minimum of consistent
+    heuristics it is consistent itself, so a search using it pops goals
+    in order of cost.
+
+    Goals are bucketed into a coarse grid of square buckets (about one goal
+    per bucket by default) and a query walks rings of buckets outwards from
+    the cell, skipping buckets whose distance plus their lightest weight
+    cannot beat the best so far and stopping once a whole ring cannot.
+    The searches test for goals with `cell in index.weights`, and
+    goal_on_ray() finds the first goal along a row, column or diagonal,
+    which lets JPS+ jumps stop on goals without walking their cells.
+    """
+
+    def __init__(self, grid_map, goals, weights=None, metric="manhattan", bucket_size=None):
+        if metric not in METRICS:
+            raise ValueError(f"Unknown metric {metric!r}; expected one of {METRICS}")
+        if weights is not None and len(weights) != len(goals):
+            raise ValueError("weights must give one value per goal")
+        self.map = grid_map
+        self.octile = metric == "octile"
+        self.weights = {}  # Goal cell id -> weight; the lightest wins for repeated goals
+        for i, goal in enumerate(goals):
+            cell = grid_map.cell_id(goal)
+            weight = weights[i] if weights is not None else 0
+            if weight < 0:
+                raise ValueError("Goal weights must be non-negative")
+            if cell not in self.weights or weight < self.weights[cell]:
+                self.weights[cell] = weight
+        self.min_weight = min(self.weights.values(), default=0)
+        width = grid_map.width
+        self.goals = [divmod(cell, width) + (weight,) for cell, weight in self.weights.items()]
+        self.lines = {}  # (line kind, line) -> sorted positions of its goals, see _line()
+        for row, col, _ in self.goals:
+            for dx, dy in ((0, 1), (1, 0), (1, 1), (1, -1)):
+                key, position = self._line(row, col, dx, dy)
+                self.lines.setdefault(key, []).append(position)
+        for positions in self.lines.values():
+            positions.sort()
+        if bucket_size is None:
+            bucket_size = max(4, math.isqrt(grid_map.rows * grid_map.cols // max(len(self.goals), 1)))
+        self.bucket_size = bucket_size
+        self.buckets = {}  # (bucket row, bucket col) -> [(row, col, weight), ...]
+        for goal in self.goals:
+            self.buckets.setdefault((goal[0] // bucket_size, goal[1] // bucket_size), []).append(goal)
+        self.lightest = {key: min(goal[2] for goal in bucket) for key, bucket in self.buckets.items()}
+        rows = [key[0] for key in self.buckets] or [0]
+        cols = [key[1] for key in self.buckets] or [0]
+        self.extent = (min(rows), max(rows), min(cols), max(cols))
+
+    def __len__(self):
+        return len(self.goals)
+
+    @staticmethod
+    def _line(row, col, dx, dy):
+        """((kind, line), position along it) of the line through (row, col) in direction (dx, dy)."""
+        if dx == 0:
+            return (0, row), col
+        if dy == 0:
+            return (1, col), row
+        if dx == dy:
+            return (2, row - col), row
+        return (3, row + col), row
+
+    def goal_on_ray(self, cell, dx, dy, steps):
+        """The first goal cell id within `steps` moves from `cell` in direction (dx, dy), else -1."""
+        width = self.map.width
+        row, col = divmod(cell, width)
+        key, position = self._line(row, col, dx, dy)
+        positions = self.lines.get(key)
+        if positions is None:
+            return -1
+        if (dy if dx == 0 else dx) > 0:
+            i = bisect_right(positions, position)
+            k = positions[i] - position if i < len(positions) else steps + 1
+        else:
+            i = bisect_left(positions, position) - 1
+            k = position - positions[i] if i >= 0 else steps + 1
+        return cell + k * (dx * width + dy) if k <= steps else -1
+
+    def _distance(self, dr, dc):
+        if self.octile:
+            return STRAIGHT_COST * (dr + dc) + (DIAGONAL_COST - 2 * STRAIGHT_COST) * (dr if dr < dc else dc)
+        return dr + dc
+
+    def estimate(self, cell):
+        """min over goals of distance(cell, goal) + weight(goal); 0 with no goals."""
+        row, col = divmod(cell, self.map.width)
+        distance = self._distance
+        if len(self.goals) <= SMALL:
+            best = None
+            if self.octile:
+                for r, c, w in self.goals:
+                    value = distance(abs(row - r), abs(col - c)) + w
+                    if best is None or value < best:
+                        best = value
+            else:
+                for r, c, w in self.goals:
+                    value = abs(row - r) + abs(col - c) + w  # Manhattan, inlined for the common case
+                    if best is None or value < best:
+                        best = value
+            return 0 if best is None else best
+        size, buckets, lightest = self.bucket_size, self.buckets, self.lightest
+        top, bottom, left, right = self.extent
+        bucket_row, bucket_col = row // size, col // size
+        best = None
+        ring = 0
+        while True:
+            if best is not None and ring:
+                # Every bucket on this ring is at least (ring - 1) * size + 1 rows or columns away
+                if distance((ring - 1) * size + 1, 0) + self.min_weight >= best:
+                    return best
+            if bucket_row - ring < top and bucket_row + ring > bottom and bucket_col - ring < left \
+                    and bucket_col + ring > right:
+                return best  # The ring has moved past every bucket
+            for br in range(bucket_row - ring, bucket_row + ring + 1):
+                edge = br == bucket_row - ring or br == bucket_row + ring
+                for bc in (range(bucket_col - ring, bucket_col + ring + 1) if edge
+                           else (bucket_col - ring, bucket_col + ring) if ring else (bucket_col,)):
+                    bucket = buckets.get((br, bc))
+                    if bucket is None:
+                        continue
+                    if best is not None:
+                        # Distance to the bucket's square, plus its lightest goal
+                        dr = max(br * size - row, row - (br * size + size - 1), 0)
+                        dc = max(bc * size - col, col - (bc * size + size - 1), 0)
+                        if distance(dr, dc) + lightest[(br, bc)] >= best:
+                            continue
+                    for r, c, w in bucket:
+                        value = distance(abs(row - r), abs(col - c)) + w
+                        if best is None or value < best:
+                            best = value
+            ring += 1
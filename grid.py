@@ -0,0 +1,212 @@
+from array import array
+from collections import deque
+
+OBSTACLE = -1
+UNSEEN = 2 ** 31 - 1  # Sentinel for flat distance arrays
+STAMP_LIMIT = 2 ** 32 - 2 ** 20  # Restart generations below this, leaving marks to spare
+
+# Row/column steps; the first four are the 4-connected moves
+DIRECTIONS_4 = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+DIRECTIONS_8 = DIRECTIONS_4 + [(-1, -1), (-1, 1), (1, -1), (1, 1)]
+OPPOSITE = [DIRECTIONS_8.index((-dr, -dc)) for dr, dc in DIRECTIONS_8]
+
+
+def cell_cost(value):
+    """Traversal cost of a weighted cell: its grid value clamped to 1..255."""
+    return min(max(value, 1), 255)
+
+
+class GridMap:
+    """Flat, border-padded grid with integer cell ids and neighbor tables.
+
+    Cells are stored row-major in a bytearray one cell wider on every side,
+    so the id of (row, col) is (row + 1) * width + (col + 1) and a neighbor
+    is always id + offset. The padding is never passable, which removes the
+    bounds checks from the inner loops. Each cell also keeps a bitmask of its
+    passable neighbors (bit i is DIRECTIONS_8[i]); table4/table8 map a mask
+    to the tuple of offsets to visit, so expanding a node allocates nothing.
+
+    costs[cell] is the price of stepping onto a cell. It is 1 everywhere
+    unless the map is weighted, in which case it is read from the grid value
+    (see cell_cost), so 0/1 cells cost 1 and e.g. a 5 is five times as slow.
+    """
+
+    CHANGE_LOG_LIMIT = 4096
+
+    def __init__(self, rows, cols, passable=None, masks=None, costs=None, weighted=False):
+        self.rows = rows
+        self.cols = cols
+        self.width = cols + 2
+        self.size = (rows + 2) * self.width
+        # Existing buffers (e.g. shared memory) are wrapped without copying
+        self.passable = bytearray(self.size) if passable is None else passable
+        self.masks = bytearray(self.size) if masks is None else masks
+        self.costs = bytearray(b"\x01") * self.size if costs is None else costs
+        self.weighted = weighted
+        self.offsets4 = tuple(dr * self.width + dc for dr, dc in DIRECTIONS_4)
+        self.offsets8 = tuple(dr * self.width + dc for dr, dc in DIRECTIONS_8)
+        self.table4 = tuple(
+            tuple(off for i, off in enumerate(self.offsets4) if mask >> i & 1)
+            for mask in range(256)
+        )
+        self.table8 = tuple(
+            tuple(off for i, off in enumerate(self.offsets8) if mask >> i & 1)
+            for mask in range(256)
+        )
+        # Bumped on every passability or cost change; the log lets caches see what changed
+        self.version = 0
+        self.change_log = deque(maxlen=self.CHANGE_LOG_LIMIT)
+        self._scratch_pool = []  # SearchScratch sets handed back by finished searches
+
+    @classmethod
+    def from_lists(cls, grid, weighted=False):
+        """Build a GridMap from a list-of-lists where -1 marks an obstacle."""
+        grid_map = cls(len(grid), len(grid[0]), weighted=weighted)
+        width = grid_map.width
+        for r, row in enumerate(grid):
+            base = (r + 1) * width + 1
+            grid_map.passable[base:base + grid_map.cols] = bytes(v != OBSTACLE for v in row)
+            if weighted:
+                grid_map.costs[base:base + grid_map.cols] = bytes(cell_cost(v) for v in row)
+        grid_map.rebuild_masks()
+        return grid_map
+
+    def rebuild_masks(self):
+        """Recompute every neighbor mask from the passable array."""
+        # Each byte of `cells` is 0 or 1, so shifting the whole integer by
+        # 8 * offset bits lines every cell up with its neighbor, and shifting
+        # by i more bits moves that 0/1 into bit i without carrying over.
+        size_bits = 8 * self.size
+        cells = int.from_bytes(self.passable, "little")
+        total = 0
+        for i, off in enumerate(self.offsets8):
+            shifted = cells >> (8 * off) if off > 0 else cells << (-8 * off)
+            total |= shifted << i
+        total &= (1 << size_bits) - 1
+        self.masks[:] = total.to_bytes(self.size, "little")
+
+    def cell_id(self, pos):
+        """Convert a (row, col) tuple into a cell id."""
+        return (pos[0] + 1) * self.width + pos[1] + 1
+
+    def position(self, cell):
+        """Convert a cell id back into a (row, col) tuple."""
+        r, c = divmod(cell, self.width)
+        return (r - 1, c - 1)
+
+    def in_bounds(self, pos):
+        return 0 <= pos[0] < self.rows and 0 <= pos[1] < self.cols
+
+    def is_passable(self, pos):
+        """Check if a (row, col) tuple is inside the grid and not an obstacle."""
+        return self.in_bounds(pos) and self.passable[self.cell_id(pos)] == 1
+
+    def set_passable(self, pos, passable):
+        """Open or block one cell and patch the masks of its neighbors."""
+        cell = self.cell_id(pos)
+        flag = 1 if passable else 0
+        if self.passable[cell] == flag:
+            return
+        self.passable[cell] = flag
+        self.version += 1
+        self.change_log.append((self.version, cell, flag))
+        for i, off in enumerate(self.offsets8):
+            bit = 1 << OPPOSITE[i]
+            if flag:
+                self.masks[cell + off] |= bit
+            else:
+                self.masks[cell + off] &= ~bit & 0xFF
+
+    def set_cost(self, pos, cost):
+        """Change the traversal cost of one cell."""
+        cell = self.cell_id(pos)
+        if self.costs[cell] == cost:
+            return
+        self.costs[cell] = cost
+        self.version += 1
+        self.change_log.append((self.version, cell, self.passable[cell]))
+
+    def update_cells(self, changes):
+        """Apply (row, col, value) changes; return ids whose passability or cost changed."""
+        changed = []
+        for row, col, value in changes:
+            cell = self.cell_id((row, col))
+            passable = value != OBSTACLE
+            flipped = self.passable[cell] != passable
+            if flipped:
+                self.set_passable((row, col), passable)
+            if self.weighted and passable and self.costs[cell] != cell_cost(value):
+                self.set_cost((row, col), cell_cost(value))
+                flipped = True
+            if flipped:
+                changed.append(cell)
+        return changed
+
+    def changes_since(self, version):
+        """Return [(cell, passable), ...] changed after `version`, or None if the log was trimmed."""
+        if version == self.version:
+            return []
+        if not self.change_log or self.change_log[0][0] > version + 1:
+            return None
+        return [(cell, flag) for changed, cell, flag in self.change_log if changed > version]
+
+    def neighbors(self, cell, diagonal=False):
+        """Return the passable neighbor ids of a cell."""
+        table = self.table8 if diagonal else self.table4
+        return [cell + off for off in table[self.masks[cell]]]
+
+    def new_array(self, fill, typecode="i"):
+        """Allocate a flat per-cell array filled with `fill`."""
+        return array(typecode, [fill]) * self.size
+
+    def scratch(self):
+        """Borrow a SearchScratch, already begun; hand it back with release() when done."""
+        try:
+            scratch = self._scratch_pool.pop()  # Atomic, so threads never share one
+        except IndexError:
+            scratch = SearchScratch(self)
+        scratch.begin()
+        return scratch
+
+    def release(self, scratch):
+        self._scratch_pool.append(scratch)
+
+
+class SearchScratch:
+    """Per-cell search arrays a GridMap lends to one search at a time.
+
+    Allocating and filling three whole-grid arrays per search costs more
+    than a short search itself on a big map, so the arrays are kept and
+    never cleared. Instead begin() starts a new generation, and a cell
+    belongs to the current search only while stamp[cell] >= base, i.e.
+    it was stamped with base or a later mark() of this search; anywhere
+    else distances and parents hold leftovers and read as unseen.
+    """
+
+    def __init__(self, grid_map):
+        self.stamp = grid_map.new_array(0, "I")
+        self.distances = grid_map.new_array(UNSEEN)
+        self.parents = grid_map.new_array(-1)
+        self.generation = 0
+        self.base = 0
+
+    def begin(self):
+        """Start a search: returns its base stamp, larger than any earlier one."""
+        if self.generation >= STAMP_LIMIT:
+            self.stamp[:] = array(self.stamp.typecode, [0]) * len(self.stamp)  # Once per ~4 billion searches
+            self.generation = 0
+        self.generation += 1
+        self.base = self.generation
+        return self.base
+
+    def mark(self):
+        """Another stamp for this search (e.g. "closed"), larger than the base and earlier marks."""
+        self.generation += 1
+        return self.generation
+
+
+def as_grid_map(grid, weighted=False):
+    """Return `grid` as a GridMap, converting list-of-lists grids."""
+    if isinstance(grid, GridMap):
+        return grid
+    return GridMap.from_lists(grid, weighted)
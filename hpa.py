@@ -0,0 +1,286 @@
+import heapq
+from collections import deque
+
+from grid import as_grid_map
+
+ENTRANCE_SPLIT = 6  # Border runs at least this long get an entrance at each end
+
+
+class HierarchicalMap:
+    """HPA*: cluster abstraction over a GridMap for fast queries on large maps.
+
+    The grid is cut into cluster_size x cluster_size clusters. Passable runs
+    along each shared border become entrances (pairs of cells facing each
+    other), and the exact in-cluster distances between a cluster's entrance
+    cells form the abstract graph. A query links start and goal into their
+    clusters, runs A* on the abstract graph and refines each abstract edge
+    into cells only when the path is iterated.
+
+    With optimal=False a border run gets one or two entrances, which keeps
+    the abstract graph small but can bend the path. optimal=True makes every
+    border crossing an entrance; the abstract distances are then exact and
+    the returned paths are shortest paths, at the price of a larger graph.
+
+    On weighted maps every step costs the cell it enters, inside clusters
+    (Dijkstra instead of BFS) and across borders alike.
+    """
+
+    def __init__(self, grid, cluster_size=16, optimal=False, weighted=False):
+        self.map = as_grid_map(grid, weighted)
+        self.cluster_size = cluster_size
+        self.optimal = optimal
+        self.cluster_rows = -(-self.map.rows // cluster_size)
+        self.cluster_cols = -(-self.map.cols // cluster_size)
+        self.cluster_of = self.map.new_array(-1)
+        for row in range(self.map.rows):
+            base = self.map.cell_id((row, 0))
+            cluster_row = row // cluster_size * self.cluster_cols
+            for col in range(self.map.cols):
+                self.cluster_of[base + col] = cluster_row + col // cluster_size
+        self.borders = {}  # (cluster, cluster right/below) -> [(cell, facing cell), ...]
+        self.inter = {}  # Entrance cell -> facing cells in neighbouring clusters
+        self.intra = {}  # Cluster -> {entrance cell: {entrance cell: distance}}
+        self.segments = {}  # Cluster -> {(from, to): refined cell path}
+        for border in self._all_borders():
+            self._build_border(border)
+        for cluster in range(self.cluster_rows * self.cluster_cols):
+            self._build_cluster(cluster)
+
+    def _all_borders(self):
+        for cluster_row in range(self.cluster_rows):
+            for cluster_col in range(self.cluster_cols):
+                cluster = cluster_row * self.cluster_cols + cluster_col
+                if cluster_col + 1 < self.cluster_cols:
+                    yield (cluster, cluster + 1)
+                if cluster_row + 1 < self.cluster_rows:
+                    yield (cluster, cluster + self.cluster_cols)
+
+    def _border_cells(self, border):
+        """Yield (cell, facing cell) pairs along a border, in order."""
+        size, grid = self.cluster_size, self.map
+        first, second = border
+        cluster_row, cluster_col = divmod(first, self.cluster_cols)
+        if second // self.cluster_cols == cluster_row:  # Vertical border, second cluster to the right
+            col = (cluster_col + 1) * size - 1
+            for row in range(cluster_row * size, min((cluster_row + 1) * size, grid.rows)):
+                cell = grid.cell_id((row, col))
+                yield cell, cell + 1
+        else:  # Horizontal border, second cluster below
+            row = (cluster_row + 1) * size - 1
+            for col in range(cluster_col * size, min((cluster_col + 1) * size, grid.cols)):
+                cell = grid.cell_id((row, col))
+                yield cell, cell + grid.width
+
+    def _build_border(self, border):
+        for a, b in self.borders.pop(border, ()):
+            self.inter[a].remove(b)
+            self.inter[b].remove(a)
+        passable = self.map.passable
+        entrances, run = [], []
+        for a, b in list(self._border_cells(border)) + [(None, None)]:
+            if a is not None and passable[a] and passable[b]:
+                run.append((a, b))
+                continue
+            if run:
+                if self.optimal:
+                    entrances.extend(run)
+                elif len(run) < ENTRANCE_SPLIT:
+                    entrances.append(run[len(run) // 2])
+                else:
+                    entrances.extend((run[0], run[-1]))
+            run = []
+        self.borders[border] = entrances
+        for a, b in entrances:
+            self.inter.setdefault(a, []).append(b)
+            self.inter.setdefault(b, []).append(a)
+
+    def _build_cluster(self, cluster):
+        """Recompute in-cluster distances between the cluster's entrance cells."""
+        nodes = self._cluster_nodes(cluster)
+        edges = {}
+        for node in nodes:
+            distances, _ = self._cluster_search(node, cluster)
+            edges[node] = {other: distances[other] for other in nodes if other != node and other in distances}
+        self.intra[cluster] = edges
+        self.segments.pop(cluster, None)
+
+    def _cluster_nodes(self, cluster):
+        cluster_row, cluster_col = divmod(cluster, self.cluster_cols)
+        nodes = set()
+        neighbours = []
+        if cluster_col > 0:
+            neighbours.append((cluster - 1, cluster))
+        if cluster_row > 0:
+            neighbours.append((cluster - self.cluster_cols, cluster))
+        if cluster_col + 1 < self.cluster_cols:
+            neighbours.append((cluster, cluster + 1))
+        if cluster_row + 1 < self.cluster_rows:
+            neighbours.append((cluster, cluster + self.cluster_cols))
+        for border in neighbours:
+            for a, b in self.borders.get(border, ()):
+                nodes.add(a if self.cluster_of[a] == cluster else b)
+        return nodes
+
+    def _cluster_search(self, source, cluster, target=None):
+        """BFS (Dijkstra on weighted maps) confined to one cluster; returns (distances, parents)."""
+        grid, cluster_of = self.map, self.cluster_of
+        masks, table = grid.masks, grid.table4
+        if grid.weighted:
+            return self._cluster_dijkstra(source, cluster, target)
+        distances, parents = {source: 0}, {source: None}
+        queue = deque([source])
+        while queue:
+            current = queue.popleft()
+            if current == target:
+                break
+            cost = distances[current] + 1
+            for offset in table[masks[current]]:
+                neighbor = current + offset
+                if neighbor not in distances and cluster_of[neighbor] == cluster:
+                    distances[neighbor] = cost
+                    parents[neighbor] = current
+                    queue.append(neighbor)
+        return distances, parents
+
+    def _cluster_dijkstra(self, source, cluster, target=None):
+        grid, cluster_of = self.map, self.cluster_of
+        masks, table, costs = grid.masks, grid.table4, grid.costs
+        distances, parents = {source: 0}, {source: None}
+        closed = set()
+        queue = [(0, source)]
+        while queue:
+            distance, current = heapq.heappop(queue)
+            if current in closed:
+                continue
+            if current == target:
+                break
+            closed.add(current)
+            for offset in table[masks[current]]:
+                neighbor = current + offset
+                cost = distance + costs[neighbor]
+                if cluster_of[neighbor] == cluster and cost < distances.get(neighbor, cost + 1):
+                    distances[neighbor] = cost
+                    parents[neighbor] = current
+                    heapq.heappush(queue, (cost, neighbor))
+        return distances, parents
+
+    def update_cells(self, changes):
+        """Apply (row, col, value) changes and rebuild only the clusters they touch."""
+        size = self.cluster_size
+        borders, clusters = set(), set()
+        for cell in self.map.update_cells(changes):
+            row, col = self.map.position(cell)
+            cluster = self.cluster_of[cell]
+            clusters.add(cluster)
+            if row % size == 0 and row > 0:
+                borders.add((cluster - self.cluster_cols, cluster))
+            if row % size == size - 1 and row + 1 < self.map.rows:
+                borders.add((cluster, cluster + self.cluster_cols))
+            if col % size == 0 and col > 0:
+                borders.add((cluster - 1, cluster))
+            if col % size == size - 1 and col + 1 < self.map.cols:
+                borders.add((cluster, cluster + 1))
+        for border in borders:
+            self._build_border(border)
+            clusters.update(border)
+        for cluster in clusters:
+            self._build_cluster(cluster)
+        return clusters
+
+    def abstract_path(self, start, goal):
+        """A* over the abstract graph; returns (waypoint cell ids or None, node_expanded)."""
+        grid = self.map
+        start, goal = grid.cell_id(start), grid.cell_id(goal)
+        if not grid.passable[goal]:
+            return None, 0  # Its cluster search would leave the wall, but no path can end on it
+        width, costs = grid.width, grid.costs
+        goal_row, goal_col = divmod(goal, width)
+        start_cluster, goal_cluster = self.cluster_of[start], self.cluster_of[goal]
+
+        # Temporarily link start and goal to the entrances of their clusters
+        start_distances, _ = self._cluster_search(start, start_cluster)
+        goal_distances, _ = self._cluster_search(goal, goal_cluster)
+        node_expanded = len(start_distances) + len(goal_distances)
+        start_links = {node: start_distances[node] for node in self.intra[start_cluster] if node in start_distances}
+        # Searched from the goal, so reverse them: a step costs the cell it enters
+        goal_links = {node: goal_distances[node] - costs[node] + costs[goal]
+                      for node in self.intra[goal_cluster] if node in goal_distances}
+        if start_cluster == goal_cluster and goal in start_distances:
+            start_links[goal] = start_distances[goal]
+        temporary = {start: start_links}  # Query-only edges, by source cell
+        if not grid.passable[start]:
+            # Searches may step off a blocked start, which is never an entrance, so
+            # link it straight to its open neighbors across the cluster border too
+            for offset in grid.table4[grid.masks[start]]:
+                neighbor = start + offset
+                cluster = self.cluster_of[neighbor]
+                if cluster == start_cluster:
+                    continue
+                start_links[neighbor] = costs[neighbor]
+                neighbor_distances, _ = self._cluster_search(neighbor, cluster)
+                node_expanded += len(neighbor_distances)
+                links = temporary.setdefault(neighbor, {})
+                links.update((node, neighbor_distances[node]) for node in self.intra[cluster] if node in neighbor_distances)
+                if cluster == goal_cluster and goal in neighbor_distances:
+                    links[goal] = neighbor_distances[goal]
+
+        distances, came_from = {start: 0}, {start: None}
+        closed = set()
+        priority_queue = [(0, start)]
+        while priority_queue:
+            _, current = heapq.heappop(priority_queue)
+            if current in closed:
+                continue
+            node_expanded += 1
+            if current == goal:
+                path = []
+                while current is not None:
+                    path.append(current)
+                    current = came_from[current]
+                path.reverse()
+                return path, node_expanded
+            closed.add(current)
+            links = list(temporary[current].items()) if current in temporary else []
+            if current != start:
+                links += self.intra[self.cluster_of[current]].get(current, {}).items()
+            links += [(facing, costs[facing]) for facing in self.inter.get(current, ())]
+            if current in goal_links:
+                links.append((goal, goal_links[current]))
+            for neighbor, cost in links:
+                new_cost = distances[current] + cost
+                if neighbor not in closed and new_cost < distances.get(neighbor, new_cost + 1):
+                    distances[neighbor] = new_cost
+                    came_from[neighbor] = current
+                    row, col = divmod(neighbor, width)
+                    heapq.heappush(priority_queue, (new_cost + abs(row - goal_row) + abs(col - goal_col), neighbor))
+        return None, node_expanded  # No path found
+
+    def refine(self, waypoints):
+        """Lazily expand abstract waypoints into (row, col) cells, one edge at a time."""
+        grid = self.map
+        yield grid.position(waypoints[0])
+        for a, b in zip(waypoints, waypoints[1:]):
+            for cell in self._segment(a, b)[1:]:
+                yield grid.position(cell)
+
+    def _segment(self, a, b):
+        cluster = self.cluster_of[a]
+        if a == b or self.cluster_of[b] != cluster:
+            return [a, b] if a != b else [a]  # Stepping across a border
+        cache = self.segments.setdefault(cluster, {})
+        if (a, b) not in cache:
+            _, parents = self._cluster_search(a, cluster, target=b)
+            path, current = [], b
+            while current is not None:
+                path.append(current)
+                current = parents[current]
+            path.reverse()
+            cache[(a, b)] = path
+        return cache[(a, b)]
+
+    def find_path(self, start, goal):
+        """Return (path, node_expanded) like the flat searches."""
+        waypoints, node_expanded = self.abstract_path(start, goal)
+        if waypoints is None:
+            return None, node_expanded
+        return list(self.refine(waypoints)), node_expanded
@@ -1,107 +1,508 @@
-import heapq
+import struct
+import sys
+import time
+import zlib
+from array import array
+
+from anytime import ara_star, check_arguments
+from compact_path import CompactPath
+from components import unreachable
+from grid import DIRECTIONS_8, UNSEEN, as_grid_map
+from open_list import new_open_list
+from search_stats import SearchHooks, SearchStats
+
+# Octile move costs scaled to integers (14/10 ~ sqrt(2)), so bucket queues apply
+STRAIGHT_COST = 10
+DIAGONAL_COST = 14
 
 class JumpStart:
-    def __init__(self, grid, start, goal):
+    def __init__(self, grid, start, goal, open_list="heapq", hooks=None, landmarks=None, compact=False):
         self.grid = grid
+        # Jump pruning assumes uniform terrain, so JPS never reads per-cell costs
+        self.map = as_grid_map(grid)  # Flat copy; list-of-lists callers keep working
         self.start = start
         self.goal = goal
-        self.rows = len(grid)
-        self.cols = len(grid[0])
-        self.distances = {}
-        self.came_from = {}
-        self.node_expanded = 0
+        self.open_list = open_list  # "heapq", "dial" or "radix", see open_list.py
+        self.rows = self.map.rows
+        self.cols = self.map.cols
+        self.distances = None  # Search arrays, only set while a search runs
+        self.came_from = None
+        self.jump_path = None  # CompactPath of the last search's jump points, None if it found no path
+        self.node_expanded = 0  # Expansions of the last search
+        self.jump_table = None  # Set by preprocess() to switch to JPS+
+        self.hooks = hooks or SearchHooks()  # on_expand / on_push / on_path callbacks
+        self.stats = None  # SearchStats of the last search
+        if landmarks is not None and (not landmarks.diagonal or landmarks.map is not self.map):
+            raise ValueError("landmarks must be built with diagonal=True on the same GridMap")
+        self.landmarks = landmarks  # Optional LandmarkHeuristic in octile units
+        self.compact = compact  # Return CompactPath objects (jump points) instead of lists of (row, col)
     
-    def jump_point_search(self):
-        """Main method to execute Jump Point Search."""
-        self.distances = {self.start: 0}
-        priority_queue = []
-        heapq.heappush(priority_queue, (0, self.start))
-        visited = set()
+    def jump_point_search(self, time_budget=None, max_expansions=None):
+        """Main method to execute Jump Point Search.
+
+        time_budget (seconds) and max_expansions stop the search between
+        expansions; it then gives up with (None, node_expanded).
+        """
+        grid = self.map
+        stats = self.stats = SearchStats()
+        on_expand, on_push = self.hooks.on_expand, self.hooks.on_push
+        start, goal = grid.cell_id(self.start), grid.cell_id(self.goal)
+        self.jump_path = None
+        if unreachable(grid, start, goal, diagonal=True):
+            self.node_expanded = 0
+            stats.finish()
+            if self.hooks.on_path is not None:
+                self.hooks.on_path(None)
+            return None, 0  # Different components, see components.py
+        width = grid.width
+        goal_row, goal_col = divmod(goal, width)
+        heuristic = self.landmarks.heuristic_to(goal) if self.landmarks is not None and self.landmarks.usable() else None
+        scratch = grid.scratch()  # Reused arrays; see grid.SearchScratch
+        stamp, seen, closed = scratch.stamp, scratch.base, scratch.mark()
+        self.distances, self.came_from = distances, came_from = scratch.distances, scratch.parents
+        stamp[start], distances[start] = seen, 0
+        priority_queue = new_open_list(self.open_list)
+        push, pop = priority_queue.push, priority_queue.pop
+        push((0, start))
+        node_expanded = stale_pops = peak_open = 0  # Per call, never carried over
+        pushes = 1
+        path = None
+        deadline = None if time_budget is None else stats.started + time_budget
 
         while priority_queue:
-            current_cost, current = heapq.heappop(priority_queue)
-            self.node_expanded += 1
-            if current == self.goal:
-                return self.reconstruct_path(), self.node_expanded
+            _, current = pop()
+            if stamp[current] == closed:
+                stale_pops += 1
+                continue  # Stale duplicate of an already expanded node
+            if max_expansions is not None and node_expanded >= max_expansions or \
+                    deadline is not None and time.perf_counter() >= deadline:
+                break
+            node_expanded += 1
+            if on_expand is not None:
+                on_expand(grid.position(current))
+            if current == goal:
+                path = self._keep_path(start, goal)
+                break
             
-            visited.add(current)
-            for direction in self.get_directions():
-                jump_point = self.jump(current, direction)
-                if not jump_point or jump_point in visited:
+            stamp[current] = closed
+            row, col = divmod(current, width)
+            for direction in range(len(DIRECTIONS_8)):
+                jump_point = self._jump(current, direction, goal)
+                if jump_point < 0 or stamp[jump_point] == closed:
                     continue
 
-                new_cost = self.distances[current] + self.manhattan_distance(current, jump_point)
-                if jump_point not in self.distances or new_cost < self.distances[jump_point]:
-                    self.distances[jump_point] = new_cost
-                    priority = new_cost + self.manhattan_distance(jump_point, self.goal)
-                    heapq.heappush(priority_queue, (priority, jump_point))
-                    self.came_from[jump_point] = current
+                jump_row, jump_col = divmod(jump_point, width)
+                steps = max(abs(jump_row - row), abs(jump_col - col))  # Jumps follow one direction
+                new_cost = distances[current] + steps * (DIAGONAL_COST if direction >= 4 else STRAIGHT_COST)
+                if stamp[jump_point] != seen or new_cost < distances[jump_point]:
+                    stamp[jump_point] = seen
+                    distances[jump_point] = new_cost
+                    if heuristic is None:
+                        priority = new_cost + self.octile_distance(jump_row - goal_row, jump_col - goal_col)
+                    else:
+                        priority = new_cost + heuristic(jump_point)
+                    push((priority, jump_point))
+                    pushes += 1
+                    if on_push is not None:
+                        on_push((jump_row - 1, jump_col - 1), priority)
+                    came_from[jump_point] = current
+            if len(priority_queue) > peak_open:
+                peak_open = len(priority_queue)
+
+        grid.release(scratch)
+        self.distances = self.came_from = None  # The scratch arrays are someone else's now
+        self.node_expanded = node_expanded
+        stats.expansions, stats.pushes, stats.stale_pops, stats.peak_open = node_expanded, pushes, stale_pops, peak_open
+        stats.finish()
+        if self.hooks.on_path is not None:
+            self.hooks.on_path(path)
+        return path, node_expanded
+
+    def anytime_jump_point_search(self, weight=3.0, step=0.5, time_budget=None, max_expansions=None):
+        """ARA* over jump points: a weighted JPS path first, then tighter ones while the budget lasts.
+
+        Runs the same anytime.ara_star rounds as Pathfinding.anytime_a_star,
+        with jumps as the edges and octile costs, so only jump points whose g
+        improved are expanded again. Raises ValueError for weight < 1 or
+        step <= 0. Returns the
+        last completed round's path (None if the first round did not finish
+        within time_budget seconds / max_expansions); self.bound is its
+        suboptimality bound, 1.0 once it is as short as jump_point_search's.
+        """
+        check_arguments("anytime_jump_point_search", self.open_list, weight, step)
+        grid = self.map
+        stats = self.stats = SearchStats()
+        start, goal = grid.cell_id(self.start), grid.cell_id(self.goal)
+        self.jump_path = self.bound = None
+        if unreachable(grid, start, goal, diagonal=True):
+            self.node_expanded = 0
+            stats.finish()
+            if self.hooks.on_path is not None:
+                self.hooks.on_path(None)
+            return None, 0  # Different components, see components.py
+        width = grid.width
+        goal_row, goal_col = divmod(goal, width)
+        landmarks = self.landmarks.heuristic_to(goal) if self.landmarks is not None and self.landmarks.usable() else None
+
+        def heuristic(cell):
+            if landmarks is not None:
+                return landmarks(cell)
+            row, col = divmod(cell, width)
+            return self.octile_distance(row - goal_row, col - goal_col)
+
+        def successors(cell):
+            row, col = divmod(cell, width)
+            for direction in range(len(DIRECTIONS_8)):
+                jump_point = self._jump(cell, direction, goal)
+                if jump_point >= 0:
+                    jump_row, jump_col = divmod(jump_point, width)
+                    steps = max(abs(jump_row - row), abs(jump_col - col))  # Jumps follow one direction
+                    yield jump_point, steps * (DIAGONAL_COST if direction >= 4 else STRAIGHT_COST)
+
+        scratch = grid.scratch()  # Reused arrays; see grid.SearchScratch
+        self.distances, self.came_from = scratch.distances, scratch.parents
+        path, self.bound = ara_star(grid, scratch, start, goal, successors, heuristic,
+                                    lambda cost: self._keep_path(start, goal), stats, self.hooks,
+                                    self.open_list, weight, step, time_budget, max_expansions)
+        grid.release(scratch)
+        self.distances = self.came_from = None
+        self.node_expanded = stats.expansions
+        stats.finish()
+        if self.hooks.on_path is not None:
+            self.hooks.on_path(path)
+        return path, stats.expansions
 
-        print("No path found")
-        return None, self.node_expanded  # No path found
+    def nearest_goals(self, goals, k=1, weights=None):
+        """The k cheapest of several (row, col) goals from self.start, in one JPS pass.
+
+        Same contract as Pathfinding.nearest_goals, with costs (and weights)
+        in octile units: 10 per straight step, 14 per diagonal one. A jump
+        stops on any goal, like it does on the single goal.
+        """
+        from goals import GoalIndex, GoalResult  # goals imports this module's move costs
+        grid = self.map
+        stats = self.stats = SearchStats()
+        on_expand, on_push = self.hooks.on_expand, self.hooks.on_push
+        start = grid.cell_id(self.start)
+        if weights is not None and len(weights) != len(goals):
+            raise ValueError("weights must give one value per goal")  # Before zip() could truncate them
+        if weights is not None:
+            weights = [weight for goal, weight in zip(goals, weights)
+                       if not unreachable(grid, start, grid.cell_id(goal), diagonal=True)]
+        goals = [goal for goal in goals if not unreachable(grid, start, grid.cell_id(goal), diagonal=True)]
+        index = GoalIndex(grid, goals, weights, metric="octile")
+        goal_weights, heuristic = index.weights, index.estimate
+        width = grid.width
+        scratch = grid.scratch()  # Reused arrays; see grid.SearchScratch
+        stamp, seen, closed = scratch.stamp, scratch.base, scratch.mark()
+        distances, came_from = scratch.distances, scratch.parents
+        stamp[start], distances[start] = seen, 0
+        priority_queue = new_open_list(self.open_list)
+        push, pop = priority_queue.push, priority_queue.pop
+        if goals:
+            push((heuristic(start), start))
+        node_expanded = stale_pops = peak_open = 0
+        pushes = 1 if goals else 0
+        results = []
+
+        while priority_queue and len(results) < k:
+            priority, current = pop()
+            if current < 0:
+                # A goal's finishing entry (id -goal - 1): nothing left is cheaper
+                goal = -current - 1
+                path = CompactPath.from_parents(grid, came_from, start, goal, distances[goal])
+                results.append(GoalResult(grid.position(goal), priority, path if self.compact else list(path)))
+                continue
+            if stamp[current] == closed:
+                stale_pops += 1
+                continue
+            node_expanded += 1
+            if on_expand is not None:
+                on_expand(grid.position(current))
+            stamp[current] = closed
+            if current in goal_weights:
+                push((distances[current] + goal_weights[current], -current - 1))
+                pushes += 1
+            row, col = divmod(current, width)
+            for direction in range(len(DIRECTIONS_8)):
+                jump_point = self._jump_any(current, direction, index)
+                if jump_point < 0 or stamp[jump_point] == closed:
+                    continue
+                jump_row, jump_col = divmod(jump_point, width)
+                steps = max(abs(jump_row - row), abs(jump_col - col))
+                new_cost = distances[current] + steps * (DIAGONAL_COST if direction >= 4 else STRAIGHT_COST)
+                if stamp[jump_point] != seen or new_cost < distances[jump_point]:
+                    stamp[jump_point] = seen
+                    distances[jump_point] = new_cost
+                    priority = new_cost + heuristic(jump_point)
+                    push((priority, jump_point))
+                    pushes += 1
+                    if on_push is not None:
+                        on_push((jump_row - 1, jump_col - 1), priority)
+                    came_from[jump_point] = current
+            if len(priority_queue) > peak_open:
+                peak_open = len(priority_queue)
+
+        grid.release(scratch)
+        self.node_expanded = node_expanded
+        stats.expansions, stats.pushes, stats.stale_pops, stats.peak_open = node_expanded, pushes, stale_pops, peak_open
+        stats.finish()
+        if self.hooks.on_path is not None:
+            self.hooks.on_path(results[0].path if results else None)
+        return results, node_expanded
 
     def jump(self, current, direction):
-        """Recursive jump method to determine valid jump points."""
-        next_pos = (current[0] + direction[0], current[1] + direction[1])
-        if not self.is_valid(next_pos):
-            return None
-        if next_pos == self.goal:
-            return next_pos
+        """Jump from `current` in `direction`; returns the jump point or None."""
+        grid = self.map
+        jump_point = self._jump(grid.cell_id(current), DIRECTIONS_8.index(tuple(direction)), grid.cell_id(self.goal))
+        return grid.position(jump_point) if jump_point >= 0 else None
 
-        # Check for forced neighbors
-        if self.has_forced_neighbors(next_pos, direction):
-            return next_pos
+    def _jump(self, current, direction, goal):
+        """Cell-id version of jump; returns -1 when the jump hits a wall."""
+        if self.jump_table is not None:
+            return self.jump_table.jump(current, direction, goal)
+        grid = self.map
+        dx, dy = DIRECTIONS_8[direction]
+        step = dx * grid.width + dy
+        passable = grid.passable
+        next_pos = current + step
+        while passable[next_pos]:
+            if next_pos == goal:
+                return next_pos
+            # Check for forced neighbors
+            if forced_neighbors(grid, next_pos, dx, dy):
+                return next_pos
+            # Continue jumping in the same direction
+            next_pos += step
+        return -1
 
-        # Continue jumping in the same direction
-        return self.jump(next_pos, direction)
+    def _jump_any(self, current, direction, index):
+        """_jump towards several goals: also stops on any goal of GoalIndex `index`."""
+        grid = self.map
+        step = grid.offsets8[direction]
+        dx, dy = DIRECTIONS_8[direction]
+        if self.jump_table is not None:
+            # The table gives the run up to the jump point (or wall); the index finds a goal on it
+            distance = self.jump_table.distances[direction][current]
+            goal = index.goal_on_ray(current, dx, dy, distance if distance > 0 else -distance)
+            if goal >= 0:
+                return goal
+            return current + distance * step if distance > 0 else -1
+        targets = index.weights
+        passable = grid.passable
+        next_pos = current + step
+        while passable[next_pos]:
+            if next_pos in targets or forced_neighbors(grid, next_pos, dx, dy):
+                return next_pos
+            next_pos += step
+        return -1
+
+    def preprocess(self, path=None):
+        """Switch to JPS+: build the jump table, or load it from `path` if given."""
+        if path is None:
+            self.jump_table = JumpTable(self.map)
+        else:
+            self.jump_table = JumpTable.load(path, self.map)
+        return self.jump_table
+
+    def update_cells(self, changes):
+        """Apply (row, col, value) changes and patch the jump table if there is one."""
+        changed = self.map.update_cells(changes)
+        if self.jump_table is not None:
+            self.jump_table.update(changed)
+        if self.grid is not self.map:
+            for row, col, value in changes:
+                self.grid[row][col] = value
 
     def has_forced_neighbors(self, pos, direction):
         """Check for forced neighbors."""
-        x, y = pos
-        dx, dy = direction
-
-        # Forced neighbors for diagonal movements
-        if dx != 0 and dy != 0:
-            return (
-                self.is_valid((x - dx, y)) and not self.is_valid((x - dx, y - dy)) or
-                self.is_valid((x, y - dy)) and not self.is_valid((x - dx, y - dy))
-            )
-        # Forced neighbors for horizontal or vertical movements
-        elif dx != 0:
-            return (
-                self.is_valid((x, y - 1)) and not self.is_valid((x - dx, y - 1)) or
-                self.is_valid((x, y + 1)) and not self.is_valid((x - dx, y + 1))
-            )
-        elif dy != 0:
-            return (
-                self.is_valid((x - 1, y)) and not self.is_valid((x - 1, y - dy)) or
-                self.is_valid((x + 1, y)) and not self.is_valid((x + 1, y - dy))
-            )
-        return False
+        return self._has_forced_neighbors(self.map.cell_id(pos), direction[0], direction[1])
+
+    def _has_forced_neighbors(self, pos, dx, dy):
+        """Cell-id version of has_forced_neighbors."""
+        return forced_neighbors(self.map, pos, dx, dy)
 
     def get_directions(self):
         """Return all possible movement directions, including diagonals."""
-        return [
-            (-1, 0), (1, 0), (0, -1), (0, 1),  # Horizontal and vertical
-            (-1, -1), (-1, 1), (1, -1), (1, 1)  # Diagonals
-        ]
+        return DIRECTIONS_8
 
     def is_valid(self, pos):
         """Check if a position is valid and not an obstacle."""
-        x, y = pos
-        return 0 <= x < self.rows and 0 <= y < self.cols and self.grid[x][y] != -1
+        return self.map.is_passable(pos)
+
+    def _keep_path(self, start, goal):
+        """Save the jump points leading to `goal` while the search arrays are still ours."""
+        self.jump_path = CompactPath.from_parents(self.map, self.came_from, start, goal, self.distances[goal])
+        return self.reconstruct_path()
 
     def reconstruct_path(self):
-        """Reconstruct the path from start to goal."""
-        path = []
-        current = self.goal
-        while current != self.start:
-            path.append(current)
-            current = self.came_from.get(current)
-        path.append(self.start)
-        path.reverse()
-        return path
+        """Walkable path of the last search, filling in the cells between jump points.
+
+        With compact=True the jump points are kept as a CompactPath instead.
+        None when the last search found no path.
+        """
+        if self.jump_path is None:
+            return None
+        return self.jump_path if self.compact else list(self.jump_path)
 
     def manhattan_distance(self, a, b):
         """Calculate Manhattan distance between two points."""
-        return abs(a[0] - b[0]) + abs(a[1] - b[1])
\ No newline at end of file
+        return abs(a[0] - b[0]) + abs(a[1] - b[1])
+
+    def octile_distance(self, dx, dy):
+        """Cost of the cheapest 8-connected move sequence over (dx, dy) on open ground."""
+        dx, dy = abs(dx), abs(dy)
+        return STRAIGHT_COST * (dx + dy) + (DIAGONAL_COST - 2 * STRAIGHT_COST) * min(dx, dy)
+
+
+def forced_neighbors(grid_map, pos, dx, dy):
+    """Check a cell id for forced neighbors when entered moving (dx, dy)."""
+    passable = grid_map.passable
+    back = pos - dx * grid_map.width  # One row behind the move
+
+    # Forced neighbors for diagonal movements
+    if dx != 0 and dy != 0:
+        return bool(
+            passable[back] and not passable[back - dy] or
+            passable[pos - dy] and not passable[back - dy]
+        )
+    # Forced neighbors for horizontal or vertical movements
+    elif dx != 0:
+        return bool(
+            passable[pos - 1] and not passable[back - 1] or
+            passable[pos + 1] and not passable[back + 1]
+        )
+    elif dy != 0:
+        width = grid_map.width
+        return bool(
+            passable[pos - width] and not passable[pos - width - dy] or
+            passable[pos + width] and not passable[pos + width - dy]
+        )
+    return False
+
+
+class JumpTable:
+    """JPS+ jump distances for every cell and all 8 directions.
+
+    distances[d][cell] > 0 is the number of steps from `cell` to the next
+    jump point in direction DIRECTIONS_8[d]; a value <= 0 means the ray hits
+    a wall after -value free steps. A jump is then a single lookup plus a
+    check for the goal lying on the ray.
+    """
+
+    MAGIC = b"JPS+"
+    HEADER = struct.Struct("<4sIII")  # magic, rows, cols, crc32 of the passable cells
+
+    def __init__(self, grid_map, build=True):
+        self.map = grid_map
+        self.distances = [grid_map.new_array(0) for _ in DIRECTIONS_8]
+        if build:
+            for direction in range(len(DIRECTIONS_8)):
+                for end in self._line_ends(direction):
+                    self._fill_line(end, direction)
+
+    def _line_ends(self, direction):
+        """Yield the last in-grid cell of every line running in `direction`."""
+        grid = self.map
+        dx, dy = DIRECTIONS_8[direction]
+        for row in range(grid.rows):
+            for col in range(grid.cols):
+                if not grid.in_bounds((row + dx, col + dy)):
+                    yield (row, col)
+
+    def _fill_line(self, end, direction):
+        """Recompute one line, walking back from its far end."""
+        grid = self.map
+        passable = grid.passable
+        dx, dy = DIRECTIONS_8[direction]
+        step = dx * grid.width + dy
+        table = self.distances[direction]
+        row, col = end
+        cell = grid.cell_id(end)
+        while 0 <= row < grid.rows and 0 <= col < grid.cols:
+            next_pos = cell + step
+            if not passable[next_pos]:
+                table[cell] = 0
+            elif forced_neighbors(grid, next_pos, dx, dy):
+                table[cell] = 1
+            else:
+                ahead = table[next_pos]
+                table[cell] = ahead + 1 if ahead > 0 else ahead - 1
+            cell -= step
+            row -= dx
+            col -= dy
+
+    def _line_end(self, pos, direction):
+        """Return the far end of the line through `pos` in `direction`."""
+        dx, dy = DIRECTIONS_8[direction]
+        row, col = pos
+        steps = min(
+            (self.map.rows - 1 - row if dx > 0 else row) if dx else self.map.rows,
+            (self.map.cols - 1 - col if dy > 0 else col) if dy else self.map.cols,
+        )
+        return (row + steps * dx, col + steps * dy)
+
+    def update(self, cells):
+        """Recompute the lines whose entries may depend on the changed cell ids."""
+        grid = self.map
+        for direction in range(len(DIRECTIONS_8)):
+            ends = set()
+            for cell in cells:
+                row, col = grid.position(cell)
+                # A cell is read by rays through itself and by forced-neighbor
+                # checks on the lines right next to it
+                for dr in (-1, 0, 1):
+                    for dc in (-1, 0, 1):
+                        pos = (row + dr, col + dc)
+                        if grid.in_bounds(pos):
+                            ends.add(self._line_end(pos, direction))
+            for end in ends:
+                self._fill_line(end, direction)
+
+    def jump(self, current, direction, goal):
+        """Return the jump point from `current` in `direction`, or -1 at a wall."""
+        grid = self.map
+        distance = self.distances[direction][current]
+        steps = distance if distance > 0 else -distance
+        if steps:
+            dx, dy = DIRECTIONS_8[direction]
+            row, col = divmod(current, grid.width)
+            goal_row, goal_col = divmod(goal, grid.width)
+            k = (goal_row - row) * dx if dx else (goal_col - col) * dy
+            if 0 < k <= steps and goal_row == row + k * dx and goal_col == col + k * dy:
+                return goal
+        if distance > 0:
+            return current + distance * grid.offsets8[direction]
+        return -1
+
+    def save(self, path):
+        """Write the tables to `path`; they are tied to the grid's current layout."""
+        grid = self.map
+        with open(path, "wb") as f:
+            f.write(self.HEADER.pack(self.MAGIC, grid.rows, grid.cols, zlib.crc32(grid.passable)))
+            for table in self.distances:
+                data = array(table.typecode, table)
+                if sys.byteorder == "big":
+                    data.byteswap()  # Files are little-endian
+                f.write(data.tobytes())
+
+    @classmethod
+    def load(cls, path, grid_map):
+        """Read tables written by save(); raises ValueError if they don't match `grid_map`."""
+        with open(path, "rb") as f:
+            header = f.read(cls.HEADER.size)
+            if len(header) != cls.HEADER.size or header[:4] != cls.MAGIC:
+                raise ValueError(f"{path} is not a JPS+ jump table")
+            _, rows, cols, crc = cls.HEADER.unpack(header)
+            if (rows, cols, crc) != (grid_map.rows, grid_map.cols, zlib.crc32(grid_map.passable)):
+                raise ValueError(f"{path} was built for a different grid")
+            body = f.read()
+        table = cls(grid_map, build=False)
+        size = table.distances[0].itemsize * grid_map.size  # Bytes per direction
+        if len(body) != len(table.distances) * size:
+            raise ValueError(f"{path} holds {len(body)} bytes of tables, expected {len(table.distances) * size}")
+        for direction, data in enumerate(table.distances):
+            data[:] = array(data.typecode, body[direction * size:(direction + 1) * size])
+            if sys.byteorder == "big":
+                data.byteswap()
+        return table
@@ -0,0 +1,291 @@
+import heapq
+import random
+import struct
+import sys
+import zlib
+from array import array
+from collections import deque
+
+from grid import UNSEEN
+from jumpstart import DIAGONAL_COST, STRAIGHT_COST
+
+SELECTIONS = ("farthest", "avoid")
+
+
+class LandmarkHeuristic:
+    """ALT heuristic: exact costs from K landmarks give lower bounds by the triangle inequality.
+
+    For a landmark L, d(a, b) >= d(L, b) - d(L, a), and the reverse bound
+    via d(a, L) - d(b, L). Each cell stores one cost per landmark, as uint16
+    when every finite cost fits (else uint32), with the type's maximum
+    standing for "unreachable". The bound is combined with Manhattan (or
+    octile for diagonal=True, which matches JumpStart's 10/14 move costs),
+    so it is never weaker than the default heuristic.
+
+    Stepping onto a cell costs costs[cell], so on weighted maps
+    d(b, a) = d(a, b) - costs[b] + costs[a] along the same path; that is how
+    the reverse bound is read from the same arrays. The bounds stay
+    admissible while cells are only blocked; once a cell is freed or a cost
+    changes, usable() turns False and the searches fall back to Manhattan.
+
+    Landmarks are picked by "farthest" (each one as far as possible from
+    those before it) or "avoid" (Goldberg & Harrelson: grow a shortest-path
+    tree from a random root and descend into the subtree whose distances the
+    current landmarks estimate worst).
+    """
+
+    MAGIC = b"ALT1"
+    # magic, rows, cols, count, diagonal, weighted, typecode, crc32 of passable + costs
+    HEADER = struct.Struct("<4sIIIBBcI")
+
+    def __init__(self, grid_map, count=8, selection="farthest", diagonal=False, seed=0, build=True):
+        if selection not in SELECTIONS:
+            raise ValueError(f"Unknown landmark selection {selection!r}; expected one of {SELECTIONS}")
+        self.map = grid_map
+        self.diagonal = diagonal
+        self.weighted = grid_map.weighted and not diagonal  # JPS ignores terrain costs
+        self.version = grid_map.version
+        self._usable = (self.version, True)
+        self.landmarks = []
+        self.distances = []
+        self.infinity = 0
+        if build:
+            self._select(count, selection, random.Random(seed))
+
+    def _step_costs(self):
+        """Per-offset move costs for the octile model, None when the cell cost applies."""
+        if not self.diagonal:
+            return None
+        return {offset: STRAIGHT_COST if i < 4 else DIAGONAL_COST for i, offset in enumerate(self.map.offsets8)}
+
+    def _search(self, source):
+        """Exact costs from `source` (UNSEEN where unreachable) and the shortest-path tree."""
+        grid = self.map
+        masks = grid.masks
+        distances, parents = grid.new_array(UNSEEN), grid.new_array(-1)
+        distances[source] = 0
+        if not self.diagonal and not self.weighted:  # Unit costs: plain BFS
+            table = grid.table4
+            queue = deque([source])
+            while queue:
+                current = queue.popleft()
+                cost = distances[current] + 1
+                for offset in table[masks[current]]:
+                    neighbor = current + offset
+                    if distances[neighbor] == UNSEEN:
+                        distances[neighbor] = cost
+                        parents[neighbor] = current
+                        queue.append(neighbor)
+            return distances, parents
+        table = grid.table8 if self.diagonal else grid.table4
+        step_costs, costs = self._step_costs(), grid.costs
+        queue = [(0, source)]
+        while queue:
+            distance, current = heapq.heappop(queue)
+            if distance > distances[current]:
+                continue
+            for offset in table[masks[current]]:
+                neighbor = current + offset
+                cost = distance + (step_costs[offset] if step_costs else costs[neighbor])
+                if cost < distances[neighbor]:
+                    distances[neighbor] = cost
+                    parents[neighbor] = current
+                    heapq.heappush(queue, (cost, neighbor))
+        return distances, parents
+
+    def _open_cells(self):
+        grid = self.map
+        passable = grid.passable
+        cells = []
+        for row in range(grid.rows):
+            base = grid.cell_id((row, 0))
+            cells.extend(cell for cell in range(base, base + grid.cols) if passable[cell])
+        return cells
+
+    def _select(self, count, selection, rnd):
+        cells = self._open_cells()
+        if not cells or count <= 0:
+            self._store([])
+            return
+        exact = []  # Full-width int arrays while building
+        closest = dict.fromkeys(cells, UNSEEN)  # Cost from the nearest landmark so far
+        # Start in a large component: of a few random cells keep the one reaching the most
+        seed_distances = max((self._search(rnd.choice(cells))[0] for _ in range(4)),
+                             key=lambda distances: sum(distances[cell] < UNSEEN for cell in cells))
+        landmark = max(cells, key=lambda cell: (seed_distances[cell] < UNSEEN, seed_distances[cell]))
+        # Farthest cell the landmarks already reach; small unreached pockets only come last
+        farthest = lambda cell: (closest[cell] < UNSEEN, closest[cell])
+        while True:
+            distances, _ = self._search(landmark)
+            self.landmarks.append(landmark)
+            exact.append(distances)
+            for cell in cells:
+                if distances[cell] < closest[cell]:
+                    closest[cell] = distances[cell]
+            if len(self.landmarks) >= min(count, len(cells)):
+                break
+            if selection == "avoid":
+                landmark = self._avoid(cells, exact, rnd)
+            if selection == "farthest" or landmark in self.landmarks:
+                landmark = max(cells, key=farthest)
+                if landmark in self.landmarks:
+                    break  # Every open cell is a landmark already
+        self._store(exact)
+
+    def _avoid(self, cells, exact, rnd):
+        """Descend the root's shortest-path tree into the worst-estimated subtree without a landmark."""
+        root = rnd.choice(cells)
+        distances, parents = self._search(root)
+        reached = sorted((cell for cell in cells if distances[cell] < UNSEEN), key=distances.__getitem__, reverse=True)
+        weight, covered = {}, set(self.landmarks)
+        for cell in reached:
+            if cell in covered:
+                weight[cell] = 0
+                covered.add(parents[cell])
+                continue
+            weight[cell] = weight.get(cell, 0) + distances[cell] - self._bound(exact, root, cell)
+            parent = parents[cell]
+            if parent >= 0:
+                weight[parent] = weight.get(parent, 0) + weight[cell]
+        children = {}
+        for cell in reached:
+            if parents[cell] >= 0 and cell not in covered:
+                children.setdefault(parents[cell], []).append(cell)
+        current = root
+        while children.get(current):
+            current = max(children[current], key=weight.__getitem__)
+        return current
+
+    def _bound(self, tables, a, b):
+        """Best lower bound on the cost a -> b from full-width tables (used while selecting)."""
+        best = self._base(a, b)
+        costs = self.map.costs
+        shift = costs[b] - costs[a] if self.weighted else 0  # d(a, L) - d(b, L) in D(L, .) terms
+        for table in tables:
+            from_a, from_b = table[a], table[b]
+            if from_a == UNSEEN or from_b == UNSEEN:
+                continue
+            best = max(best, from_b - from_a, from_a - from_b + shift)
+        return best
+
+    def _base(self, a, b):
+        width = self.map.width
+        ar, ac = divmod(a, width)
+        br, bc = divmod(b, width)
+        dr, dc = abs(ar - br), abs(ac - bc)
+        if self.diagonal:
+            return STRAIGHT_COST * (dr + dc) + (DIAGONAL_COST - 2 * STRAIGHT_COST) * min(dr, dc)
+        return dr + dc
+
+    def _store(self, exact):
+        """Pack the exact tables into uint16 (or uint32) arrays."""
+        largest = max((value for table in exact for value in table if value < UNSEEN), default=0)
+        typecode = "H" if largest < 0xFFFF else "I"
+        self.infinity = infinity = 0xFFFF if typecode == "H" else 0xFFFFFFFF
+        self.distances = [array(typecode, (value if value < UNSEEN else infinity for value in table)) for table in exact]
+
+    @property
+    def nbytes(self):
+        return sum(table.itemsize * len(table) for table in self.distances)
+
+    def usable(self):
+        """True while the bounds are still admissible for the grid (only new obstacles since the build)."""
+        grid = self.map
+        version, usable = self._usable
+        if version != grid.version:
+            changes = grid.changes_since(self.version)
+            usable = usable and changes is not None and not self.weighted and not any(flag for _, flag in changes)
+            self._usable = (grid.version, usable)
+        return usable
+
+    def estimate(self, a, b):
+        """Lower bound on the cost of moving from cell id `a` to cell id `b`."""
+        best = self._base(a, b)
+        infinity = self.infinity
+        costs = self.map.costs
+        shift = costs[b] - costs[a] if self.weighted else 0  # d(a, L) - d(b, L) in D(L, .) terms
+        for table in self.distances:
+            from_a, from_b = table[a], table[b]
+            if from_a == infinity or from_b == infinity:
+                continue
+            if from_b - from_a > best:
+                best = from_b - from_a
+            if from_a - from_b + shift > best:
+                best = from_a - from_b + shift
+        return best
+
+    def heuristic_to(self, goal):
+        """Return h(cell), a lower bound on the cost from `cell` to the fixed cell id `goal`."""
+        width, infinity, costs = self.map.width, self.infinity, self.map.costs
+        goal_row, goal_col = divmod(goal, width)
+        goal_cost = costs[goal]
+        weighted, diagonal = self.weighted, self.diagonal
+        tables = [(table, table[goal]) for table in self.distances if table[goal] != infinity]
+        corner = DIAGONAL_COST - 2 * STRAIGHT_COST
+
+        def heuristic(cell):
+            row, col = divmod(cell, width)
+            dr, dc = abs(row - goal_row), abs(col - goal_col)
+            best = STRAIGHT_COST * (dr + dc) + corner * (dr if dr < dc else dc) if diagonal else dr + dc
+            for table, to_goal in tables:
+                here = table[cell]
+                if here == infinity:
+                    continue  # Not reachable from this landmark
+                if to_goal - here > best:
+                    best = to_goal - here
+                reverse = here - to_goal + (goal_cost - costs[cell] if weighted else 0)
+                if reverse > best:
+                    best = reverse
+            return best
+
+        return heuristic
+
+    def save(self, path):
+        """Write the landmark tables to `path`; they are tied to the grid's current layout."""
+        grid = self.map
+        typecode = self.distances[0].typecode if self.distances else "H"
+        crc = zlib.crc32(grid.costs, zlib.crc32(grid.passable))
+        with open(path, "wb") as f:
+            f.write(self.HEADER.pack(self.MAGIC, grid.rows, grid.cols, len(self.landmarks),
+                                     self.diagonal, self.weighted, typecode.encode(), crc))
+            landmarks = array("I", self.landmarks)
+            for data in [landmarks] + self.distances:
+                if sys.byteorder == "big":
+                    data = array(data.typecode, data)
+                    data.byteswap()  # Files are little-endian
+                f.write(data.tobytes())
+
+    @classmethod
+    def load(cls, path, grid_map):
+        """Read tables written by save(); raises ValueError if they don't match `grid_map`."""
+        with open(path, "rb") as f:
+            header = f.read(cls.HEADER.size)
+            if len(header) != cls.HEADER.size or header[:4] != cls.MAGIC:
+                raise ValueError(f"{path} is not a landmark table")
+            _, rows, cols, count, diagonal, weighted, typecode, crc = cls.HEADER.unpack(header)
+            if typecode not in (b"H", b"I"):
+                raise ValueError(f"{path} has an unknown table typecode {typecode!r}")
+            if (rows, cols, crc) != (grid_map.rows, grid_map.cols, zlib.crc32(grid_map.costs, zlib.crc32(grid_map.passable))) \
+                    or bool(weighted) != (grid_map.weighted and not diagonal):
+                raise ValueError(f"{path} was built for a different grid")
+            body = f.read()
+        heuristic = cls(grid_map, diagonal=bool(diagonal), build=False)
+        typecode = typecode.decode()
+        heuristic.infinity = 0xFFFF if typecode == "H" else 0xFFFFFFFF
+        landmarks = array("I")
+        size = array(typecode).itemsize * grid_map.size  # Bytes per table
+        expected = landmarks.itemsize * count + count * size
+        if len(body) != expected:
+            raise ValueError(f"{path} holds {len(body)} bytes of tables, expected {expected}")
+        landmarks.frombytes(body[:landmarks.itemsize * count])
+        tables = []
+        for offset in range(landmarks.itemsize * count, expected, size):
+            table = array(typecode)
+            table.frombytes(body[offset:offset + size])
+            tables.append(table)
+        for data in [landmarks] + tables:
+            if sys.byteorder == "big":
+                data.byteswap()
+        heuristic.landmarks = list(landmarks)
+        heuristic.distances = tables
+        return heuristic
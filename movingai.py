@@ -0,0 +1,130 @@
+"""MovingAI benchmark maps (.map) and scenarios (.scen).
+
+load_map() parses a .map file once into a compact binary cache next to it
+(padded passable and neighbor-mask arrays, one byte each per cell) and
+memory-maps that cache as a GridMap, so later starts cost an mmap instead of
+a parse and nothing is copied into Python objects. MovingAI maps have no
+terrain costs, so the constant cost plane is not stored but filled in on
+load (a memset, unlike the masks, which take a full rebuild_masks() pass).
+Resident memory after a load is the 1-byte cost plane plus whichever mapped
+pages are touched; searches add their scratch arrays (grid.SearchScratch).
+The mapping is private copy-on-write: update_cells() works, but edits never
+reach the file.
+"""
+import mmap
+import os
+import struct
+
+from grid import GridMap
+
+PASSABLE = b".GS"  # Ground, ground and swamp; @, O, T and W are obstacles
+_TO_PASSABLE = bytes(1 if chr(i).encode() in PASSABLE else 0 for i in range(256))
+
+CACHE_SUFFIX = ".gridmap"
+CACHE_MAGIC = b"GMAP"
+CACHE_VERSION = 2
+# magic, version, rows, cols, source size, source mtime (ns), padded to 64 bytes
+CACHE_HEADER = struct.Struct("<4sIIIQQ32x")
+
+
+def parse_map(path):
+    """Read a .map file into a new in-memory GridMap."""
+    with open(path, "rb") as f:
+        data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    with data:
+        header = {}
+        position = 0
+        while True:
+            end = data.find(b"\n", position)
+            if end < 0:
+                end = len(data)  # Last line, no newline after it
+            line = data[position:end].strip()
+            position = end + 1
+            if line == b"map":
+                break
+            if end == len(data):
+                raise ValueError(f"{path}: missing 'map' line")
+            key, _, value = line.partition(b" ")
+            header[key.decode()] = value.decode()
+        rows, cols = int(header["height"]), int(header["width"])
+        grid_map = GridMap(rows, cols)
+        width = grid_map.width
+        for row in range(rows):
+            end = data.find(b"\n", position)
+            if end < 0:
+                end = len(data)  # Never wrap around to the start of the file
+            line = data[position:end].rstrip(b"\r")
+            if len(line) != cols:
+                raise ValueError(f"{path}: row {row} has {len(line)} cells, expected {cols}")
+            base = (row + 1) * width + 1
+            grid_map.passable[base:base + cols] = line.translate(_TO_PASSABLE)
+            position = end + 1
+    grid_map.rebuild_masks()
+    return grid_map
+
+
+def write_cache(grid_map, cache_path, source_stat):
+    """Write the padded passable and mask arrays of `grid_map` as a binary cache file."""
+    header = CACHE_HEADER.pack(CACHE_MAGIC, CACHE_VERSION, grid_map.rows, grid_map.cols,
+                               source_stat.st_size, source_stat.st_mtime_ns)
+    temporary = cache_path + ".tmp"
+    with open(temporary, "wb") as f:
+        f.write(header)
+        f.write(grid_map.passable)
+        f.write(grid_map.masks)
+    os.replace(temporary, cache_path)  # Readers never see a half-written cache
+
+
+def open_cache(cache_path, source_stat=None):
+    """Memory-map a cache file as a GridMap; None if it is stale or not a cache."""
+    with open(cache_path, "rb") as f:
+        data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+    if len(data) < CACHE_HEADER.size:
+        data.close()
+        return None
+    magic, version, rows, cols, size, mtime = CACHE_HEADER.unpack_from(data)
+    cells = (rows + 2) * (cols + 2)
+    if (magic, version) != (CACHE_MAGIC, CACHE_VERSION) or len(data) != CACHE_HEADER.size + 2 * cells \
+            or source_stat is not None and (size, mtime) != (source_stat.st_size, source_stat.st_mtime_ns):
+        data.close()
+        return None
+    view = memoryview(data)[CACHE_HEADER.size:]
+    return GridMap(rows, cols, passable=view[:cells], masks=view[cells:])  # Costs default to all ones
+
+
+def load_map(path, cache_path=None):
+    """Load a .map file as a GridMap, going through (and refreshing) its binary cache.
+
+    Pass cache_path=False to parse the file without touching any cache.
+    """
+    if cache_path is False:
+        return parse_map(path)
+    cache_path = cache_path or path + CACHE_SUFFIX
+    source_stat = os.stat(path)
+    if os.path.exists(cache_path):
+        grid_map = open_cache(cache_path, source_stat)
+        if grid_map is not None:
+            return grid_map
+    write_cache(parse_map(path), cache_path, source_stat)
+    return open_cache(cache_path, source_stat)
+
+
+def iter_scenarios(path, batch_size=1024):
+    """Stream a .scen file as lists of (start, goal, optimal_length), at most batch_size long.
+
+    Positions are (row, col) tuples like everywhere else in this repository;
+    the file itself stores x (column) before y (row).
+    """
+    batch = []
+    with open(path) as f:
+        for line in f:
+            fields = line.split()
+            if len(fields) < 9 or fields[0] == "version":
+                continue
+            start_col, start_row, goal_col, goal_row = map(int, fields[-5:-1])
+            batch.append(((start_row, start_col), (goal_row, goal_col), float(fields[-1])))
+            if len(batch) == batch_size:
+                yield batch
+                batch = []
+    if batch:
+        yield batch
@@ -0,0 +1,123 @@
+import heapq
+from functools import partial
+
+
+class HeapQueue(list):
+    """Binary heap (heapq). A cheaper path to a queued cell is pushed as a
+    new entry, so the search has to skip the stale duplicates it pops."""
+
+    monotone = False
+
+    def __init__(self):
+        super().__init__()
+        # Bound C functions, so the default backend costs no extra Python call
+        self.push = partial(heapq.heappush, self)
+        self.pop = partial(heapq.heappop, self)
+
+
+class BucketQueue:
+    """Dial's bucket queue for small non-negative integer priorities.
+
+    buckets[p] holds the cells queued at priority p and the cursor only
+    moves forward to the next non-empty bucket, so push and pop are O(1)
+    amortised. `where` maps each queued cell to its live priority: pushing
+    a cell again at a lower priority is a decrease-key, and the entry left
+    in the old bucket is dropped when the cursor reaches it rather than
+    being handed back to the search.
+    """
+
+    monotone = False
+
+    def __init__(self):
+        self.buckets = [[]]
+        self.where = {}
+        self.cursor = 0
+
+    def __len__(self):
+        return len(self.where)
+
+    def push(self, entry):
+        priority, item = entry
+        old = self.where.get(item)
+        if old is not None and old <= priority:
+            return
+        self.where[item] = priority
+        buckets = self.buckets
+        if priority >= len(buckets):
+            buckets.extend([] for _ in range(priority + 1 - len(buckets)))
+        buckets[priority].append(item)
+        if priority < self.cursor:
+            self.cursor = priority  # Greedy search can queue below the cursor
+
+    def pop(self):
+        buckets, where = self.buckets, self.where
+        cursor = self.cursor
+        while True:
+            bucket = buckets[cursor]
+            while bucket:
+                item = bucket.pop()
+                if where.get(item) == cursor:
+                    del where[item]
+                    self.cursor = cursor
+                    return cursor, item
+            cursor += 1
+
+
+class RadixHeap:
+    """Radix heap for monotone integer priorities (no push below the last pop).
+
+    Bucket i holds entries whose priority differs from the last popped one
+    in bit i - 1 as the highest differing bit. Popping from an empty bucket
+    0 redistributes the first non-empty bucket around its minimum, so each
+    entry moves at most log(C) times. Decrease-key works as in BucketQueue.
+    """
+
+    monotone = True
+
+    def __init__(self):
+        self.buckets = [[] for _ in range(65)]
+        self.where = {}
+        self.last = 0
+
+    def __len__(self):
+        return len(self.where)
+
+    def push(self, entry):
+        priority, item = entry
+        if priority < self.last:
+            raise ValueError(f"RadixHeap priorities must be monotone: {priority} < {self.last}")
+        old = self.where.get(item)
+        if old is not None and old <= priority:
+            return
+        self.where[item] = priority
+        self.buckets[(priority ^ self.last).bit_length()].append(entry)
+
+    def pop(self):
+        buckets, where = self.buckets, self.where
+        first = buckets[0]
+        while True:
+            while first:
+                priority, item = first.pop()
+                if where.get(item) == priority:
+                    del where[item]
+                    return priority, item
+            index = 1
+            while not buckets[index]:
+                index += 1
+            live = [entry for entry in buckets[index] if where.get(entry[1]) == entry[0]]
+            buckets[index] = []
+            if live:
+                self.last = last = min(live)[0]
+                for entry in live:
+                    buckets[(entry[0] ^ last).bit_length()].append(entry)
+
+
+OPEN_LISTS = {"heapq": HeapQueue, "dial": BucketQueue, "radix": RadixHeap}
+
+
+def new_open_list(name):
+    """Create an empty open list by backend name ("heapq", "dial" or "radix")."""
+    try:
+        return OPEN_LISTS[name]()
+    except KeyError:
+        raise ValueError(f"Unknown open list {name!r}; expected one of {sorted(OPEN_LISTS)}") from None
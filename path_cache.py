@@ -0,0 +1,163 @@
+from collections import OrderedDict
+
+from batch import ALGORITHMS, solve_one
+from jumpstart import DIAGONAL_COST, STRAIGHT_COST
+
+# Searches whose paths are shortest paths, so any slice of one is too
+OPTIMAL = {"a_star", "bidirectional_a_star", "d_star", "bfs"}
+
+
+def _octile(dr, dc):
+    return STRAIGHT_COST * (dr + dc) + (DIAGONAL_COST - 2 * STRAIGHT_COST) * min(dr, dc)
+
+
+class CacheEntry:
+    def __init__(self, path, version, node_expanded, costs=None, octile=False):
+        self.path = path
+        self.version = version  # Grid version the path was last known valid at
+        self.node_expanded = node_expanded
+        self.octile = octile  # JPS paths move diagonally; cost is then in octile 10/14 units
+        self.cells = {}  # Every cell the path walks through -> index of its waypoint
+        self.cost = 0
+        if path:
+            for index, (a, b) in enumerate(zip(path, path[1:])):
+                # JPS paths are sparse jump points; fill in the straight/diagonal run
+                steps = max(abs(b[0] - a[0]), abs(b[1] - a[1]))
+                dr, dc = (b[0] - a[0]) // steps, (b[1] - a[1]) // steps
+                for k in range(steps):
+                    self.cells.setdefault((a[0] + k * dr, a[1] + k * dc), index)
+                if octile:
+                    self.cost += _octile(abs(b[0] - a[0]), abs(b[1] - a[1]))
+                else:
+                    self.cost += abs(b[0] - a[0]) + abs(b[1] - a[1])
+            self.cells.setdefault(path[-1], len(path) - 1)
+            if costs is not None:
+                self.cost = sum(costs(cell) for cell in path[1:])  # Weighted 4-connected path
+
+
+class PathCache:
+    """LRU cache of search results over a GridMap.
+
+    Entries are keyed by (algorithm, start, goal) and stamped with the grid
+    version they were computed at. When the grid has moved on, an entry is
+    revalidated from the grid's change log instead of being dropped: it only
+    goes if a changed cell lies on the path, or a freed or re-priced cell is
+    close enough (by Manhattan lower bound, octile for JPS) to possibly
+    shorten it. Queries whose endpoints both lie on a cached shortest path
+    are answered by slicing that path.
+    """
+
+    def __init__(self, grid_map, max_entries=1024, max_cells=None):
+        self.map = grid_map
+        self.max_entries = max_entries
+        self.max_cells = max_cells  # Optional bound on the total cached path length
+        self.entries = OrderedDict()
+        self.by_cell = {}  # Cell -> keys of cached shortest paths through it
+        self.cached_cells = 0
+        self.hits = self.subpath_hits = self.misses = 0
+        self.evictions = self.invalidations = 0
+
+    def stats(self):
+        return {
+            "entries": len(self.entries),
+            "cells": self.cached_cells,
+            "hits": self.hits,
+            "subpath_hits": self.subpath_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+    def find_path(self, algorithm, start, goal):
+        """Return (path, node_expanded); node_expanded is 0 when served from cache."""
+        if algorithm not in ALGORITHMS:
+            raise ValueError(f"Unknown algorithm {algorithm!r}; expected one of {sorted(ALGORITHMS)}")
+        start, goal = tuple(start), tuple(goal)
+        key = (algorithm, start, goal)
+        entry = self.entries.get(key)
+        if entry is not None and self._revalidate(key, entry):
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry.path, 0
+        if self._optimal(algorithm):
+            path = self._subpath(start, goal)
+            if path is not None:
+                self.subpath_hits += 1
+                return path, 0
+        self.misses += 1
+        result = solve_one(self.map, 0, start, goal, algorithm)
+        costs = None
+        if self.map.weighted and algorithm != "jump_point_search":
+            costs = lambda pos: self.map.costs[self.map.cell_id(pos)]
+        octile = algorithm == "jump_point_search"
+        self.put(key, CacheEntry(result.path, self.map.version, result.node_expanded, costs, octile))
+        return result.path, result.node_expanded
+
+    def put(self, key, entry):
+        if key in self.entries:
+            self._remove(key)
+        self.entries[key] = entry
+        self.cached_cells += len(entry.cells)
+        if self._optimal(key[0]):
+            for cell in entry.cells:
+                self.by_cell.setdefault(cell, set()).add(key)
+        while self.entries and (
+            len(self.entries) > self.max_entries
+            or self.max_cells is not None and self.cached_cells > self.max_cells
+        ):
+            self._remove(next(iter(self.entries)))
+            self.evictions += 1
+
+    def _remove(self, key):
+        entry = self.entries.pop(key)
+        self.cached_cells -= len(entry.cells)
+        if self._optimal(key[0]):
+            for cell in entry.cells:
+                keys = self.by_cell[cell]
+                keys.discard(key)
+                if not keys:
+                    del self.by_cell[cell]
+
+    def _optimal(self, algorithm):
+        # bfs counts steps, which is only the path cost on unweighted maps
+        return algorithm in OPTIMAL and not (self.map.weighted and algorithm == "bfs")
+
+    def _revalidate(self, key, entry):
+        """Bring an entry up to the current grid version, dropping it if an edit matters."""
+        if entry.version == self.map.version:
+            return True
+        changes = self.map.changes_since(entry.version)
+        if changes is None or any(self._affects(entry, cell, passable) for cell, passable in changes):
+            self._remove(key)
+            self.invalidations += 1
+            return False
+        entry.version = self.map.version
+        return True
+
+    def _affects(self, entry, cell, passable):
+        row, col = self.map.position(cell)
+        if (row, col) in entry.cells:
+            return True  # A wall or a new cost on the path itself
+        if not passable:
+            return False
+        if entry.path is None:
+            return True  # Any opening could connect start and goal
+        start, goal = entry.path[0], entry.path[-1]
+        if entry.octile:
+            bound = _octile(abs(start[0] - row), abs(start[1] - col)) + _octile(abs(goal[0] - row), abs(goal[1] - col))
+        else:
+            bound = abs(start[0] - row) + abs(start[1] - col) + abs(goal[0] - row) + abs(goal[1] - col)
+        return bound < entry.cost  # A detour through the cell might be shorter
+
+    def _subpath(self, start, goal):
+        """Slice a cached shortest path that passes through both endpoints."""
+        if not self.map.is_passable(goal):
+            return None  # Paths may leave a blocked start, so a reversed slice could end on one
+        for key in list(self.by_cell.get(start, ())):
+            entry = self.entries.get(key)
+            if entry is None or goal not in entry.cells or not self._revalidate(key, entry):
+                continue
+            i, j = entry.cells[start], entry.cells[goal]
+            self.entries.move_to_end(key)
+            return entry.path[i:j + 1] if i <= j else entry.path[j:i + 1][::-1]
+        return None
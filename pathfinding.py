@@ -1,117 +1,461 @@
-import heapq
 from collections import deque
 
+from anytime import ara_star, check_arguments
+from compact_path import CompactPath, parent_chain
+from components import unreachable
+from dstar_lite import DStarLite
+from goals import GoalIndex, GoalResult
+from grid import UNSEEN, as_grid_map
+from open_list import new_open_list
+from search_stats import SearchHooks, SearchStats
+
+
 class Pathfinding:
-    def __init__(self, grid, start, goal):
+    def __init__(self, grid, start, goal, weighted=False, open_list="heapq", hooks=None, landmarks=None, compact=False):
         self.grid = grid
+        self.map = as_grid_map(grid, weighted)  # Flat copy; list-of-lists callers keep working
         self.start = start
         self.goal = goal
-        self.distances = {}
+        self.open_list = open_list  # "heapq", "dial" or "radix", see open_list.py
+        self.distances = None
+        self.planner = None  # D* Lite state kept between d_star() calls
+        self.hooks = hooks or SearchHooks()  # on_expand / on_push / on_path callbacks
+        self.stats = None  # SearchStats of the last search
+        self.bound = None  # Suboptimality bound of the last anytime_a_star() path
+        self.expanded = None  # {"forward": n, "backward": n} after bidirectional_a_star(), else None
+        if landmarks is not None and (landmarks.diagonal or landmarks.map is not self.map):
+            raise ValueError("landmarks must be built with diagonal=False on the same GridMap")
+        self.landmarks = landmarks  # Optional LandmarkHeuristic for a_star and d_star
+        self.compact = compact  # Return CompactPath objects instead of lists of (row, col)
 
     def d_star(self):
-        self.distances = {self.goal: 0}
-        priority_queue = []
-        heapq.heappush(priority_queue, (0, self.goal))
-        visited = set()
-        node_expanded = 0
+        # D* Lite from the goal: the first call is a full backward search,
+        # later calls only repair what update_cells() or a moved start changed
+        grid = self.map
+        stats = self.stats = SearchStats()
+        start, goal = grid.cell_id(self.start), grid.cell_id(self.goal)
+        if unreachable(grid, start, goal):
+            return self._finish(None, stats)  # Different components, see components.py
+        use_landmarks = self.landmarks is not None and self.landmarks.usable()
+        if self.planner is None or self.planner.goal != goal or self.planner.heuristic and not use_landmarks:
+            # Keys must come from one heuristic, so losing the landmarks means planning afresh
+            heuristic = self.landmarks.estimate if use_landmarks else None
+            self.planner = DStarLite(grid, self.start, self.goal, heuristic)
+        elif self.planner.start != start:
+            self.planner.move_start(self.start)
+        planner = self.planner
+        planner.on_expand, planner.on_push = self.hooks.on_expand, self.hooks.on_push
+        self.distances = planner.g
+        pushes, stale_pops = planner.pushes, planner.stale_pops
+        stats.expansions = planner.compute_shortest_path()
+        stats.pushes, stats.stale_pops = planner.pushes - pushes, planner.stale_pops - stale_pops
+        stats.peak_open = planner.peak_open
+        path = None
+        if self.distances[start] < UNSEEN:
+            path = planner.extract_path()
+            if self.compact and path is not None:
+                path = CompactPath.from_positions(grid, path, self.distances[start])
+        return self._finish(path, stats)
+
+    def update_cells(self, changes):
+        """Apply (row, col, value) changes, e.g. [(r, c, -1), ...], to the grid."""
+        self.map.update_cells(changes)  # d_star's planner catches up from the change log
+        if self.grid is not self.map:
+            for row, col, value in changes:
+                self.grid[row][col] = value
 
-        while priority_queue:
-           # print("running")
-            node_expanded +=1
-            current_cost, current = heapq.heappop(priority_queue)
-            if current == self.start:
-                return self.reconstruct_path(), node_expanded
-            visited.add(current)
-            for neighbor in self.get_neighbors(current):
-                if neighbor in visited:
-                    continue
-                new_cost = current_cost + 1  # TO BE CHANGE IN FUTURE
-                if neighbor not in self.distances or new_cost < self.distances[neighbor]:
-                    self.distances[neighbor] = new_cost
-                    priority = new_cost + self.manhattan_distance(self.start, neighbor)
-                    heapq.heappush(priority_queue, (priority, neighbor))
-       # print("done")
-        return None, node_expanded  # No path found
-    
     def a_star(self):
-        self.distances = {self.start: 0}  # Start from the start node
-        priority_queue = []
-        heapq.heappush(priority_queue, (0, self.start))
-        visited = set()
-        came_from = {}
-        node_expanded = 0
+        grid = self.map
+        stats = self.stats = SearchStats()
+        on_expand, on_push = self.hooks.on_expand, self.hooks.on_push
+        start, goal = grid.cell_id(self.start), grid.cell_id(self.goal)
+        if unreachable(grid, start, goal):
+            return self._finish(None, stats)  # Different components, see components.py
+        width, masks, table, costs = grid.width, grid.masks, grid.table4, grid.costs
+        goal_row, goal_col = divmod(goal, width)
+        heuristic = self.landmarks.heuristic_to(goal) if self.landmarks is not None and self.landmarks.usable() else None
+        scratch = grid.scratch()  # Reused arrays; see grid.SearchScratch
+        stamp, distances, came_from = scratch.stamp, scratch.distances, scratch.parents
+        seen, closed = scratch.base, scratch.mark()  # distances[cell] is ours once stamp[cell] is either
+        stamp[start], distances[start] = seen, 0  # Start from the start node
+        priority_queue = new_open_list(self.open_list)
+        push, pop = priority_queue.push, priority_queue.pop
+        push((0, start))
+        node_expanded = stale_pops = peak_open = 0
+        pushes = 1
+        path = None  # Stays None if there is no path
 
         while priority_queue:
-            current_cost, current = heapq.heappop(priority_queue)
+            _, current = pop()
+            if stamp[current] == closed:
+                stale_pops += 1
+                continue  # Stale duplicate of an already expanded node
             node_expanded += 1
-            if current == self.goal:
-                return self.reconstruct_path2(came_from), node_expanded  # Use came_from to reconstruct path
-            visited.add(current)
-            for neighbor in self.get_neighbors(current):
-                if neighbor in visited:
+            if on_expand is not None:
+                on_expand(grid.position(current))
+            if current == goal:
+                path = self._path(came_from, distances[goal])  # Use came_from to reconstruct path
+                break
+            stamp[current] = closed
+            current_cost = distances[current]
+            for offset in table[masks[current]]:
+                neighbor = current + offset
+                new_cost = current_cost + costs[neighbor]  # Cost of stepping onto the neighbor
+                mark = stamp[neighbor]
+                if mark == closed or mark == seen and new_cost >= distances[neighbor]:
                     continue
-                new_cost = current_cost + 1  # Customize this for variable costs
-                if neighbor not in self.distances or new_cost < self.distances[neighbor]:
-                    self.distances[neighbor] = new_cost
-                    priority = new_cost + self.manhattan_distance(self.goal, neighbor)
-                    heapq.heappush(priority_queue, (priority, neighbor))
-                    came_from[neighbor] = current  # Track path
-
-        return None, node_expanded  # No path found
-    
+                stamp[neighbor] = seen
+                distances[neighbor] = new_cost
+                row, col = divmod(neighbor, width)
+                if heuristic is None:
+                    # Manhattan distance stays admissible because every cell costs at least 1
+                    priority = new_cost + abs(row - goal_row) + abs(col - goal_col)
+                else:
+                    priority = new_cost + heuristic(neighbor)
+                push((priority, neighbor))
+                pushes += 1
+                if on_push is not None:
+                    on_push((row - 1, col - 1), priority)
+                came_from[neighbor] = current  # Track path
+            if len(priority_queue) > peak_open:
+                peak_open = len(priority_queue)
+
+        grid.release(scratch)
+        stats.expansions, stats.pushes, stats.stale_pops, stats.peak_open = node_expanded, pushes, stale_pops, peak_open
+        return self._finish(path, stats)
+
+    def anytime_a_star(self, weight=3.0, step=0.5, time_budget=None, max_expansions=None):
+        """ARA*: a fast weighted-A* path first, then tighter ones while the budget lasts.
+
+        The rounds are anytime.ara_star's: f = g + weight * h, with the weight
+        lowered by `step` each time (weight >= 1 and step > 0, else
+        ValueError). time_budget (seconds) and max_expansions stop the search
+        between expansions; the result is the last completed round's path, or
+        None if the first round did not finish. self.bound is that path's
+        proven suboptimality bound (1.0 means optimal).
+        """
+        check_arguments("anytime_a_star", self.open_list, weight, step)
+        grid = self.map
+        stats = self.stats = SearchStats()
+        start, goal = grid.cell_id(self.start), grid.cell_id(self.goal)
+        self.bound = None
+        if unreachable(grid, start, goal):
+            return self._finish(None, stats)  # Different components, see components.py
+        width, masks, table, costs = grid.width, grid.masks, grid.table4, grid.costs
+        goal_row, goal_col = divmod(goal, width)
+
+        def successors(cell):
+            for offset in table[masks[cell]]:
+                yield cell + offset, costs[cell + offset]  # Stepping onto a cell costs that cell
+
+        def heuristic(cell):
+            row, col = divmod(cell, width)
+            return abs(row - goal_row) + abs(col - goal_col)
+
+        scratch = grid.scratch()  # Reused arrays; see grid.SearchScratch
+        path, self.bound = ara_star(grid, scratch, start, goal, successors, heuristic,
+                                    lambda cost: self._path(scratch.parents, cost), stats, self.hooks,
+                                    self.open_list, weight, step, time_budget, max_expansions)
+        grid.release(scratch)
+        return self._finish(path, stats)
+
+    def bidirectional_a_star(self):
+        # A* forward from the start and backward from the goal at the same
+        # time, always expanding the side with the smaller open list. `best`
+        # is the cheapest start-goal path seen where the frontiers touched;
+        # once either side's lowest f reaches it, no cheaper path is left
+        # (f only grows on each side because Manhattan distance is consistent).
+        # self.expanded holds the per-direction counts.
+        grid = self.map
+        stats = self.stats = SearchStats()
+        on_expand, on_push = self.hooks.on_expand, self.hooks.on_push
+        start, goal = grid.cell_id(self.start), grid.cell_id(self.goal)
+        if not grid.passable[goal] or unreachable(grid, start, goal):
+            # A blocked goal would still seed the backward frontier and end the path on a wall
+            return self._finish(None, stats, {"forward": 0, "backward": 0})
+        width, masks, table, costs = grid.width, grid.masks, grid.table4, grid.costs
+        sides = []
+        for source, target in ((start, goal), (goal, start)):
+            scratch = grid.scratch()  # One set of reused arrays per side; see grid.SearchScratch
+            seen, closed = scratch.base, scratch.mark()
+            scratch.stamp[source], scratch.distances[source], scratch.parents[source] = seen, 0, -1
+            open_list = new_open_list(self.open_list)
+            open_list.push((0, source))
+            # distances, stamps, parents, open list, target row/col, expanded count, last popped f,
+            # seen and closed stamps, scratch
+            sides.append([scratch.distances, scratch.stamp, scratch.parents, open_list, divmod(target, width), 0, 0,
+                          seen, closed, scratch])
+        forward, backward = sides
+        best, meet = (0, start) if start == goal else (UNSEEN, -1)
+        stale_pops = peak_open = 0
+        pushes = 2
+
+        while forward[3] and backward[3]:
+            is_forward = len(forward[3]) <= len(backward[3])
+            side, other = (forward, backward) if is_forward else (backward, forward)
+            distances, stamp, parents, open_list, (target_row, target_col), _, _, seen, closed, _ = side
+            other_distances, other_stamp, other_seen = other[0], other[1], other[7]
+            priority, current = open_list.pop()
+            side[6] = priority
+            if priority >= best or other[6] >= best:
+                break  # Both are lower bounds on every path still to be found
+            if stamp[current] == closed:
+                stale_pops += 1
+                continue  # Stale duplicate of an already expanded node
+            stamp[current] = closed
+            side[5] += 1
+            if on_expand is not None:
+                on_expand(grid.position(current))
+            current_cost = distances[current]
+            # Stepping onto a cell costs costs[cell], so backward steps pay for the cell they leave
+            step = costs[current]
+            for offset in table[masks[current]]:
+                neighbor = current + offset
+                new_cost = current_cost + (costs[neighbor] if is_forward else step)
+                mark = stamp[neighbor]
+                if mark == closed or mark == seen and new_cost >= distances[neighbor]:
+                    continue
+                stamp[neighbor] = seen
+                distances[neighbor] = new_cost
+                parents[neighbor] = current
+                if other_stamp[neighbor] >= other_seen and new_cost + other_distances[neighbor] < best:
+                    best, meet = new_cost + other_distances[neighbor], neighbor
+                row, col = divmod(neighbor, width)
+                priority = new_cost + abs(row - target_row) + abs(col - target_col)
+                open_list.push((priority, neighbor))
+                pushes += 1
+                if on_push is not None:
+                    on_push((row - 1, col - 1), priority)
+            if len(forward[3]) + len(backward[3]) > peak_open:
+                peak_open = len(forward[3]) + len(backward[3])
+
+        stats.expansions, stats.pushes, stats.stale_pops, stats.peak_open = forward[5] + backward[5], pushes, stale_pops, peak_open
+        path = None
+        if meet != -1:
+            path = []
+            current = meet
+            while current != -1:
+                path.append(grid.position(current))
+                current = forward[2][current]
+            path.reverse()
+            current = backward[2][meet]
+            while current != -1:
+                path.append(grid.position(current))
+                current = backward[2][current]
+            if self.compact:
+                path = CompactPath.from_positions(grid, path, best)
+        grid.release(forward[9])
+        grid.release(backward[9])
+        return self._finish(path, stats, {"forward": forward[5], "backward": backward[5]})
+
     def bfs(self):
-        queue = deque([self.start])
-        came_from = {self.start: None}
-        visited = set()
+        grid = self.map
+        stats = self.stats = SearchStats()
+        on_expand, on_push = self.hooks.on_expand, self.hooks.on_push
+        start, goal = grid.cell_id(self.start), grid.cell_id(self.goal)
+        if unreachable(grid, start, goal):
+            return self._finish(None, stats)  # Different components, see components.py
+        masks, table = grid.masks, grid.table4
+        scratch = grid.scratch()  # Reused arrays; see grid.SearchScratch
+        stamp, came_from, seen = scratch.stamp, scratch.parents, scratch.base
+        stamp[start] = seen  # Marks the start as seen
+        queue = deque([start])
+        node_expanded = peak_open = 0
+        pushes = 1
+        path = None
 
         while queue:
             current = queue.popleft()
-            if current == self.goal:
-                return self.reconstruct_path2(came_from)
-            visited.add(current)
-            for neighbor in self.get_neighbors(current):
-                if neighbor not in visited and neighbor not in came_from:
+            node_expanded += 1
+            if on_expand is not None:
+                on_expand(grid.position(current))
+            if current == goal:
+                path = self._path(came_from)
+                break
+            for offset in table[masks[current]]:
+                neighbor = current + offset
+                if stamp[neighbor] != seen:
+                    stamp[neighbor] = seen
                     came_from[neighbor] = current
                     queue.append(neighbor)
-        return None
-    
-    def greedy_best_first_search(self):
-        priority_queue = [(self.manhattan_distance(self.start, self.goal), self.start)]
-        came_from = {self.start: None}
-        visited = set()
-        node_expanded = 0  # Track the number of expanded nodes
+                    pushes += 1
+                    if on_push is not None:
+                        on_push(grid.position(neighbor), None)
+            if len(queue) > peak_open:
+                peak_open = len(queue)
+
+        grid.release(scratch)
+        stats.expansions, stats.pushes, stats.peak_open = node_expanded, pushes, peak_open
+        return self._finish(path, stats)
+
+    def greedy_best_first_search(self, max_expansions=None):
+        # Gives up with (None, node_expanded) after max_expansions expansions
+        grid = self.map
+        priority_queue = new_open_list(self.open_list)
+        if priority_queue.monotone:
+            raise ValueError(f"greedy_best_first_search cannot use the monotone {self.open_list!r} open list")
+        stats = self.stats = SearchStats()
+        on_expand, on_push = self.hooks.on_expand, self.hooks.on_push
+        start, goal = grid.cell_id(self.start), grid.cell_id(self.goal)
+        if unreachable(grid, start, goal):
+            return self._finish(None, stats)  # Different components, see components.py
+        width, masks, table = grid.width, grid.masks, grid.table4
+        goal_row, goal_col = divmod(goal, width)
+        scratch = grid.scratch()  # Reused arrays; see grid.SearchScratch
+        stamp, came_from, seen = scratch.stamp, scratch.parents, scratch.base
+        stamp[start] = seen  # Marks the start as seen
+        push, pop = priority_queue.push, priority_queue.pop
+        push((self.manhattan_distance(self.start, self.goal), start))
+        node_expanded = peak_open = 0  # Track the number of expanded nodes
+        pushes = 1
+        path = None
 
         while priority_queue:
-            _, current = heapq.heappop(priority_queue)
+            _, current = pop()
+            if node_expanded == max_expansions:
+                break
             node_expanded += 1  # Increment expanded node count
+            if on_expand is not None:
+                on_expand(grid.position(current))
 
-            if current == self.goal:
-                return self.reconstruct_path2(came_from), node_expanded
+            if current == goal:
+                path = self._path(came_from)
+                break
 
-            visited.add(current)
-
-            for neighbor in self.get_neighbors(current):
-                if neighbor not in visited and neighbor not in came_from:
+            for offset in table[masks[current]]:
+                neighbor = current + offset
+                if stamp[neighbor] != seen:
+                    stamp[neighbor] = seen
                     came_from[neighbor] = current
-                    heapq.heappush(priority_queue, (self.manhattan_distance(neighbor, self.goal), neighbor))
+                    row, col = divmod(neighbor, width)
+                    priority = abs(row - goal_row) + abs(col - goal_col)
+                    push((priority, neighbor))
+                    pushes += 1
+                    if on_push is not None:
+                        on_push((row - 1, col - 1), priority)
+            if len(priority_queue) > peak_open:
+                peak_open = len(priority_queue)
+
+        grid.release(scratch)
+        stats.expansions, stats.pushes, stats.peak_open = node_expanded, pushes, peak_open
+        return self._finish(path, stats)
 
-        return None, node_expanded  # No path found
+    def nearest_goals(self, goals, k=1, weights=None):
+        """The k cheapest of several (row, col) goals from self.start, found in one A* pass.
+
+        Returns ([GoalResult(goal, cost, path), ...] cheapest first, node_expanded);
+        the list is shorter when fewer goals are reachable. weights adds a
+        non-negative extra cost per goal to its path cost. The heuristic is
+        a GoalIndex minimum over the goals, so a goal is settled when its
+        finishing entry, keyed by its exact cost, comes off the open list.
+        self.goal is not used.
+        """
+        grid = self.map
+        stats = self.stats = SearchStats()
+        on_expand, on_push = self.hooks.on_expand, self.hooks.on_push
+        start = grid.cell_id(self.start)
+        if weights is not None and len(weights) != len(goals):
+            raise ValueError("weights must give one value per goal")  # Before zip() could truncate them
+        if weights is not None:
+            weights = [weight for goal, weight in zip(goals, weights) if not unreachable(grid, start, grid.cell_id(goal))]
+        goals = [goal for goal in goals if not unreachable(grid, start, grid.cell_id(goal))]
+        index = GoalIndex(grid, goals, weights)
+        goal_weights, heuristic = index.weights, index.estimate
+        width, masks, table, costs = grid.width, grid.masks, grid.table4, grid.costs
+        scratch = grid.scratch()  # Reused arrays; see grid.SearchScratch
+        stamp, distances, came_from = scratch.stamp, scratch.distances, scratch.parents
+        seen, closed = scratch.base, scratch.mark()
+        stamp[start], distances[start] = seen, 0
+        priority_queue = new_open_list(self.open_list)
+        push, pop = priority_queue.push, priority_queue.pop
+        if goals:
+            push((heuristic(start), start))
+        node_expanded = stale_pops = peak_open = 0
+        pushes = 1 if goals else 0
+        results = []
+
+        while priority_queue and len(results) < k:
+            priority, current = pop()
+            if current < 0:
+                # A goal's finishing entry (id -goal - 1): nothing left is cheaper
+                goal = -current - 1
+                if self.compact:
+                    path = CompactPath.from_parents(grid, came_from, start, goal, distances[goal])
+                else:
+                    path = [grid.position(cell) for cell in parent_chain(came_from, start, goal)][::-1]
+                results.append(GoalResult(grid.position(goal), priority, path))
+                continue
+            if stamp[current] == closed:
+                stale_pops += 1
+                continue
+            node_expanded += 1
+            if on_expand is not None:
+                on_expand(grid.position(current))
+            stamp[current] = closed
+            current_cost = distances[current]
+            if current in goal_weights:
+                push((current_cost + goal_weights[current], -current - 1))
+                pushes += 1
+            for offset in table[masks[current]]:
+                neighbor = current + offset
+                new_cost = current_cost + costs[neighbor]
+                mark = stamp[neighbor]
+                if mark == closed or mark == seen and new_cost >= distances[neighbor]:
+                    continue
+                stamp[neighbor] = seen
+                distances[neighbor] = new_cost
+                came_from[neighbor] = current
+                priority = new_cost + heuristic(neighbor)
+                push((priority, neighbor))
+                pushes += 1
+                if on_push is not None:
+                    on_push(grid.position(neighbor), priority)
+            if len(priority_queue) > peak_open:
+                peak_open = len(priority_queue)
+
+        grid.release(scratch)
+        stats.expansions, stats.pushes, stats.stale_pops, stats.peak_open = node_expanded, pushes, stale_pops, peak_open
+        stats.finish()
+        self.expanded = None
+        if self.hooks.on_path is not None:
+            self.hooks.on_path(results[0].path if results else None)
+        return results, node_expanded
+
+    def _finish(self, path, stats, expanded=None):
+        """Close the stats of a search, report the path to on_path and return (path, node_expanded)."""
+        stats.finish()
+        self.expanded = expanded  # Only bidirectional_a_star splits its count
+        if self.hooks.on_path is not None:
+            self.hooks.on_path(path)
+        return path, stats.expansions
+
+    def distance_field(self):
+        """Distance/flow field to the goal, shared by every search on this grid."""
+        from distance_field import cache_for  # NumPy is only needed for fields
+        return cache_for(self.map).field(self.goal)
 
     def reconstruct_path(self):
-        path = []
-        current = self.start 
-        while current != self.goal:
-            path.append(current)
-            current = min((neighbor for neighbor in self.get_neighbors(current)),key=lambda x: self.distances.get(x, float("inf")),default=self.goal)
-        path.append(self.goal)
-        return path
+        if self.map.weighted:
+            # Fields count steps; D* Lite's planner follows the terrain costs
+            return self.d_star()[0]
+        # Walk the goal's flow field: one lookup per step instead of a neighbor scan
+        return self.distance_field().path(self.start)
     
+    def _path(self, came_from, cost=None):
+        """The path in `came_from`: a list of (row, col), or a CompactPath with compact=True."""
+        if self.compact:
+            grid = self.map
+            return CompactPath.from_parents(grid, came_from, grid.cell_id(self.start), grid.cell_id(self.goal), cost)
+        return self.reconstruct_path2(came_from)
+
     def reconstruct_path2(self, came_from):
+        grid = self.map
+        start = grid.cell_id(self.start)
         path = []
-        current = self.goal
-        while current != self.start:
-            path.append(current)
-            current = came_from.get(current)
+        current = grid.cell_id(self.goal)
+        while current != start:
+            path.append(grid.position(current))
+            current = came_from[current]
         path.append(self.start)
         path.reverse()  # Reverse path to start from the beginning
         return path
@@ -120,10 +464,5 @@ class Pathfinding:
         return abs(a[0] - b[0]) + abs(a[1] - b[1])
 
     def get_neighbors(self, pos):
-        directions = [(-1, 0), (1, 0), (0, -1), (0, 1)]
-        neighbors = []
-        for move in directions:
-            neighbor = (pos[0] + move[0], pos[1] + move[1])
-            if 0 <= neighbor[0] < len(self.grid) and 0 <= neighbor[1] < len(self.grid[0]) and self.grid[neighbor[0]][neighbor[1]] != -1:
-                neighbors.append(neighbor)
-        return neighbors
\ No newline at end of file
+        grid = self.map
+        return [grid.position(cell) for cell in grid.neighbors(grid.cell_id(pos))]
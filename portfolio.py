@@ -0,0 +1,264 @@
+import json
+import multiprocessing
+import queue
+import random
+import time
+from collections import namedtuple
+
+from batch import ALGORITHMS, attach_grid, share_grid
+from grid import as_grid_map
+from path_cache import OPTIMAL
+from search_stats import SearchHooks
+
+# A None from these proves there is no path. jump_point_search is left out:
+# its diagonal jumps never branch into straight ones, so it misses paths.
+COMPLETE = OPTIMAL | {"greedy_best_first_search"}
+KEY_SAMPLE = 4096  # Cells map_key samples on grids that are not flat buffers (ChunkedGrid)
+ACCEPT = ("optimal", "any")
+DEFAULT_PORTFOLIO = ("a_star", "bidirectional_a_star", "jump_point_search", "greedy_best_first_search")
+POLL_INTERVAL = 0.2  # Seconds solve() waits for a result before checking that its workers still live
+
+RaceResult = namedtuple("RaceResult", ["path", "algorithm", "node_expanded", "elapsed", "raced"])
+
+# Corridor cells have at most two open 4-neighbors; masks keep those in bits 0-3
+_CORRIDOR = bytes(int(bin(mask & 0x0F).count("1") <= 2) for mask in range(256))
+
+
+class SearchCancelled(Exception):
+    """Raised inside a losing worker's search to stop it."""
+
+
+def map_key(grid_map, map_type=None):
+    """Cheap map signature the predictor learns per: size, obstacle share and corridor share.
+
+    Pass map_type (e.g. "maze") when the caller already knows what kind of map it is.
+    """
+    if map_type is not None:
+        return str(map_type)
+    cells = grid_map.rows * grid_map.cols
+    try:
+        # bytearray, memoryview (shared memory) or mmap slices (movingai) alike
+        passable, masks = memoryview(grid_map.passable).tobytes(), memoryview(grid_map.masks).tobytes()
+    except TypeError:
+        blocked, corridor = _sampled_shares(grid_map)
+    else:
+        free = passable.count(1)  # The padding is never passable
+        # Free cells with at most two open neighbors, counted with one big-integer AND
+        corridors = (int.from_bytes(masks.translate(_CORRIDOR), "little")
+                     & int.from_bytes(passable, "little")).bit_count()
+        blocked, corridor = (cells - free) / cells, corridors / max(free, 1)
+    return f"2^{cells.bit_length()}/blocked{round(10 * blocked)}/corridor{round(10 * corridor)}"
+
+
+def _sampled_shares(grid_map):
+    """map_key's obstacle and corridor shares from KEY_SAMPLE seeded cells, for indexable views."""
+    rnd = random.Random(0)
+    free = corridors = 0
+    for _ in range(KEY_SAMPLE):
+        cell = grid_map.cell_id((rnd.randrange(grid_map.rows), rnd.randrange(grid_map.cols)))
+        if grid_map.passable[cell]:
+            free += 1
+            corridors += _CORRIDOR[grid_map.masks[cell]]
+    return (KEY_SAMPLE - free) / KEY_SAMPLE, corridors / max(free, 1)
+
+
+class Predictor:
+    """Win counts per (map key, acceptance) from past races.
+
+    Once a key has min_races recorded and one algorithm won at least
+    `confidence` of them, choose() names it and the solver runs only that
+    algorithm; with probability `explore` it still races the whole
+    portfolio so the counts keep up if another algorithm starts winning.
+    """
+
+    def __init__(self, min_races=5, confidence=0.8, explore=0.1, seed=0):
+        self.min_races = min_races
+        self.confidence = confidence
+        self.explore = explore
+        self.random = random.Random(seed)
+        self.wins = {}  # "key|accept" -> {algorithm: wins}
+
+    def record(self, key, accept, winner):
+        counts = self.wins.setdefault(f"{key}|{accept}", {})
+        counts[winner] = counts.get(winner, 0) + 1
+
+    def choose(self, key, accept, candidates):
+        """The likely winner among `candidates`, or None to race them all."""
+        counts = {name: wins for name, wins in self.wins.get(f"{key}|{accept}", {}).items() if name in candidates}
+        total = sum(counts.values())
+        if total < self.min_races or self.random.random() < self.explore:
+            return None
+        best = max(counts, key=counts.get)
+        return best if counts[best] >= self.confidence * total else None
+
+    def save(self, path):
+        with open(path, "w") as f:
+            json.dump(self.wins, f, indent=1, sort_keys=True)
+
+    def load(self, path):
+        """Add the counts saved in `path` to this predictor."""
+        with open(path) as f:
+            for key, counts in json.load(f).items():
+                mine = self.wins.setdefault(key, {})
+                for name, wins in counts.items():
+                    mine[name] = mine.get(name, 0) + wins
+        return self
+
+
+def _race_worker(algorithm, shared, tasks, results, cancelled):
+    """Worker process: run `algorithm` for each (race, start, goal) until it gets None.
+
+    A race is over for everyone once cancelled.value reaches its id; the
+    search checks that on every expansion and bails out.
+    """
+    grid_map, memory = attach_grid(*shared)
+    cls, method = ALGORITHMS[algorithm]
+    try:
+        for race, start, goal in iter(tasks.get, None):
+            if cancelled.value >= race:
+                continue  # Decided before we got to it
+
+            def on_expand(pos, race=race):
+                if cancelled.value >= race:
+                    raise SearchCancelled
+
+            try:
+                path, node_expanded = getattr(cls(grid_map, start, goal, hooks=SearchHooks(on_expand=on_expand)), method)()
+            except SearchCancelled:
+                results.put((race, algorithm, None, None, True))
+                continue
+            results.put((race, algorithm, path, node_expanded, False))
+    finally:
+        del grid_map  # Drop the views before closing the block
+        memory.close()
+
+
+class PortfolioSolver:
+    """Race several algorithms on one static grid and keep the first acceptable answer.
+
+    The grid is copied into shared memory once and every algorithm gets a
+    long-lived worker process that maps it. solve() sends the query to the
+    workers whose answers are acceptable (accept="optimal" keeps the optimal
+    4-connected searches, without bfs on weighted maps; "any" takes every
+    path, including greedy and 8-connected JPS ones) and returns the first
+    path, or a None once a COMPLETE search has proven there is none. The others are cancelled cooperatively
+    through a shared race counter their searches poll on every expansion,
+    so a worker is free for the next query as soon as it notices.
+
+    With a Predictor the winners are recorded per map key, and once one
+    algorithm reliably wins on this kind of map, solve() runs only that one
+    in-process, without any IPC. Grid edits are not followed; build a new
+    solver after changing the grid.
+
+    A worker that dies (a crash, or the OOM killer) is dropped from the race
+    it was in and restarted; solve() raises RuntimeError only when every
+    worker of a race died before an acceptable answer came in.
+    """
+
+    def __init__(self, grid, algorithms=DEFAULT_PORTFOLIO, predictor=None, map_type=None):
+        for algorithm in algorithms:
+            if algorithm not in ALGORITHMS:
+                raise ValueError(f"Unknown algorithm {algorithm!r}; expected one of {sorted(ALGORITHMS)}")
+        self.map = as_grid_map(grid)
+        self.algorithms = tuple(algorithms)
+        self.predictor = predictor
+        self.key = map_key(self.map, map_type) if predictor is not None else None
+        self.race = 0
+        self.wins = dict.fromkeys(self.algorithms, 0)  # Races won per algorithm by this solver
+        self.solo_runs = 0  # Queries the predictor answered with a single algorithm
+        self.restarts = 0  # Workers restarted after dying
+        self.memory, self.shared = share_grid(self.map)
+        self.cancelled = multiprocessing.RawValue("q", 0)  # Id of the last decided race
+        self.results = multiprocessing.Queue()
+        self.tasks = {}
+        self.workers = {}  # Algorithm -> its worker process
+        for algorithm in self.algorithms:
+            self._spawn(algorithm)
+
+    def _spawn(self, algorithm):
+        # A fresh task queue too: a process killed inside get() can leave the old one locked
+        self.tasks[algorithm] = multiprocessing.Queue()
+        worker = multiprocessing.Process(target=_race_worker, daemon=True,
+                                         args=(algorithm, self.shared, self.tasks[algorithm], self.results, self.cancelled))
+        worker.start()
+        self.workers[algorithm] = worker
+
+    def _restart_dead(self, algorithms):
+        """Restart the workers of `algorithms` that died; returns the ones restarted."""
+        dead = [algorithm for algorithm in algorithms if not self.workers[algorithm].is_alive()]
+        for algorithm in dead:
+            self.workers[algorithm].join()
+            self._spawn(algorithm)
+            self.restarts += 1
+        return dead
+
+    def candidates(self, accept):
+        if accept not in ACCEPT:
+            raise ValueError(f"Unknown acceptance {accept!r}; expected one of {ACCEPT}")
+        if accept == "any":
+            return self.algorithms
+        return tuple(algorithm for algorithm in self.algorithms
+                     if algorithm in OPTIMAL and not (self.map.weighted and algorithm == "bfs"))
+
+    def solve(self, start, goal, accept="optimal"):
+        """Return a RaceResult for one query; `raced` is False when only the predicted winner ran."""
+        candidates = self.candidates(accept)
+        if not candidates:
+            raise ValueError(f"None of {self.algorithms} gives {accept!r} paths")
+        t0 = time.perf_counter()
+        chosen = self.predictor.choose(self.key, accept, candidates) if self.predictor is not None else None
+        if chosen is not None or len(candidates) == 1:
+            algorithm = chosen or candidates[0]
+            cls, method = ALGORITHMS[algorithm]
+            path, node_expanded = getattr(cls(self.map, start, goal), method)()
+            others = tuple(other for other in candidates if other != algorithm)
+            if path is not None or algorithm in COMPLETE or not others:
+                self.solo_runs += 1
+                return RaceResult(path, algorithm, node_expanded, time.perf_counter() - t0, False)
+            candidates = others  # An incomplete search's None proves nothing; ask the others
+
+        self._restart_dead(candidates)
+        self.race += 1
+        race = self.race
+        pending = set(candidates)
+        for algorithm in candidates:
+            self.tasks[algorithm].put((race, start, goal))
+        while True:
+            try:
+                finished, algorithm, path, node_expanded, cancelled = self.results.get(timeout=POLL_INTERVAL)
+            except queue.Empty:
+                # A worker that died mid-search never answers; race on without it
+                pending.difference_update(self._restart_dead(pending))
+                if not pending:
+                    self.cancelled.value = race
+                    raise RuntimeError(f"Every worker racing {start} -> {goal} died: {', '.join(candidates)}")
+                continue
+            if finished != race or cancelled:
+                continue  # A loser of an earlier race reporting in
+            pending.discard(algorithm)
+            if path is not None or algorithm in COMPLETE or not pending:
+                break  # A None only wins once a complete search confirms it
+        self.cancelled.value = race  # Stop the losers
+        self.wins[algorithm] += 1
+        if self.predictor is not None:
+            self.predictor.record(self.key, accept, algorithm)
+        return RaceResult(path, algorithm, node_expanded, time.perf_counter() - t0, True)
+
+    def close(self):
+        """Stop the workers and free the shared grid."""
+        if not self.workers:
+            return
+        self.cancelled.value = self.race
+        for algorithm in self.algorithms:
+            self.tasks[algorithm].put(None)
+        for worker in self.workers.values():
+            worker.join()
+        self.workers = {}
+        self.memory.close()
+        self.memory.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
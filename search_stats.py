@@ -0,0 +1,46 @@
+import time
+
+FIELDS = ("expansions", "pushes", "stale_pops", "peak_open", "peak_closed", "wall_time")
+
+
+class SearchStats:
+    """Counters for one search call; wall_time is in seconds.
+
+    pushes counts open-list insertions (queue appends for bfs), stale_pops
+    the popped entries that were already expanded, and the closed set is
+    the set of expanded cells.
+    """
+
+    __slots__ = FIELDS + ("started",)
+
+    def __init__(self):
+        self.expansions = self.pushes = self.stale_pops = 0
+        self.peak_open = self.peak_closed = 0
+        self.wall_time = 0.0
+        self.started = time.perf_counter()
+
+    def finish(self):
+        self.wall_time = time.perf_counter() - self.started
+        if not self.peak_closed:
+            self.peak_closed = self.expansions  # Searches that reopen cells set it themselves
+        return self
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in FIELDS}
+
+    def __repr__(self):
+        return "SearchStats(" + ", ".join(f"{name}={getattr(self, name)!r}" for name in FIELDS) + ")"
+
+
+class SearchHooks:
+    """Optional per-search callbacks; a hook left as None costs one check.
+
+    on_expand(pos) fires when a cell is expanded, on_push(pos, priority)
+    when it enters the open list and on_path(path) once with the result
+    (None when there is no path).
+    """
+
+    def __init__(self, on_expand=None, on_push=None, on_path=None):
+        self.on_expand = on_expand
+        self.on_push = on_push
+        self.on_path = on_path
@@ -0,0 +1,241 @@
+import asyncio
+import functools
+import heapq
+import itertools
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from batch import ALGORITHMS, attach_grid, share_grid
+from grid import as_grid_map
+from path_cache import OPTIMAL
+
+LATENCY_WINDOW = 4096  # Recent request latencies kept for the percentiles
+
+_worker_grid = None  # GridMap view of the shared grid inside each worker process
+_worker_memory = None
+
+
+def _attach(shared):
+    """Executor initializer: map the shared grid once per worker process."""
+    global _worker_grid, _worker_memory
+    _worker_grid, _worker_memory = attach_grid(*shared)
+
+
+def _solve(goal, starts, algorithm, use_field, grid_map=None):
+    """Executor job: paths from every start to one goal, from one distance field or one search each."""
+    grid_map = grid_map or _worker_grid
+    if use_field:
+        from distance_field import cache_for  # NumPy is only needed for fields
+        field = cache_for(grid_map).field(goal)
+        return [field.path(start) for start in starts]
+    cls, method = ALGORITHMS[algorithm]
+    return [getattr(cls(grid_map, start, goal), method)()[0] for start in starts]
+
+
+def _percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+class PathService:
+    """asyncio front end that answers path queries on one static grid off the event loop.
+
+    Searches run in a process pool over a shared-memory copy of the grid
+    (workers=0 runs them in one background thread instead). Queries wait
+    in a priority queue, lower priority values first, and at most `workers`
+    jobs are in flight. Work is coalesced twice:
+
+    - an identical (start, goal) query that is queued or in flight just
+      waits for the same result;
+    - when a job is dispatched it takes every queued query with its goal.
+      With field_threshold or more starts, and an optimal 4-connected
+      algorithm on an unweighted grid, they are answered from one
+      DistanceField towards the goal (one search for all of them).
+
+    A query's deadline (seconds) bounds how long its caller waits and
+    raises asyncio.TimeoutError when missed; a query nobody waits for any
+    more is dropped before it reaches a worker. metrics() reports queue
+    depth, in-flight jobs, coalescing counts and latency percentiles.
+    close() fails every query still waiting with a RuntimeError. Grid edits
+    are not followed; start a new service after changing the grid.
+    """
+
+    def __init__(self, grid, algorithm="a_star", workers=None, field_threshold=4):
+        if algorithm not in ALGORITHMS:
+            raise ValueError(f"Unknown algorithm {algorithm!r}; expected one of {sorted(ALGORITHMS)}")
+        self.map = as_grid_map(grid)
+        self.algorithm = algorithm
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self.field_threshold = field_threshold
+        self.fields = algorithm in OPTIMAL and not self.map.weighted  # Fields give unit-cost shortest paths
+        self.queued = {}  # goal -> {start: future} waiting to be dispatched
+        self.in_flight = {}  # (start, goal) -> future of a running job
+        self.waiting = {}  # (start, goal) -> callers still awaiting it
+        self.heap = []  # (priority, sequence, start, goal); stale entries are skipped
+        self.sequence = itertools.count()
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+        self.requests = self.coalesced = self.jobs = self.searched = self.field_jobs = 0
+        self.deadline_misses = self.dropped = 0
+        self.running_jobs = 0
+        self.executor = self.memory = self.grid_arg = self._dispatcher = None
+        self._jobs = set()  # Running job tasks; the loop itself only keeps weak references
+
+    async def start(self):
+        if self.workers:
+            self.memory, shared = share_grid(self.map)
+            self.executor = ProcessPoolExecutor(self.workers, initializer=_attach, initargs=(shared,))
+        else:
+            self.executor = ThreadPoolExecutor(1)  # One thread: fields and searches stay single-threaded
+            self.grid_arg = self.map
+        self._ready = asyncio.Event()
+        self._slots = asyncio.Semaphore(max(self.workers, 1))
+        self._dispatcher = asyncio.create_task(self._dispatch())
+        return self
+
+    async def close(self):
+        """Stop the service; callers of queued or running queries get a RuntimeError."""
+        if self._dispatcher is None:
+            return
+        self._dispatcher.cancel()
+        self._dispatcher = None
+        error = RuntimeError("PathService closed before answering")
+        pending = [(start, goal, future) for goal, starts in self.queued.items() for start, future in starts.items()]
+        pending += [(start, goal, future) for (start, goal), future in self.in_flight.items()]
+        for start, goal, future in pending:
+            if future.done():
+                continue
+            if self.waiting.get((start, goal)):
+                future.set_exception(error)
+            else:
+                future.cancel()  # Nobody to tell
+        self.queued.clear()
+        self.heap.clear()
+        for task in self._jobs:
+            task.cancel()  # Their searches finish in the executor, unobserved
+        await asyncio.gather(*self._jobs, return_exceptions=True)
+        # Waiting for the running searches would block the loop; do it from a thread
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, functools.partial(self.executor.shutdown, wait=True, cancel_futures=True))
+        if self.memory is not None:
+            self.memory.close()
+            self.memory.unlink()
+            self.memory = None
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def find_path(self, start, goal, priority=0, deadline=None):
+        """Path from `start` to `goal` (a list of (row, col), or None when there is none)."""
+        if self._dispatcher is None:
+            raise RuntimeError("PathService is not running; use start() or async with")
+        start, goal = tuple(start), tuple(goal)
+        key = (start, goal)
+        t0 = time.perf_counter()
+        self.requests += 1
+        future = self.in_flight.get(key) or self.queued.get(goal, {}).get(start)
+        if future is not None:
+            self.coalesced += 1
+            if key not in self.in_flight:
+                heapq.heappush(self.heap, (priority, next(self.sequence), start, goal))  # May run it sooner
+        else:
+            future = asyncio.get_running_loop().create_future()
+            self.queued.setdefault(goal, {})[start] = future
+            heapq.heappush(self.heap, (priority, next(self.sequence), start, goal))
+        self._ready.set()
+        self.waiting[key] = self.waiting.get(key, 0) + 1
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), deadline)
+        except asyncio.TimeoutError:
+            self.deadline_misses += 1
+            raise
+        finally:
+            self.waiting[key] -= 1
+            if not self.waiting[key]:
+                del self.waiting[key]
+            self.latencies.append(time.perf_counter() - t0)
+
+    def metrics(self):
+        latencies = sorted(self.latencies)
+        return {
+            "queue_depth": sum(len(starts) for starts in self.queued.values()),
+            "in_flight": self.running_jobs,
+            "requests": self.requests,
+            "coalesced": self.coalesced,
+            "jobs": self.jobs,
+            "field_jobs": self.field_jobs,
+            "searched": self.searched,
+            "deadline_misses": self.deadline_misses,
+            "dropped": self.dropped,
+            "p50_ms": _percentile(latencies, 0.5) * 1000,
+            "p95_ms": _percentile(latencies, 0.95) * 1000,
+            "p99_ms": _percentile(latencies, 0.99) * 1000,
+        }
+
+    async def _dispatch(self):
+        while True:
+            if not self.heap:
+                self._ready.clear()
+                await self._ready.wait()
+                continue
+            await self._slots.acquire()
+            job = self._next_job()
+            if job is None:
+                self._slots.release()
+                continue
+            task = asyncio.create_task(self._run(*job))
+            self._jobs.add(task)
+            task.add_done_callback(self._jobs.discard)
+
+    def _next_job(self):
+        """Pop the best queued query and every other query for its goal it can share a job with."""
+        while self.heap:
+            _, _, start, goal = heapq.heappop(self.heap)
+            starts = self.queued.get(goal)
+            if starts is None or start not in starts:
+                continue  # Already dispatched with an earlier entry
+            batch = {}
+            candidates = list(starts) if self.fields else [start]
+            for other in candidates:
+                future = starts.pop(other)
+                if self.waiting.get((other, goal)):
+                    batch[other] = future
+                else:
+                    self.dropped += 1  # Every caller gave up (deadline) before it ran
+                    future.cancel()
+            if not starts:
+                del self.queued[goal]
+            if batch:
+                for other, future in batch.items():
+                    self.in_flight[(other, goal)] = future
+                return goal, batch
+        return None
+
+    async def _run(self, goal, batch):
+        starts = list(batch)
+        use_field = self.fields and len(starts) >= self.field_threshold
+        self.jobs += 1
+        self.running_jobs += 1
+        self.field_jobs += use_field
+        self.searched += len(starts)
+        try:
+            loop = asyncio.get_running_loop()
+            paths = await loop.run_in_executor(self.executor, _solve, goal, starts, self.algorithm, use_field, self.grid_arg)
+        except Exception as error:
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(error)
+        else:
+            for start, path in zip(starts, paths):
+                if not batch[start].done():
+                    batch[start].set_result(path)
+        finally:
+            for start in starts:
+                self.in_flight.pop((start, goal), None)
+            self.running_jobs -= 1
+            self._slots.release()
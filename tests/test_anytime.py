@@ -0,0 +1,142 @@
+"""ARA*: the rounds end on an optimal path, and a budget keeps the last completed one."""
+import random
+
+import pytest
+
+from benchmarks.maps import free_cells, random_map
+from jumpstart import DIAGONAL_COST, STRAIGHT_COST, JumpStart
+from pathfinding import Pathfinding
+from search_stats import SearchHooks
+
+SIZE = 16
+
+
+def path_cost(grid, path, weighted):
+    for (r1, c1), (r2, c2) in zip(path, path[1:]):
+        assert abs(r1 - r2) + abs(c1 - c2) == 1 and grid[r2][c2] != -1
+    if not weighted:
+        return len(path) - 1
+    return sum(max(1, min(grid[row][col], 255)) for row, col in path[1:])
+
+
+def octile_cost(grid, path):
+    total = 0
+    for (r1, c1), (r2, c2) in zip(path, path[1:]):
+        assert max(abs(r1 - r2), abs(c1 - c2)) == 1 and grid[r2][c2] != -1
+        total += DIAGONAL_COST if r1 != r2 and c1 != c2 else STRAIGHT_COST
+    return total
+
+
+def make_grid(seed, weighted):
+    rnd = random.Random(seed)
+    grid = random_map(SIZE, 0.25, seed)
+    if weighted:
+        grid = [[v if v == -1 else rnd.choice((1, 1, 2, 5, 9)) for v in row] for row in grid]
+    return grid, rnd
+
+
+@pytest.mark.parametrize("open_list", ["heapq", "dial"])
+@pytest.mark.parametrize("weighted", [False, True])
+@pytest.mark.parametrize("seed", range(4))
+def test_anytime_a_star_ends_optimal(seed, weighted, open_list):
+    grid, rnd = make_grid(seed, weighted)
+    free = free_cells(grid)
+    for _ in range(25):
+        start, goal = rnd.choice(free), rnd.choice(free)
+        search = Pathfinding(grid, start, goal, weighted=weighted, open_list=open_list)
+        path, _ = search.anytime_a_star(weight=rnd.choice((1.0, 2.0, 3.5)), step=rnd.choice((0.5, 1.0)))
+        reference, _ = Pathfinding(grid, start, goal, weighted=weighted).a_star()
+        assert (path is None) == (reference is None), (start, goal)
+        if path is None:
+            assert search.bound is None
+            continue
+        assert search.bound == 1.0
+        assert path[0] == start and path[-1] == goal
+        assert path_cost(grid, path, weighted) == path_cost(grid, reference, weighted), (start, goal)
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_anytime_jump_point_search_ends_optimal(seed):
+    grid, rnd = make_grid(seed, False)
+    free = free_cells(grid)
+    for _ in range(25):
+        start, goal = rnd.choice(free), rnd.choice(free)
+        search = JumpStart(grid, start, goal)
+        path, _ = search.anytime_jump_point_search(weight=rnd.choice((1.0, 2.0, 3.5)))
+        reference, _ = JumpStart(grid, start, goal).jump_point_search()
+        assert (path is None) == (reference is None), (start, goal)
+        if path is not None:
+            assert search.bound == 1.0
+            assert octile_cost(grid, path) == octile_cost(grid, reference), (start, goal)
+
+
+def rounds(search, run):
+    """(expansions so far, path) for every round an unbudgeted run completes."""
+    expanded, completed = [0], []
+    search.hooks = SearchHooks(on_expand=lambda pos: expanded.__setitem__(0, expanded[0] + 1))
+    build = search._path
+
+    def record(came_from, cost=None):
+        path = build(came_from, cost)
+        completed.append((expanded[0], path))
+        return path
+
+    search._path = record
+    run(search)
+    return completed
+
+
+@pytest.mark.parametrize("weighted", [False, True])
+@pytest.mark.parametrize("seed", range(4))
+def test_budget_returns_last_completed_path(seed, weighted):
+    grid, rnd = make_grid(seed, weighted)
+    free = free_cells(grid)
+    checked = 0
+    for _ in range(15):
+        start, goal = rnd.choice(free), rnd.choice(free)
+        completed = rounds(Pathfinding(grid, start, goal, weighted=weighted),
+                           lambda search: search.anytime_a_star(weight=4.0, step=1.0))
+        if not completed:
+            continue
+        optimal = path_cost(grid, completed[-1][1], weighted)
+        for budget in sorted({0, 1, completed[0][0], completed[-1][0]} | {rnd.randrange(completed[-1][0] + 1)}):
+            search = Pathfinding(grid, start, goal, weighted=weighted)
+            path, expanded = search.anytime_a_star(weight=4.0, step=1.0, max_expansions=budget)
+            assert expanded <= budget
+            finished = [round_path for count, round_path in completed if count <= budget]
+            assert path == (finished[-1] if finished else None), (start, goal, budget)
+            if path is None:
+                assert search.bound is None
+            else:
+                assert 1.0 <= search.bound <= 4.0
+                assert path_cost(grid, path, weighted) <= search.bound * optimal + 1e-9
+            checked += 1
+    assert checked
+
+
+def test_time_budget_keeps_a_path_or_none():
+    grid, rnd = make_grid(0, False)
+    free = free_cells(grid)
+    for _ in range(10):
+        start, goal = rnd.choice(free), rnd.choice(free)
+        search = Pathfinding(grid, start, goal)
+        path, expanded = search.anytime_a_star(time_budget=0.0)
+        assert path is None and search.bound is None and expanded == 0
+        search = JumpStart(grid, start, goal)
+        path, expanded = search.anytime_jump_point_search(time_budget=0.0)
+        assert path is None and search.bound is None and expanded == 0
+
+
+@pytest.mark.parametrize("weight, step", [(0.5, 0.5), (3.0, 0.0), (3.0, -1.0)])
+def test_bad_schedule_raises(weight, step):
+    grid = random_map(SIZE, 0.0, 0)
+    with pytest.raises(ValueError):
+        Pathfinding(grid, (0, 0), (5, 5)).anytime_a_star(weight=weight, step=step)
+    with pytest.raises(ValueError):
+        JumpStart(grid, (0, 0), (5, 5)).anytime_jump_point_search(weight=weight, step=step)
+
+
+def test_monotone_open_list_raises():
+    grid = random_map(SIZE, 0.0, 0)
+    with pytest.raises(ValueError):
+        Pathfinding(grid, (0, 0), (5, 5), open_list="radix").anytime_a_star()
@@ -0,0 +1,53 @@
+"""bidirectional_a_star must find paths exactly as cheap as a_star."""
+import random
+
+import pytest
+
+from benchmarks.maps import random_map
+from pathfinding import Pathfinding
+
+SIZE = 14
+
+
+def path_cost(grid, path, weighted):
+    if not weighted:
+        return len(path) - 1
+    return sum(max(1, min(grid[row][col], 255)) for row, col in path[1:])
+
+
+@pytest.mark.parametrize("weighted", [False, True])
+@pytest.mark.parametrize("seed", range(5))
+def test_costs_match_a_star(seed, weighted):
+    rnd = random.Random(seed)
+    grid = random_map(SIZE, 0.3, seed)
+    if weighted:
+        grid = [[v if v == -1 else rnd.choice((1, 1, 2, 5, 9)) for v in row] for row in grid]
+    cells = [(row, col) for row in range(SIZE) for col in range(SIZE)]
+    for _ in range(40):
+        start, goal = rnd.choice(cells), rnd.choice(cells)  # Either may be an obstacle
+        path, _ = Pathfinding(grid, start, goal, weighted=weighted).bidirectional_a_star()
+        reference, _ = Pathfinding(grid, start, goal, weighted=weighted).a_star()
+        assert (path is None) == (reference is None), (start, goal)
+        if path is None:
+            continue
+        assert path[0] == start and path[-1] == goal
+        for (r1, c1), (r2, c2) in zip(path, path[1:]):
+            assert abs(r1 - r2) + abs(c1 - c2) == 1 and grid[r2][c2] != -1
+        assert path_cost(grid, path, weighted) == path_cost(grid, reference, weighted), (start, goal)
+
+
+def test_blocked_goal():
+    grid = [[0, 0, 0, 0], [0, 0, 0, 0], [0, 0, 0, -1]]
+    search = Pathfinding(grid, (0, 0), (2, 3))
+    assert search.bidirectional_a_star() == (None, 0)
+    assert search.expanded == {"forward": 0, "backward": 0}
+
+
+def test_expanded_is_per_search():
+    search = Pathfinding(random_map(SIZE, 0.2, 1), (0, 0), (0, 0))
+    assert search.expanded is None
+    search.goal = (0, 3)
+    search.bidirectional_a_star()
+    assert sum(search.expanded.values()) == search.stats.expansions
+    search.a_star()
+    assert search.expanded is None
@@ -0,0 +1,88 @@
+"""ChunkedGrid under eviction and edits, against a dense GridMap of the same cells."""
+import random
+
+import pytest
+
+from chunked import BLOCKED, FREE, ChunkedGrid
+from grid import GridMap
+from pathfinding import Pathfinding
+
+
+def make_loader(grid, size):
+    def loader(chunk_row, chunk_col):
+        rows = [row[chunk_col * size:(chunk_col + 1) * size] for row in grid[chunk_row * size:(chunk_row + 1) * size]]
+        cells = [value for row in rows for value in row]
+        if rows and all(value == -1 for value in cells):
+            return BLOCKED
+        if rows and all(value == 0 for value in cells) and len(cells) == size * size:
+            return FREE
+        return rows
+    return loader
+
+
+def make_grid(rnd, rows, cols, weighted):
+    grid = [[-1 if rnd.random() < 0.25 else (rnd.choice((1, 2, 5)) if weighted else 0) for _ in range(cols)]
+            for _ in range(rows)]
+    for r in range(min(rows, 6)):
+        grid[r][:6] = [-1] * len(grid[r][:6])  # A blocked chunk
+    for r in range(rows - 6, rows):
+        grid[r][cols - 6:] = [0] * 6  # A free one
+    return grid
+
+
+def assert_same_cells(dense, chunked):
+    for row in range(dense.rows):
+        for col in range(dense.cols):
+            cell = dense.cell_id((row, col))
+            assert chunked.passable[cell] == dense.passable[cell], (row, col)
+            assert chunked.masks[cell] == dense.masks[cell], (row, col)
+            assert chunked.costs[cell] == dense.costs[cell], (row, col)
+
+
+def cost(grid_map, path):
+    return None if path is None else sum(grid_map.costs[grid_map.cell_id(pos)] for pos in path[1:])
+
+
+@pytest.mark.parametrize("weighted", [False, True])
+@pytest.mark.parametrize("seed", range(4))
+def test_edits_and_eviction_match_dense(seed, weighted):
+    rnd = random.Random(seed)
+    rows, cols = rnd.randint(18, 30), rnd.randint(18, 30)
+    grid = make_grid(rnd, rows, cols, weighted)
+    dense = GridMap.from_lists(grid, weighted)
+    chunked = ChunkedGrid(rows, cols, make_loader(grid, 6), chunk_size=6, max_chunks=2, weighted=weighted)
+    assert_same_cells(dense, chunked)
+    assert chunked.evictions  # Two chunks cannot hold the map
+    cells = [(row, col) for row in range(rows) for col in range(cols)]
+    for _ in range(12):
+        changes = [(row, col, rnd.choice((-1, 0, 3))) for row, col in rnd.sample(cells, rnd.randint(1, 5))]
+        changed = chunked.update_cells(changes)
+        assert dense.update_cells(changes) == changed
+        assert dense.version == chunked.version
+        assert len(chunked.chunks) <= chunked.max_chunks
+        # Changed chunks are pinned: the loader would hand back the old cells
+        edited = {(row // 6, col // 6) for row, col in map(chunked.position, changed)}
+        assert edited <= set(chunked.edited)
+        assert_same_cells(dense, chunked)
+        for _ in range(3):
+            start, goal = rnd.choice(cells), rnd.choice(cells)
+            expected, _ = Pathfinding(dense, start, goal, weighted).a_star()
+            path, _ = Pathfinding(chunked, start, goal, weighted).a_star()
+            assert (path is None) == (expected is None) and cost(chunked, path) == cost(dense, expected)
+    assert_same_cells(dense, chunked)  # After many more evictions
+
+
+def test_uniform_chunks_stay_out_of_the_lru():
+    grid = [[0] * 12 for _ in range(12)]
+    for r in range(6):
+        grid[r][:6] = [-1] * 6
+    grid[8][8] = -1
+    chunked = ChunkedGrid(12, 12, make_loader(grid, 6), chunk_size=6, max_chunks=1)
+    for row in range(12):
+        for col in range(12):
+            chunked.is_passable((row, col))
+    assert chunked.uniform == {(0, 0): 0, (0, 1): 1, (1, 0): 1}
+    assert list(chunked.chunks) == [(1, 1)] and chunked.evictions == 0
+    chunked.update_cells([(0, 0, 0)])  # Editing a uniform chunk materializes and pins it
+    assert (0, 0) in chunked.edited and (0, 0) not in chunked.uniform
+    assert chunked.is_passable((0, 0)) and not chunked.is_passable((0, 1))
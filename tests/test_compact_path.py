@@ -0,0 +1,98 @@
+"""CompactPath indexing, length and cost against the list path it encodes."""
+import random
+
+import pytest
+
+from benchmarks.maps import free_cells, random_map
+from compact_path import CompactPath
+from grid import GridMap
+from jumpstart import JumpStart
+from pathfinding import Pathfinding
+
+SIZE = 20
+METHODS = ["a_star", "bfs", "greedy_best_first_search", "bidirectional_a_star", "d_star", "anytime_a_star"]
+
+
+def cost(grid_map, path):
+    return sum(grid_map.costs[grid_map.cell_id(pos)] for pos in path[1:])
+
+
+def assert_encodes(compact, path):
+    assert isinstance(compact, CompactPath)
+    assert len(compact) == len(path) and list(compact) == path and compact == path
+    assert compact.start == path[0] and compact.goal == path[-1]
+    assert [compact[i] for i in range(-len(path), len(path))] == path + path
+    for i in (len(path), -len(path) - 1):
+        with pytest.raises(IndexError):
+            compact[i]
+    assert compact[1:len(path) - 1:2] == path[1:len(path) - 1:2] and compact[::-1] == path[::-1]
+    assert set(compact.waypoints()) <= set(path)
+
+
+@pytest.mark.parametrize("weighted", [False, True])
+@pytest.mark.parametrize("seed", range(4))
+def test_searches_encode_their_list_paths(seed, weighted):
+    rnd = random.Random(seed)
+    grid = random_map(SIZE, 0.25, seed)
+    if weighted:
+        grid = [[v if v == -1 else rnd.choice((0, 1, 2, 6)) for v in row] for row in grid]
+    grid_map = GridMap.from_lists(grid, weighted)
+    free = free_cells(grid)
+    for _ in range(8):
+        start, goal = rnd.choice(free), rnd.choice(free)
+        for method in METHODS:
+            path, expanded = getattr(Pathfinding(grid_map, start, goal, weighted), method)()
+            compact, compact_expanded = getattr(Pathfinding(grid_map, start, goal, weighted, compact=True), method)()
+            assert expanded == compact_expanded
+            if path is None:
+                assert compact is None
+                continue
+            assert_encodes(compact, path)
+            assert compact.cost == cost(grid_map, path), method
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_jump_points_expand_to_the_walk(seed):
+    rnd = random.Random(seed)
+    grid = random_map(SIZE, 0.2, seed)
+    free = free_cells(grid)
+    for _ in range(10):
+        start, goal = rnd.choice(free), rnd.choice(free)
+        path, _ = JumpStart(grid, start, goal).jump_point_search()
+        compact, _ = JumpStart(grid, start, goal, compact=True).jump_point_search()
+        if path is None:
+            assert compact is None
+            continue
+        assert_encodes(compact, path)
+        octile = sum(14 if a[0] != b[0] and a[1] != b[1] else 10 for a, b in zip(path, path[1:]))
+        assert compact.cost == octile
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_random_walks_round_trip(seed):
+    """Arbitrary 8-connected walks, including reversals and repeated cells."""
+    rnd = random.Random(seed)
+    grid_map = GridMap.from_lists([[0] * SIZE for _ in range(SIZE)])
+    for _ in range(30):
+        row, col = rnd.randrange(SIZE), rnd.randrange(SIZE)
+        path = [(row, col)]
+        for _ in range(rnd.randint(0, 40)):
+            dr, dc = rnd.choice([(dr, dc) for dr in (-1, 0, 1) for dc in (-1, 0, 1) if dr or dc])
+            if 0 <= row + dr < SIZE and 0 <= col + dc < SIZE:
+                row, col = row + dr, col + dc
+                path.append((row, col))
+        compact = CompactPath.from_positions(grid_map, path)
+        assert_encodes(compact, path)
+        assert compact.cost == len(path) - 1
+        reverse = CompactPath.from_cells(grid_map, [grid_map.cell_id(pos) for pos in reversed(path)], reverse=True)
+        assert reverse == compact and reverse.cost == compact.cost
+
+
+def test_to_numpy():
+    np = pytest.importorskip("numpy")
+    grid_map = GridMap.from_lists([[0] * 6 for _ in range(6)])
+    path = [(0, 0), (0, 1), (0, 2), (1, 3), (2, 4), (3, 4), (4, 4)]
+    compact = CompactPath.from_positions(grid_map, path)
+    assert compact.to_numpy().tolist() == [list(pos) for pos in compact.waypoints()]
+    assert np.shares_memory(compact.to_numpy(), np.frombuffer(compact.points, dtype=np.int32))
+    assert compact.to_numpy(expand=True).tolist() == [list(pos) for pos in path]
@@ -0,0 +1,63 @@
+"""ComponentIndex after random edits must match an index built from scratch."""
+import random
+
+import pytest
+
+from benchmarks.maps import random_map
+from components import ComponentIndex
+from grid import GridMap
+
+
+def assert_same_components(index, grid_map):
+    fresh = ComponentIndex(grid_map, index.diagonal)
+    pairs = {}  # Incremental root -> fresh label; must be one-to-one
+    for cell in range(grid_map.size):
+        if not grid_map.passable[cell]:
+            assert not index.labels[cell], grid_map.position(cell)
+            continue
+        assert index.labels[cell], grid_map.position(cell)
+        root = index.find(index.labels[cell])
+        assert pairs.setdefault(root, fresh.labels[cell]) == fresh.labels[cell], grid_map.position(cell)
+    assert len(set(pairs.values())) == len(pairs)
+
+
+@pytest.mark.parametrize("diagonal", [False, True])
+@pytest.mark.parametrize("seed", range(6))
+def test_random_edits_match_rebuild(seed, diagonal):
+    rnd = random.Random(seed)
+    grid_map = GridMap.from_lists(random_map(20, 0.35, seed))
+    index = ComponentIndex(grid_map, diagonal)
+    for _ in range(80):
+        # Batches mix new walls and openings, so splits and merges land in one refresh
+        changes = [(rnd.randrange(20), rnd.randrange(20), rnd.choice((-1, 0))) for _ in range(rnd.randint(1, 5))]
+        grid_map.update_cells(changes)
+        index.refresh()
+        assert_same_components(index, grid_map)
+
+
+@pytest.mark.parametrize("diagonal", [False, True])
+def test_wall_splits_and_door_merges(diagonal):
+    grid_map = GridMap.from_lists([[0] * 9 for _ in range(7)])
+    index = ComponentIndex(grid_map, diagonal)
+    grid_map.update_cells([(row, 4, -1) for row in range(7)])
+    assert not index.connected((3, 0), (3, 8))
+    assert_same_components(index, grid_map)
+    grid_map.update_cells([(6, 4, 0)])
+    assert index.connected((0, 0), (0, 8))
+    assert_same_components(index, grid_map)
+    # Cutting off a single cell in the corner, then the door again
+    grid_map.update_cells([(0, 1, -1), (1, 0, -1), (1, 1, -1), (6, 4, -1)])
+    assert not index.connected((0, 0), (3, 3))
+    assert not index.connected((3, 3), (3, 8))
+    assert_same_components(index, grid_map)
+
+
+def test_trimmed_change_log_rebuilds():
+    grid_map = GridMap.from_lists(random_map(12, 0.3, 1))
+    index = ComponentIndex(grid_map)
+    rnd = random.Random(1)
+    for _ in range(GridMap.CHANGE_LOG_LIMIT + 10):
+        row, col = rnd.randrange(12), rnd.randrange(12)
+        grid_map.update_cells([(row, col, -1 if grid_map.is_passable((row, col)) else 0)])
+    index.refresh()
+    assert_same_components(index, grid_map)
@@ -0,0 +1,52 @@
+"""DistanceField.refresh after random edits must match a field built from scratch."""
+import random
+
+import pytest
+
+from benchmarks.maps import random_map
+from distance_field import NO_FLOW, DistanceField
+from grid import UNSEEN, GridMap
+
+SIZE = 20
+
+
+def assert_matches_rebuild(field, grid_map):
+    fresh = DistanceField(grid_map, grid_map.position(field.goal))
+    cells = fresh.cells
+    assert (field.distances[cells] == fresh.distances[cells]).all()
+    # Ties may point different ways; each flow step just has to go one step downhill
+    for cell in cells.tolist():
+        distance = int(field.distances[cell])
+        if distance == 0 or distance >= UNSEEN:
+            assert field.flow[cell] == NO_FLOW, grid_map.position(cell)
+        else:
+            step = cell + grid_map.offsets4[field.flow[cell]]
+            assert field.distances[step] == distance - 1, grid_map.position(cell)
+
+
+@pytest.mark.parametrize("seed", range(6))
+def test_refresh_matches_rebuild(seed):
+    rnd = random.Random(seed)
+    grid_map = GridMap.from_lists(random_map(SIZE, 0.3, seed))
+    field = DistanceField(grid_map, (SIZE // 2, SIZE // 2))
+    for _ in range(60):
+        # The goal itself may be blocked and freed again too
+        changes = [(rnd.randrange(SIZE), rnd.randrange(SIZE), rnd.choice((-1, 0))) for _ in range(rnd.randint(1, 5))]
+        grid_map.update_cells(changes)
+        field.refresh()
+        assert_matches_rebuild(field, grid_map)
+
+
+def test_cut_and_reopen_corridor():
+    grid = [[-1] * 9 for _ in range(3)]
+    grid[1] = [0] * 9
+    grid_map = GridMap.from_lists(grid)
+    field = DistanceField(grid_map, (1, 8))
+    assert field.distance((1, 0)) == 8
+    grid_map.update_cells([(1, 4, -1)])
+    assert field.distance((1, 0)) is None and field.path((1, 0)) is None
+    assert_matches_rebuild(field, grid_map)
+    grid_map.update_cells([(1, 4, 0), (0, 3, 0), (0, 4, 0), (0, 5, 0), (1, 4, -1)])
+    assert field.distance((1, 0)) == 10
+    assert field.path((1, 0))[-1] == (1, 8)
+    assert_matches_rebuild(field, grid_map)
@@ -0,0 +1,110 @@
+"""D* Lite repairs after random edits must cost the same as a fresh A* search."""
+import random
+
+import pytest
+
+from benchmarks.maps import random_map
+from dstar_lite import DStarLite
+from grid import GridMap
+from pathfinding import Pathfinding
+
+SIZE = 16
+
+
+def path_cost(grid, path, weighted):
+    if not weighted:
+        return len(path) - 1
+    return sum(max(1, min(grid[row][col], 255)) for row, col in path[1:])
+
+
+def assert_walkable(grid, path, start, goal):
+    assert path[0] == start and path[-1] == goal
+    for (r1, c1), (r2, c2) in zip(path, path[1:]):
+        assert abs(r1 - r2) + abs(c1 - c2) == 1
+        assert grid[r2][c2] != -1
+
+
+@pytest.mark.parametrize("weighted", [False, True])
+@pytest.mark.parametrize("seed", range(6))
+def test_repairs_match_fresh_search(seed, weighted):
+    rnd = random.Random(seed)
+    grid = random_map(SIZE, 0.25, seed)
+    if weighted:
+        grid = [[v if v == -1 else rnd.choice((1, 1, 2, 5, 9)) for v in row] for row in grid]
+    start, goal = (0, 0), (SIZE - 1, SIZE - 1)
+    grid[0][0] = grid[SIZE - 1][SIZE - 1] = 1
+    planner = Pathfinding(grid, start, goal, weighted=weighted)
+    for step in range(60):
+        path, _ = planner.d_star()
+        fresh, _ = Pathfinding([row[:] for row in grid], planner.start, goal, weighted=weighted).a_star()
+        assert (path is None) == (fresh is None), step
+        if path is not None:
+            assert_walkable(grid, path, planner.start, goal)
+            assert path_cost(grid, path, weighted) == path_cost(grid, fresh, weighted), step
+            if len(path) > 1 and rnd.random() < 0.3:
+                planner.start = path[1]  # The agent moves on; keys carry over through km
+        changes = []
+        for _ in range(rnd.randint(1, 4)):
+            row, col = rnd.randrange(SIZE), rnd.randrange(SIZE)
+            if (row, col) not in (planner.start, goal):
+                changes.append((row, col, rnd.choice((-1, -1, 0, 1, 3, 9)) if weighted else rnd.choice((-1, 0))))
+        planner.update_cells(changes)
+
+
+def test_repair_expands_less_than_first_plan():
+    grid = random_map(40, 0.2, 3)
+    grid[0][0] = grid[39][39] = 0
+    planner = Pathfinding(grid, (0, 0), (39, 39))
+    path, first = planner.d_star()
+    assert path is not None
+    row, col = path[len(path) // 2]
+    planner.update_cells([(row, col, -1)])
+    repaired, again = planner.d_star()
+    fresh, _ = Pathfinding(grid, (0, 0), (39, 39)).a_star()
+    assert (repaired is None) == (fresh is None)
+    if repaired is not None:
+        assert len(repaired) == len(fresh)
+    assert again < first
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_edits_by_another_editor(seed):
+    rnd = random.Random(seed)
+    grid_map = GridMap.from_lists(random_map(SIZE, 0.25, seed))
+    start, goal = (0, 0), (SIZE - 1, SIZE - 1)
+    grid_map.update_cells([(0, 0, 0), (SIZE - 1, SIZE - 1, 0)])
+    planner, other = Pathfinding(grid_map, start, goal), Pathfinding(grid_map, goal, start)
+    for step in range(40):
+        path, _ = planner.d_star()
+        fresh, _ = Pathfinding(grid_map, start, goal).a_star()
+        assert (path is None) == (fresh is None), step
+        if path is not None:
+            assert len(path) == len(fresh), step
+        changes = [(rnd.randrange(SIZE), rnd.randrange(SIZE), rnd.choice((-1, 0))) for _ in range(3)]
+        changes = [change for change in changes if change[:2] not in (start, goal)]
+        if step % 2:
+            other.update_cells(changes)  # Another planner on the same GridMap
+        else:
+            grid_map.update_cells(changes)
+
+
+def test_trimmed_change_log_replans():
+    grid_map = GridMap.from_lists([[0] * 6 for _ in range(4)])
+    planner = Pathfinding(grid_map, (0, 0), (3, 5))
+    assert len(planner.d_star()[0]) == 9
+    for _ in range(GridMap.CHANGE_LOG_LIMIT // 2 + 1):
+        grid_map.update_cells([(1, 2, -1)])
+        grid_map.update_cells([(1, 2, 0)])
+    grid_map.update_cells([(row, 2, -1) for row in range(3)])
+    path, _ = planner.d_star()
+    assert path[-1] == (3, 5) and len(path) == 9 and (3, 2) in path
+
+
+def test_extract_path_stops_on_stale_values():
+    grid_map = GridMap.from_lists([[0] * 5 for _ in range(5)])
+    planner = DStarLite(grid_map, (0, 0), (4, 4))
+    assert planner.plan()[0] is not None
+    # Wall off the goal behind the planner's back: the old g-values now lead nowhere
+    grid_map.update_cells([(3, 4, -1), (4, 3, -1), (3, 3, -1)])
+    assert planner.extract_path() is None
+    assert planner.plan()[0] is None
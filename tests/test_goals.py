@@ -0,0 +1,108 @@
+"""nearest_goals against one search per goal, with k > 1 and goal weights."""
+import random
+
+import pytest
+
+from benchmarks.maps import free_cells, random_map
+from goals import GoalIndex
+from grid import GridMap
+from jumpstart import DIAGONAL_COST, STRAIGHT_COST, JumpStart
+from pathfinding import Pathfinding
+
+SIZE = 18
+
+
+def octile_cost(grid, path):
+    total = 0
+    for (r1, c1), (r2, c2) in zip(path, path[1:]):
+        assert max(abs(r1 - r2), abs(c1 - c2)) == 1 and grid[r2][c2] != -1
+        total += DIAGONAL_COST if r1 != r2 and c1 != c2 else STRAIGHT_COST
+    return total
+
+
+def path_cost(grid, path, weighted):
+    for (r1, c1), (r2, c2) in zip(path, path[1:]):
+        assert abs(r1 - r2) + abs(c1 - c2) == 1 and grid[r2][c2] != -1
+    if not weighted:
+        return len(path) - 1
+    return sum(max(1, min(grid[row][col], 255)) for row, col in path[1:])
+
+
+def queries(seed, weighted=False):
+    """(grid, start, goals, weights, k) tuples; goals may repeat or be obstacles."""
+    rnd = random.Random(seed)
+    grid = random_map(SIZE, rnd.choice((0.1, 0.25)), seed)
+    if weighted:
+        grid = [[v if v == -1 else rnd.choice((1, 1, 2, 5, 9)) for v in row] for row in grid]
+    cells = [(row, col) for row in range(SIZE) for col in range(SIZE)]
+    free = free_cells(grid)
+    for _ in range(15):
+        goals = [rnd.choice(cells) for _ in range(rnd.randint(1, 20))]
+        weights = [rnd.choice((0, 0, 3, 17)) for _ in goals] if rnd.random() < 0.5 else None
+        yield grid, rnd.choice(free), goals, weights, rnd.randint(1, 5)
+
+
+@pytest.mark.parametrize("weighted", [False, True])
+@pytest.mark.parametrize("seed", range(6))
+def test_pathfinding_matches_one_a_star_per_goal(seed, weighted):
+    for grid, start, goals, weights, k in queries(seed, weighted):
+        results, _ = Pathfinding(grid, start, start, weighted=weighted).nearest_goals(goals, k=k, weights=weights)
+        expected = {}
+        for i, goal in enumerate(goals):
+            path, _ = Pathfinding(grid, start, goal, weighted=weighted).a_star()
+            if path is not None and grid[goal[0]][goal[1]] != -1:
+                cost = path_cost(grid, path, weighted) + (weights[i] if weights else 0)
+                expected[goal] = min(cost, expected.get(goal, cost))
+        assert [result.cost for result in results] == sorted(expected.values())[:k], (start, goals)
+        assert len({result.goal for result in results}) == len(results)
+        for result in results:
+            assert result.path[0] == start and result.path[-1] == result.goal
+            assert result.cost == expected[result.goal]
+
+
+@pytest.mark.parametrize("seed", range(6))
+def test_jump_start_table_and_walk_agree(seed):
+    for grid, start, goals, weights, k in queries(seed):
+        grid_map = GridMap.from_lists(grid)
+        walked, _ = JumpStart(grid_map, start, start).nearest_goals(goals, k=k, weights=weights)
+        search = JumpStart(grid_map, start, start)
+        search.preprocess()
+        tabled, _ = search.nearest_goals(goals, k=k, weights=weights)
+        assert tabled == walked, (start, goals)
+        costs = [result.cost for result in walked]
+        assert costs == sorted(costs)
+        for result in walked:
+            goal = result.goal
+            weight = min(weights[i] for i, other in enumerate(goals) if other == goal) if weights else 0
+            assert result.path[0] == start and result.path[-1] == goal
+            assert result.cost == octile_cost(grid, result.path) + weight
+
+
+@pytest.mark.parametrize("preprocess", [False, True])
+@pytest.mark.parametrize("seed", range(4))
+def test_jump_start_single_goal_matches_jump_point_search(seed, preprocess):
+    for grid, start, goals, _, _ in queries(seed):
+        goal = goals[0]
+        search = JumpStart(grid, start, goal)
+        if preprocess:
+            search.preprocess()
+        path, _ = search.jump_point_search()
+        results, _ = search.nearest_goals([goal])
+        assert (path is None) == (not results), (start, goal)
+        if path is not None:
+            assert results[0].cost == octile_cost(grid, path)
+
+
+def test_goal_on_ray():
+    grid_map = GridMap(9, 9)
+    goals = [(4, 1), (4, 7), (1, 4), (7, 7), (2, 6)]
+    index = GoalIndex(grid_map, goals, metric="octile")
+    center = grid_map.cell_id((4, 4))
+    expected = {(0, 1): (4, 7), (0, -1): (4, 1), (-1, 0): (1, 4), (1, 0): None,
+                (1, 1): (7, 7), (-1, 1): (2, 6), (-1, -1): None, (1, -1): None}
+    for (dx, dy), goal in expected.items():
+        found = index.goal_on_ray(center, dx, dy, 9)
+        assert found == (grid_map.cell_id(goal) if goal else -1), (dx, dy)
+        if goal is not None:
+            steps = max(abs(goal[0] - 4), abs(goal[1] - 4))
+            assert index.goal_on_ray(center, dx, dy, steps - 1) == -1  # Past the end of the run
@@ -0,0 +1,55 @@
+"""HPA* paths checked against a_star on the same GridMap, before and after edits."""
+import random
+
+import pytest
+
+from benchmarks.maps import random_map, room_map
+from grid import GridMap
+from hpa import HierarchicalMap
+from pathfinding import Pathfinding
+
+SIZE = 24
+
+
+def path_cost(grid_map, path):
+    return sum(grid_map.costs[grid_map.cell_id(cell)] for cell in path[1:])
+
+
+def check_queries(hierarchy, grid_map, rnd, optimal):
+    cells = [(row, col) for row in range(SIZE) for col in range(SIZE)]
+    for _ in range(30):
+        start, goal = rnd.choice(cells), rnd.choice(cells)  # Either may be an obstacle
+        path, _ = hierarchy.find_path(start, goal)
+        reference, _ = Pathfinding(grid_map, start, goal).a_star()
+        assert (path is None) == (reference is None), (start, goal)
+        if path is None:
+            continue
+        assert path[0] == start and path[-1] == goal
+        for (r1, c1), (r2, c2) in zip(path, path[1:]):
+            assert abs(r1 - r2) + abs(c1 - c2) == 1 and grid_map.is_passable((r2, c2))
+        if optimal:
+            assert path_cost(grid_map, path) == path_cost(grid_map, reference), (start, goal)
+        else:
+            assert path_cost(grid_map, path) >= path_cost(grid_map, reference)
+
+
+@pytest.mark.parametrize("weighted", [False, True])
+@pytest.mark.parametrize("optimal", [False, True])
+@pytest.mark.parametrize("seed", range(4))
+def test_matches_a_star_before_and_after_edits(seed, optimal, weighted):
+    rnd = random.Random(seed)
+    grid = random_map(SIZE, 0.25, seed) if seed % 2 else room_map(SIZE, seed, room=5)
+    if weighted:
+        grid = [[v if v == -1 else rnd.choice((1, 1, 2, 5, 9)) for v in row] for row in grid]
+    grid_map = GridMap.from_lists(grid, weighted)
+    hierarchy = HierarchicalMap(grid_map, cluster_size=6, optimal=optimal)
+    check_queries(hierarchy, grid_map, rnd, optimal)
+    for _ in range(5):
+        changes = [(rnd.randrange(SIZE), rnd.randrange(SIZE), rnd.choice((-1, 0, 1, 3, 9))) for _ in range(6)]
+        hierarchy.update_cells(changes)
+        check_queries(hierarchy, grid_map, rnd, optimal)
+
+
+def test_blocked_goal():
+    hierarchy = HierarchicalMap([[0, 0, 0, 0], [0, 0, 0, 0], [0, 0, 0, -1]], cluster_size=2)
+    assert hierarchy.find_path((0, 0), (2, 3)) == (None, 0)
@@ -0,0 +1,40 @@
+"""JumpStart searches: walkable octile paths and results kept after the search."""
+import random
+
+import pytest
+
+from benchmarks.maps import random_map
+from jumpstart import DIAGONAL_COST, STRAIGHT_COST, JumpStart
+
+SIZE = 20
+
+
+def octile_cost(grid, path):
+    total = 0
+    for (r1, c1), (r2, c2) in zip(path, path[1:]):
+        assert max(abs(r1 - r2), abs(c1 - c2)) == 1 and grid[r2][c2] != -1
+        total += DIAGONAL_COST if r1 != r2 and c1 != c2 else STRAIGHT_COST
+    return total
+
+
+@pytest.mark.parametrize("compact", [False, True])
+@pytest.mark.parametrize("seed", range(4))
+def test_reconstruct_path_after_search(seed, compact):
+    rnd = random.Random(seed)
+    grid = random_map(SIZE, 0.2, seed)
+    free = [(row, col) for row in range(SIZE) for col in range(SIZE) if grid[row][col] != -1]
+    for _ in range(20):
+        search = JumpStart(grid, rnd.choice(free), rnd.choice(free), compact=compact)
+        path, _ = search.jump_point_search()
+        assert search.reconstruct_path() == path
+        if path is not None:
+            cells = list(path)
+            assert cells[0] == search.start and cells[-1] == search.goal
+            assert octile_cost(grid, cells) == (path.cost if compact else search.jump_path.cost)
+
+
+def test_reconstruct_path_is_none_without_a_path():
+    grid = [[0, -1, 0], [-1, -1, 0], [0, 0, 0]]
+    search = JumpStart(grid, (0, 0), (2, 2))
+    assert search.jump_point_search()[0] is None
+    assert search.reconstruct_path() is None and search.jump_path is None
@@ -0,0 +1,52 @@
+"""JPS+ tables patched line by line must match tables built from scratch."""
+import random
+
+import pytest
+
+from benchmarks.maps import random_map
+from jumpstart import JumpStart, JumpTable
+
+SIZE = 18
+
+
+def assert_same_tables(table, grid_map):
+    fresh = JumpTable(grid_map)
+    for direction, (patched, built) in enumerate(zip(table.distances, fresh.distances)):
+        for cell in range(grid_map.size):
+            assert patched[cell] == built[cell], (direction, grid_map.position(cell))
+
+
+@pytest.mark.parametrize("seed", range(6))
+def test_line_updates_match_rebuild(seed):
+    rnd = random.Random(seed)
+    search = JumpStart(random_map(SIZE, 0.3, seed), (0, 0), (SIZE - 1, SIZE - 1))
+    table = search.preprocess()
+    for _ in range(40):
+        changes = [(rnd.randrange(SIZE), rnd.randrange(SIZE), rnd.choice((-1, 0))) for _ in range(rnd.randint(1, 4))]
+        search.update_cells(changes)
+        assert_same_tables(table, search.map)
+
+
+def test_save_load_round_trip(tmp_path):
+    search = JumpStart(random_map(SIZE, 0.3, 7), (0, 0), (SIZE - 1, SIZE - 1))
+    table = search.preprocess()
+    path = str(tmp_path / "table.jps")
+    table.save(path)
+    assert_same_tables(JumpTable.load(path, search.map), search.map)
+    search.update_cells([(3, 3, -1 if search.map.is_passable((3, 3)) else 0)])
+    with pytest.raises(ValueError, match="different grid"):
+        JumpTable.load(path, search.map)
+
+
+@pytest.mark.parametrize("cut", [-4, -1, 1])
+def test_load_rejects_wrong_length(tmp_path, cut):
+    search = JumpStart(random_map(SIZE, 0.3, 7), (0, 0), (SIZE - 1, SIZE - 1))
+    path = tmp_path / "table.jps"
+    search.preprocess().save(str(path))
+    data = path.read_bytes()
+    path.write_bytes(data[:cut] if cut < 0 else data + bytes(cut))
+    with pytest.raises(ValueError, match="bytes of tables"):
+        JumpTable.load(str(path), search.map)
+    path.write_bytes(data[:8])
+    with pytest.raises(ValueError, match="not a JPS\\+ jump table"):
+        JumpTable.load(str(path), search.map)
@@ -0,0 +1,83 @@
+"""ALT bounds must stay admissible, and saved tables must load back exactly."""
+import random
+
+import pytest
+
+from benchmarks.maps import random_map
+from grid import GridMap
+from landmarks import LandmarkHeuristic
+from pathfinding import Pathfinding
+
+SIZE = 16
+
+
+def cost(grid_map, start, goal):
+    path, _ = Pathfinding(grid_map, start, goal).a_star()
+    return None if path is None else sum(grid_map.costs[grid_map.cell_id(cell)] for cell in path[1:])
+
+
+@pytest.mark.parametrize("weighted", [False, True])
+@pytest.mark.parametrize("selection", ["farthest", "avoid"])
+@pytest.mark.parametrize("seed", range(3))
+def test_bounds_admissible_while_blocking(seed, selection, weighted):
+    rnd = random.Random(seed)
+    grid = random_map(SIZE, 0.25, seed)
+    if weighted:
+        grid = [[v if v == -1 else rnd.choice((1, 1, 2, 5)) for v in row] for row in grid]
+    grid_map = GridMap.from_lists(grid, weighted)
+    landmarks = LandmarkHeuristic(grid_map, count=4, selection=selection, seed=seed)
+    free = [(row, col) for row in range(SIZE) for col in range(SIZE) if grid[row][col] != -1]
+    for _ in range(4):
+        for _ in range(25):
+            start, goal = rnd.choice(free), rnd.choice(free)
+            exact = cost(grid_map, start, goal)
+            if exact is None:
+                continue
+            if landmarks.usable():
+                assert landmarks.estimate(grid_map.cell_id(start), grid_map.cell_id(goal)) <= exact
+                assert landmarks.heuristic_to(grid_map.cell_id(goal))(grid_map.cell_id(start)) <= exact
+            path, _ = Pathfinding(grid_map, start, goal, landmarks=landmarks).a_star()
+            assert sum(grid_map.costs[grid_map.cell_id(cell)] for cell in path[1:]) == exact
+        grid_map.update_cells([(rnd.randrange(SIZE), rnd.randrange(SIZE), -1) for _ in range(3)])
+        if not weighted:
+            assert landmarks.usable()  # New walls only lengthen paths
+    row, col = next((row, col) for row in range(SIZE) for col in range(SIZE) if not grid_map.is_passable((row, col)))
+    grid_map.update_cells([(row, col, 1)])
+    assert not landmarks.usable()  # Freed cells can shorten paths: fall back to Manhattan
+
+
+def saved(tmp_path, diagonal=False):
+    grid_map = GridMap.from_lists(random_map(SIZE, 0.2, 4))
+    landmarks = LandmarkHeuristic(grid_map, count=3, diagonal=diagonal)
+    path = tmp_path / "alt.bin"
+    landmarks.save(str(path))
+    return grid_map, landmarks, path
+
+
+@pytest.mark.parametrize("diagonal", [False, True])
+def test_save_load_round_trip(tmp_path, diagonal):
+    grid_map, landmarks, path = saved(tmp_path, diagonal)
+    loaded = LandmarkHeuristic.load(str(path), grid_map)
+    assert loaded.landmarks == landmarks.landmarks and loaded.diagonal == diagonal
+    assert loaded.distances == landmarks.distances and loaded.infinity == landmarks.infinity
+
+
+@pytest.mark.parametrize("cut", [-2, -1, 1])
+def test_load_rejects_wrong_length(tmp_path, cut):
+    grid_map, _, path = saved(tmp_path)
+    data = path.read_bytes()
+    path.write_bytes(data[:cut] if cut < 0 else data + bytes(cut))
+    with pytest.raises(ValueError, match="bytes of tables"):
+        LandmarkHeuristic.load(str(path), grid_map)
+
+
+def test_load_rejects_bad_header(tmp_path):
+    grid_map, _, path = saved(tmp_path)
+    data = path.read_bytes()
+    path.write_bytes(data[:10])
+    with pytest.raises(ValueError, match="not a landmark table"):
+        LandmarkHeuristic.load(str(path), grid_map)
+    typecode_at = LandmarkHeuristic.HEADER.size - 5  # Just before the crc32
+    path.write_bytes(data[:typecode_at] + b"Q" + data[typecode_at + 1:])
+    with pytest.raises(ValueError, match="unknown table typecode"):
+        LandmarkHeuristic.load(str(path), grid_map)
@@ -0,0 +1,52 @@
+"""MovingAI .map parsing and the memory-mapped cache."""
+import random
+
+import pytest
+
+import movingai
+from grid import GridMap
+
+
+def write_map(path, rows, trailing="\n"):
+    path.write_text(f"type octile\nheight {len(rows)}\nwidth {len(rows[0])}\nmap\n" + "\n".join(rows) + trailing)
+    return str(path)
+
+
+def test_cache_matches_parse_and_lists(tmp_path):
+    rnd = random.Random(0)
+    rows = ["".join(rnd.choice(".GS@OTW") for _ in range(13)) for _ in range(9)]
+    path = write_map(tmp_path / "a.map", rows, trailing="")
+    reference = GridMap.from_lists([[0 if ch in ".GS" else -1 for ch in row] for row in rows])
+    first, cached = movingai.load_map(path), movingai.load_map(path)
+    for grid_map in (movingai.parse_map(path), first, cached):
+        assert bytes(grid_map.passable) == bytes(reference.passable)
+        assert bytes(grid_map.masks) == bytes(reference.masks)
+        assert set(grid_map.costs) == {1}
+    assert (tmp_path / "a.map.gridmap").stat().st_size == movingai.CACHE_HEADER.size + 2 * reference.size
+
+
+def test_cache_edits_stay_private(tmp_path):
+    path = write_map(tmp_path / "a.map", ["....", "...."])
+    grid_map = movingai.load_map(path)
+    movingai.load_map(path).update_cells([(0, 0, -1)])
+    assert movingai.load_map(path).is_passable((0, 0)) and grid_map.is_passable((0, 0))
+
+
+@pytest.mark.parametrize("text", [
+    "type octile\nheight 1\nwidth 2\n",  # No map line at all
+    "type octile\nheight 1\nwidth 2",
+])
+def test_missing_map_line(tmp_path, text):
+    path = tmp_path / "a.map"
+    path.write_text(text)
+    with pytest.raises(ValueError, match="missing 'map' line"):
+        movingai.parse_map(str(path))
+
+
+def test_map_line_last_and_short_rows(tmp_path):
+    path = tmp_path / "a.map"
+    path.write_text("type octile\nheight 0\nwidth 2\nmap")
+    assert movingai.parse_map(str(path)).rows == 0
+    path.write_text("type octile\nheight 2\nwidth 2\nmap\n..")
+    with pytest.raises(ValueError, match="row 1 has 0 cells"):
+        movingai.parse_map(str(path))
@@ -0,0 +1,69 @@
+"""PathCache answers after random edits against fresh a_star searches."""
+import random
+
+import pytest
+
+from benchmarks.maps import random_map
+from grid import GridMap, cell_cost
+from path_cache import PathCache
+from pathfinding import Pathfinding
+
+SIZE = 16
+
+
+def path_cost(grid, path, weighted):
+    for (r1, c1), (r2, c2) in zip(path, path[1:]):
+        assert abs(r1 - r2) + abs(c1 - c2) == 1 and grid[r2][c2] != -1
+    if not weighted:
+        return len(path) - 1
+    return sum(cell_cost(grid[row][col]) for row, col in path[1:])
+
+
+@pytest.mark.parametrize("weighted", [False, True])
+@pytest.mark.parametrize("seed", range(5))
+def test_cached_paths_match_fresh_searches(seed, weighted):
+    rnd = random.Random(seed)
+    grid = random_map(SIZE, 0.2, seed)
+    if weighted:
+        grid = [[v if v == -1 else rnd.choice((1, 1, 2, 5)) for v in row] for row in grid]
+    grid_map = GridMap.from_lists(grid, weighted=weighted)
+    cache = PathCache(grid_map, max_entries=40)
+    cells = [(row, col) for row in range(SIZE) for col in range(SIZE)]
+    pool = [(rnd.choice(cells), rnd.choice(cells)) for _ in range(30)]  # Repeated queries hit the cache
+    algorithms = ["a_star", "bidirectional_a_star"] + ([] if weighted else ["bfs"])
+    for _ in range(20):
+        changes = [(row, col, rnd.choice((-1, 0, 0, 3) if weighted else (-1, 0)))
+                   for row, col in rnd.sample(cells, rnd.randint(1, 4))]
+        grid_map.update_cells(changes)
+        for row, col, value in changes:
+            grid[row][col] = value
+        for _ in range(15):
+            start, goal = rnd.choice(pool)
+            if rnd.random() < 0.3:
+                # Endpoints on a cached path, for the subpath answers
+                cached = [entry.path for entry in cache.entries.values() if entry.path]
+                if cached:
+                    path = rnd.choice(cached)
+                    start, goal = rnd.choice(path), rnd.choice(path)
+            path, _ = cache.find_path(rnd.choice(algorithms), start, goal)
+            if start == goal and grid[goal[0]][goal[1]] == -1:
+                continue  # a_star answers [start] here, bidirectional_a_star None for the blocked goal
+            reference, _ = Pathfinding(grid_map, start, goal, weighted=weighted).a_star()
+            assert (path is None) == (reference is None), (start, goal)
+            if path is not None:
+                assert path[0] == start and path[-1] == goal
+                assert path_cost(grid, path, weighted) == path_cost(grid, reference, weighted), (start, goal)
+    stats = cache.stats()
+    assert stats["hits"] and stats["subpath_hits"] and stats["misses"]
+
+
+def test_lru_bounds():
+    grid = random_map(SIZE, 0.0, 0)
+    cache = PathCache(GridMap.from_lists(grid), max_entries=3, max_cells=40)
+    queries = [((0, 0), (0, col)) for col in range(1, 8)]
+    for start, goal in queries:
+        cache.find_path("a_star", start, goal)
+        assert len(cache.entries) <= 3 and cache.cached_cells <= 40
+        assert cache.cached_cells == sum(len(entry.cells) for entry in cache.entries.values())
+    assert cache.stats()["evictions"] == len(queries) - len(cache.entries)
+    assert list(cache.entries)[-1] == ("a_star",) + queries[-1]
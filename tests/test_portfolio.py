@@ -0,0 +1,67 @@
+"""PortfolioSolver: race answers match a_star, and dead workers are restarted."""
+import multiprocessing
+import os
+
+import pytest
+
+import batch
+from benchmarks.maps import random_map, random_queries
+from grid import GridMap
+from pathfinding import Pathfinding
+from portfolio import PortfolioSolver
+
+SIZE = 40
+
+
+class Crash:
+    """Stands in for a search whose worker process dies mid-query."""
+
+    def __init__(self, grid_map, start, goal, hooks=None):
+        pass
+
+    def run(self):
+        os._exit(1)
+
+
+@pytest.fixture
+def grid_map():
+    return GridMap.from_lists(random_map(SIZE, 0.3, 0))
+
+
+def test_race_matches_a_star(grid_map):
+    with PortfolioSolver(grid_map) as solver:
+        for start, goal in random_queries(random_map(SIZE, 0.3, 0), 20, 1):
+            result = solver.solve(start, goal)
+            reference, _ = Pathfinding(grid_map, start, goal).a_star()
+            assert (result.path is None) == (reference is None), (start, goal)
+            if reference is not None:
+                assert len(result.path) == len(reference)
+
+
+def test_killed_worker_is_restarted(grid_map):
+    start, goal = random_queries(random_map(SIZE, 0.3, 0), 1, 2)[0]
+    reference, _ = Pathfinding(grid_map, start, goal).a_star()
+    with PortfolioSolver(grid_map, algorithms=("a_star", "bidirectional_a_star")) as solver:
+        for algorithm in solver.algorithms:
+            solver.workers[algorithm].kill()
+            solver.workers[algorithm].join()
+        result = solver.solve(start, goal)
+        assert solver.restarts == 2
+        assert all(worker.is_alive() for worker in solver.workers.values())
+        assert (result.path is None) == (reference is None)
+
+
+@pytest.mark.skipif(multiprocessing.get_start_method() != "fork", reason="workers must inherit the patched table")
+def test_worker_dying_mid_race(grid_map, monkeypatch):
+    monkeypatch.setitem(batch.ALGORITHMS, "crash", (Crash, "run"))
+    monkeypatch.setitem(batch.ALGORITHMS, "crash_too", (Crash, "run"))
+    start, goal = random_queries(random_map(SIZE, 0.3, 0), 1, 3)[0]
+    with PortfolioSolver(grid_map, algorithms=("crash", "a_star")) as solver:
+        for _ in range(2):
+            result = solver.solve(start, goal, accept="any")
+            assert result.algorithm == "a_star"
+        assert solver.restarts >= 1
+    with PortfolioSolver(grid_map, algorithms=("crash", "crash_too")) as solver:
+        with pytest.raises(RuntimeError):
+            solver.solve(start, goal, accept="any")
+        assert all(worker.is_alive() for worker in solver.workers.values())
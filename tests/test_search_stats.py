@@ -0,0 +1,87 @@
+"""SearchStats and SearchHooks agree with what each search returns."""
+import random
+
+import pytest
+
+from benchmarks.maps import random_map, random_queries
+from jumpstart import JumpStart
+from pathfinding import Pathfinding
+from search_stats import FIELDS, SearchHooks
+
+SIZE = 24
+PATHFINDING = ["a_star", "anytime_a_star", "bidirectional_a_star", "d_star", "bfs", "greedy_best_first_search"]
+JUMP_START = ["jump_point_search", "anytime_jump_point_search"]
+
+
+class Recorder:
+    def __init__(self):
+        self.expanded, self.pushed, self.paths = [], [], []
+        self.hooks = SearchHooks(on_expand=self.expanded.append,
+                                 on_push=lambda pos, priority: self.pushed.append((pos, priority)),
+                                 on_path=self.paths.append)
+
+
+def run(cls, method, grid, start, goal, hooks=None):
+    search = cls(grid, start, goal, hooks=hooks)
+    path, node_expanded = getattr(search, method)()
+    return search, path, node_expanded
+
+
+@pytest.mark.parametrize("method", PATHFINDING + JUMP_START)
+@pytest.mark.parametrize("seed", range(3))
+def test_hooks_and_stats_match_the_result(seed, method):
+    cls = JumpStart if method in JUMP_START else Pathfinding
+    grid = random_map(SIZE, 0.25, seed)
+    for start, goal in random_queries(grid, 10, seed):
+        recorder = Recorder()
+        search, path, node_expanded = run(cls, method, grid, start, goal, recorder.hooks)
+        stats = search.stats
+        assert recorder.paths == [path]  # on_path fires once, with the result
+        assert stats.expansions == node_expanded == len(recorder.expanded)
+        assert stats.pushes >= len(recorder.pushed) and stats.stale_pops <= stats.pushes
+        assert stats.peak_closed >= (1 if node_expanded else 0) and stats.wall_time > 0
+        for row, col in recorder.expanded + [pos for pos, _ in recorder.pushed]:
+            assert 0 <= row < SIZE and 0 <= col < SIZE
+        assert set(stats.as_dict()) == set(FIELDS)
+        # Hooks only observe: the same search without them gives the same answer
+        _, plain_path, plain_expanded = run(cls, method, grid, start, goal)
+        assert (plain_path, plain_expanded) == (path, node_expanded)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_a_star_expands_in_f_order(seed):
+    """With a consistent heuristic the f of each expanded cell never drops."""
+    grid = random_map(SIZE, 0.25, seed)
+    for start, goal in random_queries(grid, 10, seed):
+        recorder = Recorder()
+        Pathfinding(grid, start, goal, hooks=recorder.hooks).a_star()
+        best = {}
+        for pos, priority in recorder.pushed:
+            best[pos] = min(priority, best.get(pos, priority))
+        priorities = [best[pos] for pos in recorder.expanded if pos in best]
+        assert priorities == sorted(priorities)
+
+
+def test_stats_are_per_call():
+    grid = random_map(SIZE, 0.25, 0)
+    start, goal = random_queries(grid, 1, 0)[0]
+    search = Pathfinding(grid, start, goal)
+    search.a_star()
+    first = search.stats
+    search.bfs()
+    assert search.stats is not first
+    search.a_star()
+    counts = {name: value for name, value in search.stats.as_dict().items() if name != "wall_time"}
+    assert counts == {name: value for name, value in first.as_dict().items() if name != "wall_time"}
+
+
+def test_nearest_goals_reports_the_first_path():
+    rnd = random.Random(0)
+    grid = random_map(SIZE, 0.25, 0)
+    start, _ = random_queries(grid, 1, 0)[0]
+    goals = [goal for _, goal in random_queries(grid, 6, 1)]
+    for cls in (Pathfinding, JumpStart):
+        recorder = Recorder()
+        results, node_expanded = cls(grid, start, start, hooks=recorder.hooks).nearest_goals(goals, k=rnd.randint(1, 3))
+        assert recorder.paths == [results[0].path if results else None]
+        assert node_expanded == len(recorder.expanded)
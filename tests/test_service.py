@@ -0,0 +1,96 @@
+"""PathService answers against direct searches, plus deadlines and close()."""
+import asyncio
+import importlib.util
+import random
+
+import pytest
+
+from benchmarks.maps import free_cells, random_map
+from grid import GridMap
+from pathfinding import Pathfinding
+from service import PathService
+
+SIZE = 40
+HAS_NUMPY = importlib.util.find_spec("numpy") is not None
+
+
+def workload(seed, count=120):
+    rnd = random.Random(seed)
+    grid = random_map(SIZE, 0.25, seed)
+    free = free_cells(grid)
+    goals = rnd.sample(free, 3)  # Few goals, so queries share jobs and fields
+    queries = [(rnd.choice(free), rnd.choice(goals)) for _ in range(count)]
+    return GridMap.from_lists(grid), queries + queries[:count // 4], rnd  # Some duplicates too
+
+
+def path_steps_ok(grid_map, path, start, goal):
+    assert path[0] == start and path[-1] == goal
+    for (r1, c1), (r2, c2) in zip(path, path[1:]):
+        assert abs(r1 - r2) + abs(c1 - c2) == 1 and grid_map.is_passable((r2, c2))
+
+
+@pytest.mark.parametrize("workers, field_threshold", [
+    (0, 10 ** 9),
+    pytest.param(0, 4, marks=pytest.mark.skipif(not HAS_NUMPY, reason="distance fields need NumPy")),
+    pytest.param(2, 4, marks=pytest.mark.skipif(not HAS_NUMPY, reason="distance fields need NumPy")),
+])
+@pytest.mark.parametrize("seed", range(2))
+def test_answers_match_a_star(seed, workers, field_threshold):
+    grid_map, queries, rnd = workload(seed)
+
+    async def main():
+        async with PathService(grid_map, workers=workers, field_threshold=field_threshold) as service:
+            results = await asyncio.gather(*(service.find_path(start, goal, priority=rnd.randint(0, 3))
+                                             for start, goal in queries))
+            return results, service.metrics()
+
+    results, metrics = asyncio.run(main())
+    for (start, goal), path in zip(queries, results):
+        reference, _ = Pathfinding(grid_map, start, goal).a_star()
+        assert (path is None) == (reference is None), (start, goal)
+        if path is not None:
+            path_steps_ok(grid_map, path, start, goal)
+            assert len(path) == len(reference), (start, goal)
+    assert metrics["requests"] == len(queries)
+    assert metrics["coalesced"] > 0 and metrics["searched"] < len(queries)
+    assert metrics["queue_depth"] == 0 and metrics["in_flight"] == 0
+    if field_threshold < 10 ** 9:
+        assert metrics["field_jobs"] > 0
+
+
+def test_other_algorithms_match_direct_searches():
+    grid_map, queries, _ = workload(3, count=40)
+
+    async def main():
+        async with PathService(grid_map, algorithm="greedy_best_first_search", workers=0) as service:
+            return await asyncio.gather(*(service.find_path(start, goal) for start, goal in queries))
+
+    for (start, goal), path in zip(queries, asyncio.run(main())):
+        assert path == Pathfinding(grid_map, start, goal).greedy_best_first_search()[0]
+
+
+def test_deadline_and_close():
+    grid_map, queries, _ = workload(4, count=60)
+
+    async def main():
+        service = PathService(grid_map, workers=0, field_threshold=10 ** 9)
+        with pytest.raises(RuntimeError):
+            await service.find_path(*queries[0])  # Not started
+        await service.start()
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.gather(*(service.find_path(start, goal, deadline=1e-6) for start, goal in queries))
+        assert service.metrics()["deadline_misses"] >= 1
+        # Still answering after the misses
+        start, goal = queries[0]
+        path = await service.find_path(start, goal)
+        assert path == Pathfinding(grid_map, start, goal).a_star()[0]
+        pending = [asyncio.ensure_future(service.find_path(start, goal)) for start, goal in queries]
+        await asyncio.sleep(0)
+        await service.close()
+        outcomes = await asyncio.gather(*pending, return_exceptions=True)
+        assert any(isinstance(outcome, RuntimeError) for outcome in outcomes)
+        for (start, goal), outcome in zip(queries, outcomes):
+            if not isinstance(outcome, BaseException):
+                assert outcome == Pathfinding(grid_map, start, goal).a_star()[0]
+
+    asyncio.run(main())
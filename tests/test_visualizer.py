@@ -0,0 +1,65 @@
+"""Visualizer drawing against a whole-grid rescale, and the worker's event stream."""
+import os
+import queue
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pygame = pytest.importorskip("pygame")
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import visualizer  # noqa: E402  (needs pygame)
+from pathfinding import Pathfinding  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def screen():
+    pygame.init()
+    yield pygame.display.set_mode((visualizer.WIDTH, visualizer.HEIGHT))
+    pygame.quit()
+
+
+@pytest.mark.parametrize("size", [7, 30, 500])
+def test_dirty_blits_match_a_full_rescale(screen, size):
+    rnd = random.Random(size)
+    random.seed(size)
+    grid = visualizer.random_grid(size, size, 0.2, (0, 0), (size - 1, size - 1))
+    origin = (visualizer.WIDTH // 2, visualizer.HEIGHT // 2)
+    quadrant = visualizer.Quadrant("A*", origin, visualizer.background_pixels(grid), visualizer.YELLOW, (255, 250, 200))
+    screen.fill(visualizer.WHITE)
+    quadrant.blit(screen, [pygame.Rect(origin, (quadrant.side, quadrant.side))])
+    for _ in range(40):
+        cells = [(rnd.randrange(size), rnd.randrange(size)) for _ in range(rnd.randint(1, 20))]
+        rect = quadrant.paint(cells, quadrant.expanded_color)
+        if rect is not None:
+            quadrant.blit(screen, [rect])
+    # Obstacles, start and goal keep their colors
+    background = visualizer.background_pixels(grid)
+    marked = (background != visualizer.WHITE).any(axis=2)
+    assert (quadrant.pixels[marked] == background[marked]).all()
+    # Nearest-neighbour scaling of the whole cell array at once
+    x, y = origin
+    width, height = quadrant.col_of.size, quadrant.row_of.size
+    expected = quadrant.pixels[(np.arange(width) / quadrant.scale).astype(int)[:, None],
+                               (np.arange(height) / quadrant.scale).astype(int)]
+    assert (pygame.surfarray.array3d(screen)[x:x + width, y:y + height] == expected).all()
+
+
+@pytest.mark.parametrize("method", ["a_star", "jump_point_search", "d_star", "greedy_best_first_search"])
+def test_worker_streams_every_expansion(method):
+    random.seed(1)
+    grid = visualizer.random_grid(25, 25, 0.2, (0, 0), (24, 24))
+    events = queue.Queue()
+    visualizer.run_search(3, method, grid, (0, 0), (24, 24), events)
+    messages = []
+    while not events.empty():
+        messages.append(events.get())
+    *expands, done = messages
+    assert all(kind == "expand" and index == 3 and 0 < len(cells) <= visualizer.EVENT_BATCH
+               for kind, index, cells in expands)
+    kind, index, path, stats = done
+    assert (kind, index) == ("done", 3)
+    assert sum(len(cells) for _, _, cells in expands) == stats["expansions"]
+    if method == "a_star":
+        assert path == Pathfinding(grid, (0, 0), (24, 24)).a_star()[0]
@@ -0,0 +1,87 @@
+"""Weighted terrain on every open list against Dijkstra, and the open lists' decrease-key."""
+import heapq
+import random
+
+import pytest
+
+from benchmarks.maps import free_cells, random_map
+from grid import cell_cost
+from open_list import new_open_list
+from pathfinding import Pathfinding
+
+SIZE = 16
+
+
+def dijkstra(grid, start):
+    """Costs from `start` where stepping onto a cell costs cell_cost(value)."""
+    distances = {start: 0}
+    queue = [(0, start)]
+    while queue:
+        distance, (row, col) = heapq.heappop(queue)
+        if distance > distances[(row, col)]:
+            continue
+        for r, c in ((row - 1, col), (row + 1, col), (row, col - 1), (row, col + 1)):
+            if 0 <= r < len(grid) and 0 <= c < len(grid[0]) and grid[r][c] != -1:
+                cost = distance + cell_cost(grid[r][c])
+                if cost < distances.get((r, c), cost + 1):
+                    distances[(r, c)] = cost
+                    heapq.heappush(queue, (cost, (r, c)))
+    return distances
+
+
+def path_cost(grid, path):
+    for (r1, c1), (r2, c2) in zip(path, path[1:]):
+        assert abs(r1 - r2) + abs(c1 - c2) == 1 and grid[r2][c2] != -1
+    return sum(cell_cost(grid[row][col]) for row, col in path[1:])
+
+
+@pytest.mark.parametrize("open_list", ["heapq", "dial", "radix"])
+@pytest.mark.parametrize("seed", range(5))
+def test_weighted_searches_match_dijkstra(seed, open_list):
+    rnd = random.Random(seed)
+    grid = [[v if v == -1 else rnd.choice((0, 1, 2, 5, 9, 40)) for v in row] for row in random_map(SIZE, 0.2, seed)]
+    free = free_cells(grid)
+    methods = ["a_star", "d_star", "bidirectional_a_star"]
+    if open_list != "radix":
+        methods.append("anytime_a_star")  # ARA* re-keys its open list, which a radix heap can't take
+    for _ in range(10):
+        start, goal = rnd.choice(free), rnd.choice(free)
+        expected = dijkstra(grid, start).get(goal)
+        for method in methods:
+            path, _ = getattr(Pathfinding(grid, start, goal, weighted=True, open_list=open_list), method)()
+            assert (path is None) == (expected is None), (method, start, goal)
+            if path is not None:
+                assert path[0] == start and path[-1] == goal
+                assert path_cost(grid, path) == expected, (method, start, goal)
+
+
+@pytest.mark.parametrize("name", ["dial", "radix"])
+@pytest.mark.parametrize("seed", range(5))
+def test_decrease_key_against_a_model(seed, name):
+    """Pops come out in priority order, each item once, at its lowest pushed priority."""
+    rnd = random.Random(seed)
+    queue = new_open_list(name)
+    live, last = {}, 0  # Item -> lowest priority pushed since it was last popped
+    for _ in range(2000):
+        if live and rnd.random() < 0.4:
+            priority, item = queue.pop()
+            assert priority == min(live.values()) == live.pop(item)
+            last = priority
+        else:
+            item = rnd.randrange(60)
+            priority = last + rnd.randrange(30)  # Monotone, so the radix heap accepts it
+            if priority < live.get(item, priority + 1):
+                live[item] = priority
+            queue.push((priority, item))
+        assert len(queue) == len(live)
+    while live:
+        priority, item = queue.pop()
+        assert priority == min(live.values()) == live.pop(item)
+
+
+def test_radix_heap_rejects_pushes_below_the_last_pop():
+    queue = new_open_list("radix")
+    queue.push((5, "a"))
+    queue.pop()
+    with pytest.raises(ValueError):
+        queue.push((4, "b"))
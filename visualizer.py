@@ -1,17 +1,19 @@
-import pygame
+import argparse
+import multiprocessing
+import queue
 import random
-import time  # For measuring runtime
-from pathfinding import Pathfinding  # A* Implementation
-from jumpstart import JumpStart
-import matplotlib.pyplot as plt
 
-# Initialize Pygame
-pygame.init()
+import numpy as np
+import pygame
+
+from jumpstart import JumpStart
+from pathfinding import Pathfinding
 
-# Screen dimensions
+# Screen dimensions; each algorithm gets one quadrant
 WIDTH, HEIGHT = 800, 800
-ROWS, COLS = 30, 30  # Number of rows and columns in the grid
-CELL_SIZE = min(WIDTH // 2 // COLS, HEIGHT // 2 // ROWS) - 1
+LABEL_HEIGHT = 24  # Room for the stats line under each quadrant
+FPS = 60
+EVENT_BATCH = 512  # Expanded cells sent per queue message
 
 # Colors for visualization
 WHITE = (255, 255, 255)
@@ -21,294 +23,197 @@ RED = (255, 0, 0)
 YELLOW = (255, 255, 0)  # A* Path Color
 ORANGE = (255, 165, 0)  # JPS Path Color
 BLUE = (0, 0, 255)      # D* Path Color
-GRAY = (128, 128, 128)  # Grid lines
-PURPLE = (128, 0, 128)
-
-# Set up the screen
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("Pathfinding Visualization with Runtime Stats")
-
-# Initialize grids
-grid_a_star = [[0 for _ in range(COLS)] for _ in range(ROWS)]
-grid_jps = [[0 for _ in range(COLS)] for _ in range(ROWS)]
-grid_d_star = [[0 for _ in range(COLS)] for _ in range(ROWS)]
-grid_greedy = [[0 for _ in range(COLS)] for _ in range(ROWS)]
-
-# Define start and goal positions
-start = (0, 0)
-goal = (ROWS - 1, COLS - 1)
-
-# Create a single base grid with obstacles
-base_grid = [[0 for _ in range(COLS)] for _ in range(ROWS)]
-
-# Populate the base grid with obstacles
-for _ in range(150):
-    x, y = random.randint(0, ROWS - 1), random.randint(0, COLS - 1)
-    if (x, y) != start and (x, y) != goal:
-        base_grid[x][y] = -1
-base_grid[start[0]][start[1]] = 1  # Start point
-base_grid[goal[0]][goal[1]] = 2    # Goal point
-
-# Copy the base grid to all grids
-grid_a_star = [row[:] for row in base_grid]
-grid_jps = [row[:] for row in base_grid]
-grid_d_star = [row[:] for row in base_grid]
-grid_greedy = [row[:] for row in base_grid]
-
-def draw_grid(grid, offset_x, offset_y):
-    """Draw the grid in its designated area."""
-    for row in range(ROWS):
-        for col in range(COLS):
-            color = WHITE
-            if grid[row][col] == -1:  # Obstacle
-                color = BLACK
-            elif grid[row][col] == 1:  # Start
-                color = GREEN
-            elif grid[row][col] == 2:  # Goal
-                color = RED
-            elif grid[row][col] == 3:  # A* Path
-                color = YELLOW
-            elif grid[row][col] == 4:  # JPS Path
-                color = ORANGE
-            elif grid[row][col] == 5:  # D* Path
-                color = BLUE
-            elif grid[row][col] == 6:  # Greedy Path
-                color = PURPLE
-
-            pygame.draw.rect(
-                screen,
-                color,
-                (offset_x + col * CELL_SIZE, offset_y + row * CELL_SIZE, CELL_SIZE, CELL_SIZE)
-            )
-            pygame.draw.rect(
-                screen,
-                GRAY,
-                (offset_x + col * CELL_SIZE, offset_y + row * CELL_SIZE, CELL_SIZE, CELL_SIZE),
-                1
-            )
-
-
-def draw_runtime(runtime, offset_x, offset_y, label):
-    """Display runtime statistics for each algorithm."""
-    font = pygame.font.Font(None, 24)
-    text = f"{label} Runtime: {runtime:.3f} ms"
-    rendered_text = font.render(text, True, BLACK)
-    screen.blit(rendered_text, (offset_x + 10, offset_y + ROWS * CELL_SIZE + 5))
-
-
-# Initialize pathfinding objects
-a_star = Pathfinding(grid_a_star, start, goal)
-jps = JumpStart(grid_jps, start, goal)
-d_star = Pathfinding(grid_d_star, start, goal)
-greedy = Pathfinding(grid_greedy, start, goal)
-
-# Flags for completion
-a_star_complete = False
-jps_complete = False
-d_star_complete = False
-greedy_complete = False
-
-# Runtime tracking
-a_star_runtime = 0
-jps_runtime = 0
-d_star_runtime = 0
-greedy_runtime = 0
-
-iteration = 2
-current_iteration = 1
-running = True
-a_star_runtimes = []
-d_star_runtimes = []
-jps_runtimes = []
-greedy_runtimes = []
-a_star_nodes_expanded = []
-jps_nodes_expanded = []
-d_star_nodes_expanded = []
-greedy_nodes_expanded = []
-
-# Main loop
-while running and current_iteration <= iteration:
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            running = False
-
-    # Run A* algorithm
-    if not a_star_complete:
-        start_time = time.time()
-        a_star_path, a_star_expand = a_star.a_star()
-        end_time = time.time()
-        a_star_runtime = (end_time - start_time) * 1000  # Convert to milliseconds
-        if a_star_path:
-            for position in a_star_path:
-                grid_a_star[position[0]][position[1]] = 3  # Mark A* Path
-                draw_grid(grid_a_star, 0, 0)
-                pygame.display.flip()
-                pygame.time.delay(50)
-            a_star_complete = True
-            a_star_nodes_expanded.append(a_star_expand)
-            a_star_runtimes.append(a_star_runtime)
-        else:
-            a_star_nodes_expanded.append(a_star_expand)
-            a_star_runtimes.append(0)
-
-
-    # Run Jump Point Search
-    if not jps_complete:
-        start_time = time.time()
-        jps_path, jps_expand = jps.jump_point_search()
-        end_time = time.time()
-        jps_runtime = (end_time - start_time) * 1000  # Convert to milliseconds
-        if jps_path:
-            for position in jps_path:
-                grid_jps[position[0]][position[1]] = 4  # Mark JPS Path
-                draw_grid(grid_jps, WIDTH // 2, 0)
-                pygame.display.flip()
-                pygame.time.delay(50)
-            jps_complete = True
-            jps_runtimes.append(jps_runtime)
-            jps_nodes_expanded.append(jps_expand)
-        else:
-            jps_runtimes.append(0)
-            jps_nodes_expanded.append(jps_expand)
-
-    # Run D* algorithm
-    if not d_star_complete:
-        start_time = time.time()
-        d_star_path, d_star_expand = d_star.d_star()
-        end_time = time.time()
-        d_star_runtime = (end_time - start_time) * 1000  # Convert to milliseconds
-        if d_star_path:
-            for position in d_star_path:
-                grid_d_star[position[0]][position[1]] = 5  # Mark D* Path
-                draw_grid(grid_d_star, 0, HEIGHT // 2)
-                pygame.display.flip()
-                pygame.time.delay(50)
-            d_star_complete = True
-            d_star_nodes_expanded.append(d_star_expand)
-            d_star_runtimes.append(d_star_runtime)
-        else:
-            d_star_nodes_expanded.append(d_star_expand)
-            d_star_runtimes.append(0)
-    
-    if not greedy_complete:
-        start_time = time.time()
-        greedy_path, greedy_expand = greedy.greedy_best_first_search()
-        end_time = time.time()
-        greedy_runtime = (end_time - start_time) * 1000  # Convert to milliseconds
-        if greedy_path:
-            for position in greedy_path:
-                grid_greedy[position[0]][position[1]] = 6  # Mark Greedy Path
-                draw_grid(grid_greedy, WIDTH // 2, HEIGHT // 2)
-                pygame.display.flip()
-                pygame.time.delay(50)
-            greedy_complete = True
-            greedy_nodes_expanded.append(greedy_expand)
-            greedy_runtimes.append(greedy_runtime)
-        else:
-            greedy_nodes_expanded.append(greedy_expand)
-            greedy_runtimes.append(0)
-
-
-    # Update display
+PURPLE = (128, 0, 128)  # Greedy Path Color
+
+# (label, search, path color, expanded color, quadrant origin)
+ALGORITHMS = [
+    ("A*", "a_star", YELLOW, (255, 250, 200), (0, 0)),
+    ("JPS", "jump_point_search", ORANGE, (255, 225, 180), (WIDTH // 2, 0)),
+    ("D*", "d_star", BLUE, (200, 210, 255), (0, HEIGHT // 2)),
+    ("Greedy", "greedy_best_first_search", PURPLE, (230, 200, 230), (WIDTH // 2, HEIGHT // 2)),
+]
+
+
+def random_grid(rows, cols, density, start, goal):
+    """Random obstacles with the start (1) and goal (2) kept free."""
+    grid = [[-1 if random.random() < density else 0 for _ in range(cols)] for _ in range(rows)]
+    grid[start[0]][start[1]] = 1  # Start point
+    grid[goal[0]][goal[1]] = 2    # Goal point
+    return grid
+
+
+def run_search(index, method, grid, start, goal, events):
+    """Worker process: run one search and stream its expansions, then its result."""
+    batch = []
+
+    def on_expand(pos):
+        batch.append(pos)
+        if len(batch) >= EVENT_BATCH:
+            events.put(("expand", index, batch[:]))
+            batch.clear()
+
+    if method == "jump_point_search":
+        search = JumpStart(grid, start, goal)
+    else:
+        search = Pathfinding(grid, start, goal)
+    search.hooks.on_expand = on_expand
+    path, _ = getattr(search, method)()
+    if batch:
+        events.put(("expand", index, batch))
+    events.put(("done", index, path, search.stats.as_dict()))
+
+
+class Quadrant:
+    """One algorithm's view: a cell color array scaled into its screen area.
+
+    Cell colors live in a NumPy array shaped like surfarray (x = column), so
+    a batch of events is one fancy-indexed assignment. Scaling is nearest
+    neighbour through per-axis pixel -> cell maps, so each frame rebuilds
+    and blits only the screen pixels under the dirty rects.
+    """
+
+    def __init__(self, label, origin, background, path_color, expanded_color):
+        self.label = label
+        self.origin = origin
+        self.side = min(WIDTH // 2, HEIGHT // 2 - LABEL_HEIGHT)
+        self.cols, self.rows = background.shape[:2]
+        self.scale = self.side / max(self.cols, self.rows)
+        self.col_of = np.minimum(np.arange(int(self.cols * self.scale)) / self.scale, self.cols - 1).astype(np.intp)
+        self.row_of = np.minimum(np.arange(int(self.rows * self.scale)) / self.scale, self.rows - 1).astype(np.intp)
+        self.area = pygame.Rect(0, 0, self.col_of.size, self.row_of.size)  # Scaled grid, quadrant coordinates
+        self.pixels = background.copy()
+        self.background = background
+        self.path_color = np.array(path_color, dtype=np.uint8)
+        self.expanded_color = np.array(expanded_color, dtype=np.uint8)
+        self.stats = None
+
+    def paint(self, cells, color, keep_markers=True):
+        """Color (row, col) cells; returns the screen rect that changed."""
+        if not cells:
+            return None
+        rows, cols = np.array(cells, dtype=np.intp).T
+        if keep_markers:  # Leave obstacles, start and goal as they are
+            free = (self.background[cols, rows] == WHITE).all(axis=1)
+            rows, cols = rows[free], cols[free]
+            if rows.size == 0:
+                return None
+        self.pixels[cols, rows] = color
+        x, y = self.origin
+        left, top = int(cols.min() * self.scale), int(rows.min() * self.scale)
+        right, bottom = int((cols.max() + 1) * self.scale) + 1, int((rows.max() + 1) * self.scale) + 1
+        return pygame.Rect(x + left, y + top, right - left, bottom - top)
+
+    def blit(self, screen, dirty):
+        """Push the cell colors under each dirty screen rect, scaling just those pixels."""
+        x, y = self.origin
+        for rect in dirty:
+            area = rect.move(-x, -y).clip(self.area)
+            if not area.width or not area.height:
+                continue  # Outside the grid, e.g. the stats line
+            block = self.pixels[self.col_of[area.left:area.right, None], self.row_of[area.top:area.bottom]]
+            screen.blit(pygame.surfarray.make_surface(block), (x + area.x, y + area.y))
+
+    def draw_label(self, screen, font):
+        x, y = self.origin
+        rect = pygame.Rect(x, y + self.side, WIDTH // 2, LABEL_HEIGHT)
+        screen.fill(WHITE, rect)
+        text = f"{self.label}: running..."
+        if self.stats is not None:
+            stats = self.stats
+            text = (f"{self.label}: {stats['wall_time'] * 1000:.1f} ms, {stats['expansions']} expanded, "
+                    f"{stats['pushes']} pushed")
+        screen.blit(font.render(text, True, BLACK), (x + 10, y + self.side + 4))
+        return rect
+
+
+def background_pixels(grid):
+    """Cell colors of the bare grid, indexed [col, row] like pygame.surfarray."""
+    cells = np.array(grid).T
+    pixels = np.empty(cells.shape + (3,), dtype=np.uint8)
+    pixels[:] = WHITE
+    pixels[cells == -1] = BLACK  # Obstacle
+    pixels[cells == 1] = GREEN   # Start
+    pixels[cells == 2] = RED     # Goal
+    return pixels
+
+
+def animate(screen, font, clock, grid, start, goal):
+    """Run all four searches in worker processes and draw their events as they arrive."""
+    background = background_pixels(grid)
+    quadrants = [Quadrant(label, origin, background, path_color, expanded_color)
+                 for label, _, path_color, expanded_color, origin in ALGORITHMS]
     screen.fill(WHITE)
-    draw_grid(grid_a_star, 0, 0)          # Top-left quadrant
-    draw_grid(grid_jps, WIDTH // 2, 0)   # Top-right quadrant
-    draw_grid(grid_d_star, 0, HEIGHT // 2)  # Bottom-left quadrant
-    draw_grid(grid_greedy, WIDTH // 2, HEIGHT // 2)  # Bottom-right quadrant
-
-    # Draw runtime statistics
-    draw_runtime(a_star_runtime, 0, 0, "A*")
-    draw_runtime(jps_runtime, WIDTH // 2, 0, "JPS")
-    draw_runtime(d_star_runtime, 0, HEIGHT // 2, "D*")
-    draw_runtime(greedy_runtime, WIDTH // 2, HEIGHT // 2, "Greedy")
-
+    for quadrant in quadrants:
+        quadrant.blit(screen, [pygame.Rect(quadrant.origin, (quadrant.side, quadrant.side))])
+        quadrant.draw_label(screen, font)
     pygame.display.flip()
-    #a_star_runtimes.append(a_star_runtime)
-    #jps_runtimes.append(jps_runtime)
-    #d_star_runtimes.append(d_star_runtime)
-    #print(len(a_star_runtimes))
-    #a_star_nodes_expanded.append(a_star_expand)
-    #jps_nodes_expanded.append(jps_expand)
-    
-    if a_star_complete or d_star_complete or jps_complete or greedy_complete:
-        pygame.time.delay(1000)
-        if current_iteration < iteration:
-            # Create a single base grid with obstacles
-            base_grid = [[0 for _ in range(COLS)] for _ in range(ROWS)]
-
-            # Populate the base grid with obstacles
-            for _ in range(150):
-                x, y = random.randint(0, ROWS - 1), random.randint(0, COLS - 1)
-                if (x, y) != start and (x, y) != goal:
-                    base_grid[x][y] = -1
-            base_grid[start[0]][start[1]] = 1  # Start point
-            base_grid[goal[0]][goal[1]] = 2    # Goal point
-
-            # Copy the base grid to all grids
-            grid_a_star = [row[:] for row in base_grid]
-            grid_jps = [row[:] for row in base_grid]
-            grid_d_star = [row[:] for row in base_grid]
-            grid_greedy = [row[:] for row in base_grid]
-            # Initialize pathfinding objects
-            a_star = Pathfinding(grid_a_star, start, goal)
-            jps = JumpStart(grid_jps, start, goal)
-            d_star = Pathfinding(grid_d_star, start, goal)
-            greedy = Pathfinding(grid_greedy, start, goal)
 
-            # Flags for completion
-            a_star_complete = False
-            jps_complete = False
-            d_star_complete = False
-            greedy_complete = False
-
-            # Runtime tracking
-            a_star_runtime = 0
-            jps_runtime = 0
-            d_star_runtime = 0
-            greedy_runtime = 0
-            current_iteration +=1
+    events = multiprocessing.Queue()
+    workers = [multiprocessing.Process(target=run_search, args=(index, method, grid, start, goal, events), daemon=True)
+               for index, (_, method, _, _, _) in enumerate(ALGORITHMS)]
+    for worker in workers:
+        worker.start()
+    running, pending = True, len(workers)
+    frame_budget = 1000 // FPS // 2  # Leave half of each frame for drawing
+    while running and pending:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+        # Drain what the workers produced since the last frame, within a time budget
+        dirty = {}
+        deadline = pygame.time.get_ticks() + frame_budget
+        while pygame.time.get_ticks() < deadline:
+            try:
+                message = events.get_nowait()
+            except queue.Empty:
+                break
+            kind, index = message[0], message[1]
+            quadrant = quadrants[index]
+            if kind == "expand":
+                rect = quadrant.paint(message[2], quadrant.expanded_color)
+            else:
+                path, quadrant.stats = message[2], message[3]
+                rect = quadrant.paint(path or [], quadrant.path_color)
+                dirty.setdefault(index, []).append(quadrant.draw_label(screen, font))
+                pending -= 1
+            if rect is not None:
+                dirty.setdefault(index, []).append(rect)
+        rects = []
+        for index, changed in dirty.items():
+            quadrants[index].blit(screen, changed)
+            rects.extend(changed)
+        if rects:
+            pygame.display.update(rects)  # Only the dirty rectangles
+        clock.tick(FPS)
+    for worker in workers:
+        if running:
+            worker.join()
         else:
-            pygame.quit()
-            running = False
-        
-"""print("Length of iterations:", iteration)
-print("Length of a_star_runtimes:", len(a_star_runtimes))
-print("Length of jps_runtimes:", len(jps_runtimes))
-print("Length of d_star_runtimes:", len(d_star_runtimes))"""
-
-pygame.quit()
-"""print("Length of iterations:", iteration)
-print("Length of a_star_runtimes:", len(a_star_runtimes))
-print("Length of jps_runtimes:", len(jps_runtimes))
-print("Length of d_star_runtimes:", len(d_star_runtimes))"""
-# Plot the runtimes using Matplotlib
-iterations = list(range(1, len(a_star_runtimes) + 1))
-#print("Length of g_star_runtimes:", greedy_nodes_expanded)
-# Plot the runtimes using Matplotlib
-plt.figure(figsize=(10, 6))
-
-plt.plot(iterations, a_star_runtimes, label='A* Runtime', marker='o')
-plt.plot(iterations, jps_runtimes, label='JPS Runtime', marker='o')
-plt.plot(iterations, d_star_runtimes, label='D* Runtime', marker='o')
-plt.plot(iterations, greedy_runtimes, label='Greedy Runtime', marker='o')
-
-plt.xlabel('Iteration')
-plt.ylabel('Runtime (ms)')
-plt.title('Runtime Comparison of Pathfinding Algorithms')
-plt.legend()
-plt.grid(True)
+            worker.terminate()  # The window was closed; don't wait for slow searches
+    return running
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Side-by-side animation of A*, JPS, D* and greedy search.")
+    parser.add_argument("--rows", type=int, default=30)
+    parser.add_argument("--cols", type=int, default=30)
+    parser.add_argument("--density", type=float, default=0.17, help="obstacle probability per cell")
+    parser.add_argument("--iterations", type=int, default=2, help="random grids to animate")
+    args = parser.parse_args(argv)
+
+    pygame.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    pygame.display.set_caption("Pathfinding Visualization with Runtime Stats")
+    font = pygame.font.Font(None, 22)
+    clock = pygame.time.Clock()
+    start, goal = (0, 0), (args.rows - 1, args.cols - 1)
+    for _ in range(args.iterations):
+        grid = random_grid(args.rows, args.cols, args.density, start, goal)
+        if not animate(screen, font, clock, grid, start, goal):
+            break
+        pygame.time.delay(1000)
+    pygame.quit()
 
-# Display the graph
-plt.show()
 
-plt.figure(figsize=(10, 6))
-plt.plot(iterations, a_star_nodes_expanded, label="A* Nodes Expanded", marker='o')
-plt.plot(iterations, jps_nodes_expanded, label="JPS Nodes Expanded", marker='o')
-plt.plot(iterations, d_star_nodes_expanded, label="D* Nodes Expanded", marker='o')
-plt.plot(iterations, greedy_nodes_expanded, label="Greedy Nodes Expanded", marker='o')
-plt.xlabel('Iteration')
-plt.ylabel('Nodes Expanded')
-plt.title('Nodes Expanded Comparison of Pathfinding Algorithms')
-plt.legend()
-plt.grid(True)
-plt.show()
\ No newline at end of file
+if __name__ == "__main__":
+    main()